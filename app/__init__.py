@@ -19,4 +19,8 @@ def create_app():
     app.register_blueprint(admin_bp, url_prefix='/admin')
     app.register_blueprint(booth_bp)  # 부스 운영자 라우트는 prefix 없이 등록 (하위 호환성)
     
+    # 요청당 DB 쿼리 수 집계 (X-Query-Count 헤더)
+    from app.repositories import install_query_budget
+    install_query_budget(app)
+    
     return app
\ No newline at end of file
@@ -7,21 +7,31 @@ certificates, data exports, and system monitoring.
 import os
 import json
 import uuid
-import shutil
-import pandas as pd
 from io import BytesIO
 from datetime import datetime
-from flask import Blueprint, render_template, request, redirect, url_for, jsonify, send_file, session, flash
-import qrcode
+from flask import Blueprint, render_template, request, redirect, url_for, jsonify, send_file, session, flash, Response
 from PIL import Image, ImageDraw, ImageFont
 
 # Import shared utilities and database connections
-from app.db import get_supabase
-from app.utils import (
-    get_event_name, set_event_name, generate_certificate_number, encrypt_password,
-    create_qr_with_text, save_qr_code_file, generate_certificate_pdf,
-    generate_safe_filename
+from app.db import get_supabase, count
+from app.repositories import (
+    students_repo, student_activity_repo, certificates_repo, booths_repo, booth_operators_repo,
+    student_key, min_booth_filter, endpoint_query_stats, run_query, InvalidListQuery
 )
+from app.utils import generate_safe_filename
+from app.settings import get_event_name, set_event_name, get_min_booth_count
+from app.exports import build_festival_export, stream_and_remove
+from app.events import sse_response, ADMIN_CHANNEL
+from app.queue_stats import get_queue_status_counts, summarize_status_counts
+from app.no_show import no_show_sweeper
+from app.checkin_buffer import checkin_buffer
+from app.qr_assets import qr_assets, send_booth_qr
+from app.qr_sheets import build_qr_sheet
+from app.certificates import (
+    issue_certificate, get_certificate_pdf, reset_certificate_renderer,
+    certificate_pdf_cache
+)
+from app.certificate_jobs import start_bulk_certificate_job, get_job_progress, is_valid_job_id, zip_path
 
 # Get database connection
 supabase = get_supabase()
@@ -38,6 +48,33 @@ def admin_required():
         return redirect(url_for('admin.admin_login'))
     return None
 
+def paged_list_response(repo, query_filter=None, decorate=None):
+    """One page of a keyset-paginated admin list as JSON
+
+    Query string: search columns of the repo (school, grade, class, name, ...),
+    sort, order (asc/desc), cursor (next_cursor of the previous page), limit.
+    The first page (no cursor) also carries the total matching row count.
+    """
+    order = request.args.get('order')
+    cursor = request.args.get('cursor')
+    try:
+        rows, next_cursor = repo.list_page(
+            search=request.args,
+            sort=request.args.get('sort'),
+            descending=(order == 'desc') if order in ('asc', 'desc') else None,
+            cursor=cursor,
+            limit=request.args.get('limit', type=int),
+            query_filter=query_filter
+        )
+        response = {'ok': True, 'items': decorate(rows) if decorate else rows, 'next_cursor': next_cursor}
+        if not cursor:
+            response['total'] = repo.count(search=request.args, query_filter=query_filter)
+    except InvalidListQuery as e:
+        return jsonify({'ok': False, 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'ok': False, 'message': f'목록 조회 중 오류: {str(e)}'})
+    return jsonify(response)
+
 # === Main Admin Routes ===
 
 @admin_bp.route('/', methods=['GET', 'POST'])
@@ -86,48 +123,28 @@ def generate_qr():
         return jsonify({'error': 'Supabase not configured'}), 500
     
     try:
-        # Save booth data to Supabase (update if exists)
-        result = supabase.table('booths').select('id').eq('name', booth_name).execute()
+        # Render (or reuse) the labeled QR image first so the booth row can point at it
+        asset = qr_assets.get(booth_name)
         
-        if result.data:
+        # Save booth data to Supabase (update if exists)
+        if booths_repo.get_by_name(booth_name):
             # Update existing booth
-            supabase.table('booths').update({
+            booths_repo.update_by_name(booth_name, {
                 'description': booth_description,
                 'is_active': True,
+                'qr_file_path': asset.path,
                 'updated_at': 'now()'
-            }).eq('name', booth_name).execute()
+            })
         else:
             # Create new booth
-            supabase.table('booths').insert({
+            booths_repo.insert({
                 'name': booth_name,
                 'description': booth_description,
-                'is_active': True
-            }).execute()
-        
-        # Generate QR code URL
-        base_url = os.environ.get('BASE_URL', 'https://dgmathft.up.railway.app')
-        qr_url = f"{base_url}/checkin?booth={booth_name}"
-        
-        # Create QR code
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(qr_url)
-        qr.make(fit=True)
-        
-        # Generate QR code image
-        qr_img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Create final image with booth name
-        final_img = create_qr_with_text(qr_img, booth_name)
-        
-        # Convert image to bytes
-        img_byte_arr = BytesIO()
-        final_img.save(img_byte_arr, format='PNG')
-        img_byte_arr.seek(0)
-        
-        # Save QR code file for reuse
-        save_qr_code_file(booth_name, final_img)
+                'is_active': True,
+                'qr_file_path': asset.path
+            })
         
-        return send_file(img_byte_arr, mimetype='image/png', download_name=f'qr_{booth_name}.png')
+        return send_booth_qr(booth_name, as_attachment=False)
         
     except Exception as e:
         return jsonify({'error': f'부스 생성 중 오류: {str(e)}'}), 500
@@ -140,56 +157,43 @@ def download_qr_code(booth_name):
         return auth_check
     
     try:
-        # Query booth information
-        result = supabase.table('booths').select('qr_file_path').eq('name', booth_name).execute()
+        if not booths_repo.get_by_name(booth_name):
+            flash(f'부스 "{booth_name}"을(를) 찾을 수 없습니다.', 'danger')
+            return redirect(url_for('admin.admin_booths'))
         
-        if result.data and result.data[0]['qr_file_path']:
-            qr_file_path = result.data[0]['qr_file_path']
-            
-            # Check if file exists
-            if os.path.exists(qr_file_path):
-                return send_file(qr_file_path, as_attachment=True, download_name=f'qr_{booth_name}.png')
-            else:
-                # Generate new QR code if file doesn't exist
-                return regenerate_qr_code(booth_name)
-        else:
-            # Generate new QR code if not exists
-            return regenerate_qr_code(booth_name)
+        # Served from the QR asset store (rendered once per booth name / BASE_URL)
+        return send_booth_qr(booth_name)
             
     except Exception as e:
         flash(f'QR 코드 다운로드 중 오류: {str(e)}', 'danger')
         return redirect(url_for('admin.admin_booths'))
 
-def regenerate_qr_code(booth_name):
-    """Regenerate QR code for booth"""
+@admin_bp.route('/download-qr-sheet')
+def download_qr_sheet():
+    """Download one printable PDF with a QR poster page for every active booth"""
+    auth_check = admin_required()
+    if auth_check:
+        return auth_check
+    if not SUPABASE_AVAILABLE:
+        flash('Supabase not configured.', 'danger')
+        return redirect(url_for('admin.admin_booths'))
+    
     try:
-        # Generate QR code URL
-        base_url = os.environ.get('BASE_URL', 'https://dgmathft.up.railway.app')
-        qr_url = f"{base_url}/checkin?booth={booth_name}"
-        
-        # Create QR code
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(qr_url)
-        qr.make(fit=True)
-        
-        # Generate QR code image
-        qr_img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Create final image with booth name
-        final_img = create_qr_with_text(qr_img, booth_name)
-        
-        # Save QR code file
-        save_qr_code_file(booth_name, final_img)
-        
-        # Convert image to bytes for download
-        img_byte_arr = BytesIO()
-        final_img.save(img_byte_arr, format='PNG')
-        img_byte_arr.seek(0)
+        booths = sorted(booths_repo.list_active('id, name, location'), key=lambda booth: booth['name'])
+        if not booths:
+            flash('활성화된 부스가 없습니다.', 'info')
+            return redirect(url_for('admin.admin_booths'))
         
-        return send_file(img_byte_arr, mimetype='image/png', as_attachment=True, download_name=f'qr_{booth_name}.png')
+        pdf_buffer = build_qr_sheet(booths, get_event_name())
+        return send_file(
+            pdf_buffer,
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=f'booth_qr_codes_{datetime.now().strftime("%Y%m%d")}.pdf'
+        )
         
     except Exception as e:
-        flash(f'QR 코드 재생성 중 오류: {str(e)}', 'danger')
+        flash(f'QR 인쇄용 PDF 생성 중 오류: {str(e)}', 'danger')
         return redirect(url_for('admin.admin_booths'))
 
 @admin_bp.route('/generate-qr-for-booth', methods=['POST'])
@@ -210,36 +214,19 @@ def generate_qr_for_booth():
     
     try:
         # Check if booth exists
-        booth_result = supabase.table('booths').select('*').eq('name', booth_name).execute()
+        booth = booths_repo.get_by_name(booth_name)
         
-        if not booth_result.data:
+        if not booth:
             return jsonify({'error': '해당 부스를 찾을 수 없습니다.'}), 404
         
-        booth = booth_result.data[0]
-        
-        # Generate QR code URL
-        base_url = os.environ.get('BASE_URL', 'https://dgmathft.up.railway.app')
-        qr_url = f"{base_url}/checkin?booth={booth_name}"
-        
-        # Create QR code
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(qr_url)
-        qr.make(fit=True)
-        
-        # Generate QR code image
-        qr_img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Create final image with booth name
-        final_img = create_qr_with_text(qr_img, booth_name)
-        
-        # Save QR code file
-        qr_file_path = save_qr_code_file(booth_name, final_img)
+        # Render (or reuse) the labeled QR image
+        asset = qr_assets.get(booth_name)
         
         # Update booth record with QR file path
-        supabase.table('booths').update({
-            'qr_file_path': qr_file_path,
+        booths_repo.update(booth['id'], {
+            'qr_file_path': asset.path,
             'updated_at': 'now()'
-        }).eq('id', booth['id']).execute()
+        })
         
         return jsonify({'ok': True, 'message': 'QR 코드가 성공적으로 생성되었습니다.'})
         
@@ -259,26 +246,20 @@ def admin_booths():
         return redirect(url_for('admin.admin_login'))
     
     # Query all booths with operator information
-    result = supabase.table('booths').select('''
-        *,
-        booth_operators(club_name, school, operator_id)
-    ''').order('created_at', desc=True).execute()
-    
     booths = []
-    if result.data:
-        for booth in result.data:
-            # Flatten operator information for template access
-            booth_data = booth.copy()
-            if 'booth_operators' in booth and booth['booth_operators']:
-                operator = booth['booth_operators']
-                booth_data['operator_club_name'] = operator['club_name']
-                booth_data['operator_school'] = operator['school']
-                booth_data['operator_id_display'] = operator['operator_id']
-            else:
-                booth_data['operator_club_name'] = '운영자 없음'
-                booth_data['operator_school'] = '-'
-                booth_data['operator_id_display'] = '-'
-            booths.append(booth_data)
+    for booth in booths_repo.list_with_operators('*, booth_operators(club_name, school, operator_id)'):
+        # Flatten operator information for template access
+        booth_data = booth.copy()
+        if 'booth_operators' in booth and booth['booth_operators']:
+            operator = booth['booth_operators']
+            booth_data['operator_club_name'] = operator['club_name']
+            booth_data['operator_school'] = operator['school']
+            booth_data['operator_id_display'] = operator['operator_id']
+        else:
+            booth_data['operator_club_name'] = '운영자 없음'
+            booth_data['operator_school'] = '-'
+            booth_data['operator_id_display'] = '-'
+        booths.append(booth_data)
     
     return render_template('admin_booths.html', booths=booths)
 
@@ -294,15 +275,14 @@ def admin_edit_booth(booth_id):
     
     try:
         # Query booth information
-        booth_result = supabase.table('booths').select('*').eq('id', booth_id).single().execute()
-        booth = booth_result.data
+        booth = booths_repo.get(booth_id)
         
         if not booth:
             flash('해당 부스를 찾을 수 없습니다.', 'danger')
             return redirect(url_for('admin.admin_booths'))
         
         # Query operators list
-        operators_result = supabase.table('booth_operators').select('*').order('club_name').execute()
+        operators_result = run_query('booth_operators', 'select', supabase.table('booth_operators').select('*').order('club_name'))
         operators = operators_result.data if operators_result.data else []
         
         return render_template('admin_edit_booth.html', booth=booth, operators=operators)
@@ -332,9 +312,10 @@ def admin_api_update_booth():
             return jsonify({'ok': False, 'message': '필수 정보가 누락되었습니다.'})
         
         # Check for duplicate booth name (excluding current booth)
-        existing_booth = supabase.table('booths').select('*').eq('name', name).neq('id', booth_id).execute()
-        if existing_booth.data:
+        if booths_repo.name_taken(name, exclude_id=booth_id):
             return jsonify({'ok': False, 'message': f'부스명 "{name}"이 이미 사용중입니다.'})
+        
+        existing_booth = booths_repo.get(booth_id)
 
         # Update booth information
         update_data = {
@@ -350,9 +331,9 @@ def admin_api_update_booth():
             pdf_file = request.files['pdf_file']
             if pdf_file and pdf_file.filename:
                 # Delete existing PDF file
-                booth_result = supabase.table('booths').select('pdf_file_path').eq('id', booth_id).single().execute()
-                if booth_result.data and booth_result.data.get('pdf_file_path'):
-                    old_pdf_path = booth_result.data['pdf_file_path']
+                booth = booths_repo.get(booth_id)
+                if booth and booth.get('pdf_file_path'):
+                    old_pdf_path = booth['pdf_file_path']
                     if os.path.exists(old_pdf_path):
                         os.remove(old_pdf_path)
                 
@@ -367,9 +348,10 @@ def admin_api_update_booth():
                 pdf_file.save(pdf_path)
                 update_data['pdf_file_path'] = pdf_path
 
-        result = supabase.table('booths').update(update_data).eq('id', booth_id).execute()
-        
-        if result.data:
+        if booths_repo.update(booth_id, update_data):
+            # Renamed booth: the old QR image (old name in the URL) is no longer valid
+            if existing_booth and existing_booth['name'] != name:
+                qr_assets.invalidate(existing_booth['name'])
             return jsonify({'ok': True, 'message': '부스 정보가 성공적으로 업데이트되었습니다.'})
         else:
             return jsonify({'ok': False, 'message': '부스 업데이트에 실패했습니다.'})
@@ -390,13 +372,9 @@ def delete_booth(booth_name):
     
     try:
         # Delete booth and related checkin records
-        result = supabase.table('booths').delete().eq('name', booth_name).execute()
-        
-        if result.data:
-            # Delete QR code file as well
-            qr_file_path = f"static/qr_codes/qr_{booth_name}.png"
-            if os.path.exists(qr_file_path):
-                os.remove(qr_file_path)
+        if booths_repo.delete_by_name(booth_name):
+            # Delete QR image as well
+            qr_assets.invalidate(booth_name)
             
             flash(f'부스 "{booth_name}"이(가) 삭제되었습니다.', 'success')
         else:
@@ -422,11 +400,8 @@ def clear_all_booths():
         # Delete all booths
         result = supabase.table('booths').delete().neq('id', 0).execute()
         
-        # Delete QR code files as well
-        qr_dir = 'static/qr_codes'
-        if os.path.exists(qr_dir):
-            shutil.rmtree(qr_dir)
-            os.makedirs(qr_dir)
+        # Delete QR images as well
+        qr_assets.clear()
         
         flash('모든 부스가 초기화되었습니다.', 'success')
         
@@ -447,19 +422,17 @@ def admin_student_records():
         flash('Supabase not configured.', 'danger')
         return redirect(url_for('admin.admin_login'))
     
-    # Query all students (remove duplicates)
-    result = supabase.table('checkins').select('school, grade, class, number, name').execute()
-    students = []
-    student_set = set()
-    
-    if result.data:
-        for record in result.data:
-            student_key = f"{record['school']}-{record['grade']}-{record['class']}-{record['number']}-{record['name']}"
-            if student_key not in student_set:
-                students.append(record)
-                student_set.add(student_key)
+    # Students are loaded page by page from /admin/api/student-records
+    return render_template('admin_student_records.html')
+
+@admin_bp.route('/api/student-records')
+def admin_api_student_records():
+    """Students with check-ins (one row per student, paginated)"""
+    auth_check = admin_required()
+    if auth_check:
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
     
-    return render_template('admin_student_records.html', students=students)
+    return paged_list_response(student_activity_repo)
 
 @admin_bp.route('/student-accounts')
 def admin_student_accounts():
@@ -471,11 +444,17 @@ def admin_student_accounts():
         flash('Supabase not configured.', 'danger')
         return redirect(url_for('admin.admin_login'))
     
-    # Query all student accounts
-    result = supabase.table('students').select('*').order('created_at', desc=True).execute()
-    students = result.data if result.data else []
+    # Accounts are loaded page by page from /admin/api/student-accounts
+    return render_template('admin_student_accounts.html')
+
+@admin_bp.route('/api/student-accounts')
+def admin_api_student_accounts():
+    """Student accounts (paginated)"""
+    auth_check = admin_required()
+    if auth_check:
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
     
-    return render_template('admin_student_accounts.html', students=students)
+    return paged_list_response(students_repo)
 
 @admin_bp.route('/add-student-account', methods=['POST'])
 def add_student_account():
@@ -492,14 +471,12 @@ def add_student_account():
         data = request.form
         
         # Check for duplicate student ID
-        existing = supabase.table('students').select('*').eq('student_id', data['student_id']).execute()
-        if existing.data:
+        if students_repo.login_id_taken(data['student_id']):
             flash(f'ID "{data["student_id"]}"가 이미 존재합니다.', 'danger')
             return redirect(url_for('admin.admin_student_accounts'))
         
         # Check for duplicate student (school-grade-class-number)
-        existing_student = supabase.table('students').select('*').eq('school', data['school']).eq('grade', int(data['grade'])).eq('class', int(data['class'])).eq('number', int(data['number'])).execute()
-        if existing_student.data:
+        if students_repo.find_by_class_number(data['school'], data['grade'], data['class'], data['number']):
             flash(f'{data["school"]} {data["grade"]}학년 {data["class"]}반 {data["number"]}번 학생이 이미 존재합니다.', 'danger')
             return redirect(url_for('admin.admin_student_accounts'))
         
@@ -514,9 +491,7 @@ def add_student_account():
             'name': data['name']
         }
         
-        result = supabase.table('students').insert(student_data).execute()
-        
-        if result.data:
+        if students_repo.insert(student_data):
             flash(f'학생 계정 "{data["name"]}"이 성공적으로 생성되었습니다.', 'success')
         else:
             flash('계정 생성에 실패했습니다.', 'danger')
@@ -541,8 +516,7 @@ def edit_student_account(student_id):
         data = request.form
         
         # Check if another student is using the same student_id
-        existing = supabase.table('students').select('*').eq('student_id', data['student_id']).neq('id', student_id).execute()
-        if existing.data:
+        if students_repo.find_by_login_id(data['student_id'], exclude_id=student_id):
             flash(f'ID "{data["student_id"]}"가 다른 학생에 의해 사용 중입니다.', 'danger')
             return redirect(url_for('admin.admin_student_accounts'))
         
@@ -557,9 +531,7 @@ def edit_student_account(student_id):
             'name': data['name']
         }
         
-        result = supabase.table('students').update(update_data).eq('id', student_id).execute()
-        
-        if result.data:
+        if students_repo.update(student_id, update_data):
             flash(f'학생 계정이 성공적으로 수정되었습니다.', 'success')
         else:
             flash('계정 수정에 실패했습니다.', 'danger')
@@ -582,17 +554,15 @@ def delete_student_account(student_id):
     
     try:
         # Query student information
-        student = supabase.table('students').select('*').eq('id', student_id).execute()
-        if not student.data:
+        student = students_repo.get(student_id)
+        if not student:
             flash('학생을 찾을 수 없습니다.', 'danger')
             return redirect(url_for('admin.admin_student_accounts'))
         
-        student_name = student.data[0]['name']
+        student_name = student['name']
         
         # Delete student account
-        result = supabase.table('students').delete().eq('id', student_id).execute()
-        
-        if result.data:
+        if students_repo.delete(student_id):
             flash(f'학생 계정 "{student_name}"이 삭제되었습니다.', 'success')
         else:
             flash('계정 삭제에 실패했습니다.', 'danger')
@@ -614,11 +584,17 @@ def admin_booth_operators():
         flash('Supabase not configured.', 'danger')
         return redirect(url_for('admin.admin_login'))
     
-    # Query all booth operators
-    result = supabase.table('booth_operators').select('*').order('created_at', desc=True).execute()
-    operators = result.data if result.data else []
+    # Operators are loaded page by page from /admin/api/booth-operators
+    return render_template('admin_booth_operators.html')
+
+@admin_bp.route('/api/booth-operators')
+def admin_api_booth_operators():
+    """Booth operator accounts (paginated)"""
+    auth_check = admin_required()
+    if auth_check:
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
     
-    return render_template('admin_booth_operators.html', operators=operators)
+    return paged_list_response(booth_operators_repo)
 
 @admin_bp.route('/add-booth-operator-account', methods=['POST'])
 def add_booth_operator_account():
@@ -635,7 +611,7 @@ def add_booth_operator_account():
         data = request.form
         
         # Check for duplicates
-        existing = supabase.table('booth_operators').select('*').eq('operator_id', data['operator_id']).execute()
+        existing = run_query('booth_operators', 'select', supabase.table('booth_operators').select('*').eq('operator_id', data['operator_id']))
         if existing.data:
             flash(f'ID "{data["operator_id"]}"가 이미 존재합니다.', 'danger')
             return redirect(url_for('admin.admin_booth_operators'))
@@ -652,7 +628,7 @@ def add_booth_operator_account():
             'is_active': True
         }
         
-        result = supabase.table('booth_operators').insert(operator_data).execute()
+        result = run_query('booth_operators', 'insert', supabase.table('booth_operators').insert(operator_data))
         
         if result.data:
             flash(f'부스 운영자 계정 "{data["operator_id"]}"이 성공적으로 생성되었습니다.', 'success')
@@ -679,7 +655,7 @@ def edit_booth_operator_account(operator_id):
         data = request.form
         
         # Check if another operator is using the same operator_id
-        existing = supabase.table('booth_operators').select('*').eq('operator_id', data['operator_id']).neq('id', operator_id).execute()
+        existing = run_query('booth_operators', 'select', supabase.table('booth_operators').select('*').eq('operator_id', data['operator_id']).neq('id', operator_id))
         if existing.data:
             flash(f'ID "{data["operator_id"]}"가 다른 운영자에 의해 사용 중입니다.', 'danger')
             return redirect(url_for('admin.admin_booth_operators'))
@@ -699,7 +675,7 @@ def edit_booth_operator_account(operator_id):
         if data.get('password'):
             update_data['password'] = data['password']
         
-        result = supabase.table('booth_operators').update(update_data).eq('id', operator_id).execute()
+        result = run_query('booth_operators', 'update', supabase.table('booth_operators').update(update_data).eq('id', operator_id))
         
         if result.data:
             flash(f'부스 운영자 계정이 성공적으로 수정되었습니다.', 'success')
@@ -724,7 +700,7 @@ def delete_booth_operator_account(operator_id):
     
     try:
         # Query operator information
-        operator = supabase.table('booth_operators').select('*').eq('id', operator_id).execute()
+        operator = run_query('booth_operators', 'select', supabase.table('booth_operators').select('*').eq('id', operator_id))
         if not operator.data:
             flash('운영자를 찾을 수 없습니다.', 'danger')
             return redirect(url_for('admin.admin_booth_operators'))
@@ -732,7 +708,7 @@ def delete_booth_operator_account(operator_id):
         operator_name = operator.data[0]['operator_id']
         
         # Delete operator account
-        result = supabase.table('booth_operators').delete().eq('id', operator_id).execute()
+        result = run_query('booth_operators', 'delete', supabase.table('booth_operators').delete().eq('id', operator_id))
         
         if result.data:
             flash(f'부스 운영자 계정 "{operator_name}"이 삭제되었습니다.', 'success')
@@ -757,7 +733,7 @@ def toggle_booth_operator_status(operator_id):
     
     try:
         # Query current status
-        operator = supabase.table('booth_operators').select('*').eq('id', operator_id).execute()
+        operator = run_query('booth_operators', 'select', supabase.table('booth_operators').select('*').eq('id', operator_id))
         if not operator.data:
             flash('운영자를 찾을 수 없습니다.', 'danger')
             return redirect(url_for('admin.admin_booth_operators'))
@@ -766,9 +742,9 @@ def toggle_booth_operator_status(operator_id):
         new_status = not current_status
         
         # Update status
-        result = supabase.table('booth_operators').update({
+        result = run_query('booth_operators', 'update', supabase.table('booth_operators').update({
             'is_active': new_status
-        }).eq('id', operator_id).execute()
+        }).eq('id', operator_id))
         
         if result.data:
             status_text = '활성화' if new_status else '비활성화'
@@ -794,7 +770,7 @@ def clear_all_booth_operators():
     
     try:
         # Delete all booth operators
-        result = supabase.table('booth_operators').delete().neq('id', 0).execute()
+        result = run_query('booth_operators', 'delete', supabase.table('booth_operators').delete().neq('id', 0))
         
         flash('모든 부스 운영자가 삭제되었습니다.', 'success')
         
@@ -827,61 +803,43 @@ def admin_api_queue_status():
         return jsonify({'ok': False, 'message': 'Supabase not configured'}), 500
     
     try:
-        # Calculate overall statistics
-        booths_result = supabase.table('booths').select('id').execute()
-        total_booths = len(booths_result.data) if booths_result.data else 0
-        
-        waiting_result = supabase.table('queue_entries').select('id').eq('status', 'waiting').execute()
-        total_waiting = len(waiting_result.data) if waiting_result.data else 0
-        
-        called_result = supabase.table('queue_entries').select('id').eq('status', 'called').execute()
-        total_called = len(called_result.data) if called_result.data else 0
-        
-        completed_result = supabase.table('queue_entries').select('id').eq('status', 'completed').execute()
-        total_completed = len(completed_result.data) if completed_result.data else 0
+        # Per-booth, per-status counts in a single grouped query
+        status_counts = get_queue_status_counts()
+        totals = summarize_status_counts(status_counts)
         
-        operators_result = supabase.table('booth_operators').select('id').execute()
-        total_operators = len(operators_result.data) if operators_result.data else 0
+        # Booth-specific queue status
+        booth_rows = booths_repo.list_with_operators('id, name, location, booth_operators(club_name)')
         
         stats = {
-            'total_booths': total_booths,
-            'total_waiting': total_waiting,
-            'total_called': total_called,
-            'total_completed': total_completed,
-            'total_operators': total_operators
+            'total_booths': len(booth_rows),
+            'total_waiting': totals.get('waiting', 0),
+            'total_called': totals.get('called', 0),
+            'total_completed': totals.get('completed', 0),
+            'total_no_show': totals.get('no_show', 0),
+            'total_operators': count('booth_operators')
         }
         
-        # Booth-specific queue status
-        booths_detail = supabase.table('booths').select('''
-            *, 
-            booth_operators(club_name)
-        ''').execute()
-        
         booths = []
-        if booths_detail.data:
-            for booth in booths_detail.data:
-                # Calculate queue status for each booth
-                waiting_count = supabase.table('queue_entries').select('id').eq('booth_id', booth['id']).eq('status', 'waiting').execute()
-                called_count = supabase.table('queue_entries').select('id').eq('booth_id', booth['id']).eq('status', 'called').execute()
-                completed_count = supabase.table('queue_entries').select('id').eq('booth_id', booth['id']).eq('status', 'completed').execute()
-                
-                booth_info = {
-                    'id': booth['id'],
-                    'name': booth['name'],
-                    'location': booth['location'],
-                    'operator_name': booth['booth_operators']['club_name'] if booth['booth_operators'] else None,
-                    'waiting_count': len(waiting_count.data) if waiting_count.data else 0,
-                    'called_count': len(called_count.data) if called_count.data else 0,
-                    'completed_count': len(completed_count.data) if completed_count.data else 0
-                }
-                booths.append(booth_info)
+        for booth in booth_rows:
+            booth_counts = status_counts.get(booth['id'], {})
+            booth_info = {
+                'id': booth['id'],
+                'name': booth['name'],
+                'location': booth['location'],
+                'operator_name': booth['booth_operators']['club_name'] if booth['booth_operators'] else None,
+                'waiting_count': booth_counts.get('waiting', 0),
+                'called_count': booth_counts.get('called', 0),
+                'completed_count': booth_counts.get('completed', 0),
+                'no_show_count': booth_counts.get('no_show', 0)
+            }
+            booths.append(booth_info)
         
         # Recent notifications
-        notifications_result = supabase.table('notifications').select('''
+        notifications_result = run_query('notifications', 'select', supabase.table('notifications').select('''
             *, 
             students(name),
             booths(name)
-        ''').order('created_at', desc=True).limit(50).execute()
+        ''').order('created_at', desc=True).limit(50))
         
         notifications = []
         if notifications_result.data:
@@ -904,8 +862,62 @@ def admin_api_queue_status():
     except Exception as e:
         return jsonify({'ok': False, 'message': f'데이터 조회 중 오류: {str(e)}'})
 
+@admin_bp.route('/api/no-show-metrics')
+def admin_api_no_show_metrics():
+    """No-show sweeper metrics (entries expired since process start)"""
+    auth_check = admin_required()
+    if auth_check:
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
+    
+    return jsonify({'ok': True, 'metrics': no_show_sweeper.metrics()})
+
+@admin_bp.route('/api/checkin-buffer')
+def admin_api_checkin_buffer():
+    """Local check-in buffer state (pending/failed rows, flush counters)"""
+    auth_check = admin_required()
+    if auth_check:
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
+    
+    try:
+        return jsonify({'ok': True, 'metrics': checkin_buffer.metrics(), 'failed': checkin_buffer.failed_rows()})
+    except Exception as e:
+        return jsonify({'ok': False, 'message': f'체크인 버퍼 조회 중 오류: {str(e)}'})
+
+@admin_bp.route('/api/checkin-buffer/requeue', methods=['POST'])
+def admin_api_checkin_buffer_requeue():
+    """Send check-ins isolated as 'failed' again (all, or the given ingest_ids)"""
+    auth_check = admin_required()
+    if auth_check:
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
+    
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        requeued = checkin_buffer.requeue_failed(data.get('ingest_ids'))
+        return jsonify({'ok': True, 'message': f'{requeued}건을 다시 전송 대기 상태로 변경했습니다.', 'requeued': requeued})
+    except Exception as e:
+        return jsonify({'ok': False, 'message': f'체크인 재전송 처리 중 오류: {str(e)}'})
+
+@admin_bp.route('/api/query-stats')
+def admin_api_query_stats():
+    """Per-endpoint database query counts (since process start)"""
+    auth_check = admin_required()
+    if auth_check:
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
+    
+    return jsonify({'ok': True, 'endpoints': endpoint_query_stats()})
+
 # === Certificate Management ===
 
+@admin_bp.route('/api/queue-status/stream')
+def admin_api_queue_status_stream():
+    """Queue change events for the admin status page (Server-Sent Events)"""
+    auth_check = admin_required()
+    if auth_check:
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
+    
+    return sse_response(ADMIN_CHANNEL)
+
 @admin_bp.route('/certificates')
 def admin_certificates():
     """Certificate management page"""
@@ -919,66 +931,43 @@ def admin_certificates():
     # Get current event name
     current_event_name = get_event_name()
     
-    # Query issued certificates
-    certificates_result = supabase.table('certificates').select('*').order('issued_at', desc=True).execute()
-    certificates = certificates_result.data if certificates_result.data else []
-    
-    # Query eligible students (3+ booth experiences)
-    checkins_result = supabase.table('checkins').select('school, grade, class, number, name, booth').execute()
-    
-    # Calculate booth experience count per student
-    student_booth_count = {}
-    total_participants = set()
-    
-    if checkins_result.data:
-        for record in checkins_result.data:
-            student_key = f"{record['school']}-{record['grade']}-{record['class']}-{record['number']}-{record['name']}"
-            total_participants.add(student_key)
-            
-            if student_key not in student_booth_count:
-                student_booth_count[student_key] = {
-                    'school': record['school'],
-                    'grade': record['grade'],
-                    'class': record['class'],
-                    'number': record['number'],
-                    'name': record['name'],
-                    'booths': set()
-                }
-            student_booth_count[student_key]['booths'].add(record['booth'])
-    
-    # Filter students with 3+ booth experiences
-    eligible_students = []
-    for student_key, student_data in student_booth_count.items():
-        booth_count = len(student_data['booths'])
-        if booth_count >= 3:
-            # Check if certificate already exists
-            existing_cert = next((cert for cert in certificates if 
-                cert['school'] == student_data['school'] and
-                cert['grade'] == student_data['grade'] and
-                cert['class'] == student_data['class'] and
-                cert['number'] == student_data['number'] and
-                cert['name'] == student_data['name']), None)
-            
-            eligible_students.append({
-                'school': student_data['school'],
-                'grade': student_data['grade'],
-                'class': student_data['class'],
-                'number': student_data['number'],
-                'name': student_data['name'],
-                'booth_count': booth_count,
-                'certificate_number': existing_cert['certificate_number'] if existing_cert else None
-            })
-    
-    # Sort (unissued -> issued)
-    eligible_students.sort(key=lambda x: (x['certificate_number'] is not None, x['name']))
+    # Only counts here; both lists are loaded page by page from the list APIs
+    min_booth_count = get_min_booth_count()
     
     return render_template('admin_certificates.html', 
-                         certificates=certificates,
-                         eligible_students=eligible_students,
-                         eligible_count=len(eligible_students),
-                         total_participants=len(total_participants),
+                         certificate_count=count('certificates'),
+                         eligible_count=student_activity_repo.count(query_filter=min_booth_filter(min_booth_count)),
+                         total_participants=count('student_activity'),
+                         min_booth_count=min_booth_count,
                          current_event_name=current_event_name)
 
+@admin_bp.route('/api/certificates')
+def admin_api_certificates():
+    """Issued certificates (paginated)"""
+    auth_check = admin_required()
+    if auth_check:
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
+    
+    return paged_list_response(certificates_repo)
+
+def with_certificate_numbers(students):
+    """Attach certificate_number (or None) to each student row"""
+    numbers = certificates_repo.numbers_for(students)
+    for student in students:
+        student['certificate_number'] = numbers.get(student_key(student))
+    return students
+
+@admin_bp.route('/api/eligible-students')
+def admin_api_eligible_students():
+    """Students eligible for a certificate (booth_count >= minimum, paginated)"""
+    auth_check = admin_required()
+    if auth_check:
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
+    
+    return paged_list_response(student_activity_repo,
+                               query_filter=min_booth_filter(get_min_booth_count()),
+                               decorate=with_certificate_numbers)
+
 @admin_bp.route('/issue-certificate', methods=['POST'])
 def admin_issue_certificate():
     """Issue certificate for student"""
@@ -990,52 +979,24 @@ def admin_issue_certificate():
         return jsonify({'ok': False, 'message': 'Supabase not configured'}), 500
     
     data = request.get_json()
-    school = data['school']
-    grade = data['grade']
-    class_ = data['class']
-    number = data['number']
-    name = data['name']
     
     try:
-        # Verify student's experience records
-        result = supabase.table('checkins').select('booth, comment, created_at').eq('school', school).eq('grade', int(grade)).eq('class', int(class_)).eq('number', int(number)).eq('name', name).order('created_at', desc=True).execute()
-        
-        booth_records = {}
-        if result.data:
-            for record in result.data:
-                booth_name = record['booth']
-                # Store only the latest record per booth
-                if booth_name not in booth_records:
-                    booth_records[booth_name] = {
-                        'comment': record['comment'],
-                        'created_at': record['created_at']
-                    }
+        # Verify student's experience records (latest record per booth)
+        booth_records = student_activity_repo.booth_records(data)
         
         booth_count = len(booth_records)
-        if booth_count < 3:
-            return jsonify({'ok': False, 'message': f'체험 부스가 부족합니다. (현재 {booth_count}개, 최소 3개 필요)'})
+        min_booth_count = get_min_booth_count()
+        if booth_count < min_booth_count:
+            return jsonify({'ok': False, 'message': f'체험 부스가 부족합니다. (현재 {booth_count}개, 최소 {min_booth_count}개 필요)'})
         
         # Check if certificate already exists
-        existing_cert = supabase.table('certificates').select('certificate_number').eq('school', school).eq('grade', int(grade)).eq('class', int(class_)).eq('number', int(number)).eq('name', name).execute()
+        existing_number = certificates_repo.number_for(data)
         
-        if existing_cert.data:
-            return jsonify({'ok': False, 'message': '이미 확인증이 발급되었습니다.', 'certificate_number': existing_cert.data[0]['certificate_number']})
+        if existing_number:
+            return jsonify({'ok': False, 'message': '이미 확인증이 발급되었습니다.', 'certificate_number': existing_number})
         
         # Issue new certificate
-        cert_id = generate_certificate_number()
-        booth_names = list(booth_records.keys())
-        
-        # Save certificate to database
-        supabase.table('certificates').insert({
-            'certificate_number': cert_id,
-            'school': school,
-            'grade': int(grade),
-            'class': int(class_),
-            'number': int(number),
-            'name': name,
-            'booth_names': booth_names,
-            'booth_count': booth_count
-        }).execute()
+        cert_id = issue_certificate(data, booth_records)
         
         return jsonify({
             'ok': True, 
@@ -1059,26 +1020,14 @@ def admin_certificate_view(certificate_number):
     
     try:
         # Query certificate information
-        cert_result = supabase.table('certificates').select('*').eq('certificate_number', certificate_number).execute()
+        certificate = certificates_repo.get_by_number(certificate_number)
         
-        if not cert_result.data:
+        if not certificate:
             flash('인증서를 찾을 수 없습니다.', 'danger')
             return redirect(url_for('admin.admin_certificates'))
         
-        certificate = cert_result.data[0]
-        
         # Query student's detailed experience records
-        records_result = supabase.table('checkins').select('booth, comment, created_at').eq('school', certificate['school']).eq('grade', certificate['grade']).eq('class', certificate['class']).eq('number', certificate['number']).eq('name', certificate['name']).order('created_at', desc=True).execute()
-        
-        booth_records = {}
-        if records_result.data:
-            for record in records_result.data:
-                booth_name = record['booth']
-                if booth_name not in booth_records:
-                    booth_records[booth_name] = {
-                        'comment': record['comment'],
-                        'created_at': record['created_at']
-                    }
+        booth_records = student_activity_repo.booth_records(certificate)
         
         # Construct student information
         student_info = {
@@ -1092,21 +1041,75 @@ def admin_certificate_view(certificate_number):
         # Get current event name
         event_name = get_event_name()
         
-        # Generate PDF
-        pdf_buffer = generate_certificate_pdf(student_info, booth_records, certificate_number, event_name)
+        # Generate PDF (reuses the cached PDF when inputs are unchanged)
+        etag, pdf_bytes = get_certificate_pdf(student_info, booth_records, certificate_number, event_name)
         
-        # Show PDF directly in browser (not download)
+        # Show PDF directly in browser (not download); If-None-Match is answered with 304
         return send_file(
-            pdf_buffer,
+            BytesIO(pdf_bytes),
             mimetype='application/pdf',
             as_attachment=False,  # False = show in browser
-            download_name=f'{certificate["name"]}_활동확인서.pdf'
+            download_name=f'{certificate["name"]}_활동확인서.pdf',
+            etag=etag
         )
         
     except Exception as e:
         flash(f'인증서 조회 중 오류: {str(e)}', 'danger')
         return redirect(url_for('admin.admin_certificates'))
 
+@admin_bp.route('/api/bulk-certificates', methods=['POST'])
+def admin_api_start_bulk_certificates():
+    """Start (or resume) a bulk certificate issuance job"""
+    auth_check = admin_required()
+    if auth_check:
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
+    
+    if not SUPABASE_AVAILABLE:
+        return jsonify({'ok': False, 'message': 'Supabase not configured'}), 500
+    
+    data = request.get_json(silent=True) or {}
+    job_id = data.get('job_id')
+    if job_id and not is_valid_job_id(job_id):
+        return jsonify({'ok': False, 'message': '잘못된 작업 ID입니다.'}), 400
+    
+    try:
+        job_id = start_bulk_certificate_job(get_event_name(), job_id)
+        return jsonify({'ok': True, 'job_id': job_id})
+    except Exception as e:
+        return jsonify({'ok': False, 'message': f'일괄 발급 작업 시작 중 오류: {str(e)}'})
+
+@admin_bp.route('/api/bulk-certificates/<job_id>')
+def admin_api_bulk_certificates_progress(job_id):
+    """Bulk certificate job progress"""
+    auth_check = admin_required()
+    if auth_check:
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
+    
+    progress = get_job_progress(job_id) if is_valid_job_id(job_id) else None
+    if progress is None:
+        return jsonify({'ok': False, 'message': '작업을 찾을 수 없습니다.'}), 404
+    
+    return jsonify({'ok': True, **progress})
+
+@admin_bp.route('/bulk-certificates/<job_id>/download')
+def admin_download_bulk_certificates(job_id):
+    """Download the ZIP of all certificates rendered by a bulk job"""
+    auth_check = admin_required()
+    if auth_check:
+        return auth_check
+    
+    progress = get_job_progress(job_id) if is_valid_job_id(job_id) else None
+    if progress is None or progress['status'] != 'done':
+        flash('완료된 일괄 발급 작업이 없습니다.', 'danger')
+        return redirect(url_for('admin.admin_certificates'))
+    
+    return send_file(
+        zip_path(job_id),
+        mimetype='application/zip',
+        as_attachment=True,
+        download_name=f'확인증_일괄_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip'
+    )
+
 @admin_bp.route('/email-certificate', methods=['POST'])
 def admin_email_certificate():
     """Email certificate (placeholder implementation)"""
@@ -1153,12 +1156,14 @@ def admin_update_event_name():
     
     try:
         # Check if settings table exists
-        test_query = supabase.table('settings').select('id').limit(1).execute()
+        test_query = run_query('settings', 'select', supabase.table('settings').select('id').limit(1))
     except Exception as e:
         if 'relation "public.settings" does not exist' in str(e):
             return jsonify({'ok': False, 'message': 'settings 테이블이 존재하지 않습니다. 관리자에게 문의하세요.'})
     
     if set_event_name(event_name):
+        # Event name is printed on every certificate
+        certificate_pdf_cache.clear()
         return jsonify({'ok': True, 'message': '행사명이 업데이트되었습니다.'})
     else:
         return jsonify({'ok': False, 'message': '행사명 업데이트에 실패했습니다. 서버 로그를 확인하세요.'})
@@ -1194,6 +1199,9 @@ def admin_upload_seal():
             # Save new seal file (always as seal.png)
             file.save(seal_path)
             
+            # Reload seal image on next certificate render
+            reset_certificate_renderer()
+            
             return jsonify({
                 'ok': True, 
                 'message': '커스텀 관인 이미지가 업로드되었습니다. 기본 관인 대신 사용됩니다.',
@@ -1253,6 +1261,9 @@ def admin_reset_seal():
         if os.path.exists(custom_seal_path):
             os.remove(custom_seal_path)
         
+        # Reload seal image on next certificate render
+        reset_certificate_renderer()
+        
         # Check default seal
         default_seal_path = 'image/GanIn.png'
         if os.path.exists(default_seal_path):
@@ -1285,113 +1296,17 @@ def admin_download():
         flash('Supabase not configured. Cannot download data.', 'danger')
         return redirect(url_for('admin.admin_login'))
     
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        
-        # 1. Checkin records
-        checkins_result = supabase.table('checkins').select('*').order('created_at', desc=True).execute()
-        if checkins_result.data:
-            checkins_records = []
-            for record in checkins_result.data:
-                checkins_records.append({
-                    'ID': record['id'],
-                    '학교명': record['school'],
-                    '학년': record['grade'],
-                    '반': record['class'],
-                    '번호': record['number'],
-                    '이름': record['name'],
-                    '부스명': record['booth'],
-                    '소감': record['comment'],
-                    '체크인시각': record['created_at']
-                })
-            df_checkins = pd.DataFrame(checkins_records)
-        else:
-            df_checkins = pd.DataFrame()
-        df_checkins.to_excel(writer, index=False, sheet_name='체크인기록')
-        
-        # 2. Booth information
-        booths_result = supabase.table('booths').select('*').order('created_at', desc=True).execute()
-        if booths_result.data:
-            booths_records = []
-            for record in booths_result.data:
-                booths_records.append({
-                    'ID': record['id'],
-                    '부스명': record['name'],
-                    '설명': record['description'] or '',
-                    '활성상태': '활성' if record['is_active'] else '비활성',
-                    '생성일시': record['created_at'],
-                    '수정일시': record['updated_at']
-                })
-            df_booths = pd.DataFrame(booths_records)
-        else:
-            df_booths = pd.DataFrame()
-        df_booths.to_excel(writer, index=False, sheet_name='부스정보')
-        
-        # 3. Issued certificates
-        certificates_result = supabase.table('certificates').select('*').order('issued_at', desc=True).execute()
-        if certificates_result.data:
-            cert_records = []
-            for record in certificates_result.data:
-                booth_names_str = ', '.join(record['booth_names']) if record['booth_names'] else ''
-                cert_records.append({
-                    'ID': record['id'],
-                    '발급번호': record['certificate_number'],
-                    '학교명': record['school'],
-                    '학년': record['grade'],
-                    '반': record['class'],
-                    '번호': record['number'],
-                    '이름': record['name'],
-                    '체험부스수': record['booth_count'],
-                    '체험부스명': booth_names_str,
-                    '발급일시': record['issued_at']
-                })
-            df_certificates = pd.DataFrame(cert_records)
-        else:
-            df_certificates = pd.DataFrame()
-        df_certificates.to_excel(writer, index=False, sheet_name='발급인증서')
-        
-        # 4. Student accounts
-        students_result = supabase.table('students').select('*').order('created_at', desc=True).execute()
-        if students_result.data:
-            student_records = []
-            for record in students_result.data:
-                student_records.append({
-                    'ID': record['id'],
-                    '학생ID': record['student_id'],
-                    '비밀번호(암호화)': encrypt_password(record['password']),
-                    '학교명': record['school'],
-                    '학년': record['grade'],
-                    '반': record['class'],
-                    '번호': record['number'],
-                    '이름': record['name'],
-                    '계정생성일시': record['created_at']
-                })
-            df_students = pd.DataFrame(student_records)
-        else:
-            df_students = pd.DataFrame()
-        df_students.to_excel(writer, index=False, sheet_name='학생계정목록')
-        
-        # 5. Summary statistics
-        summary_data = []
-        
-        # Total unique students (remove duplicates)
-        unique_students = set()
-        if checkins_result.data:
-            for record in checkins_result.data:
-                unique_students.add(f"{record['school']}-{record['grade']}-{record['class']}-{record['number']}-{record['name']}")
-        
-        summary_data.append(['전체 참여 학생 수', len(unique_students)])
-        summary_data.append(['전체 체크인 횟수', len(checkins_result.data) if checkins_result.data else 0])
-        summary_data.append(['등록된 부스 수', len(booths_result.data) if booths_result.data else 0])
-        summary_data.append(['발급된 인증서 수', len(certificates_result.data) if certificates_result.data else 0])
-        summary_data.append(['등록된 학생 계정 수', len(students_result.data) if students_result.data else 0])
-        summary_data.append(['데이터 추출 시각', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-        
-        df_summary = pd.DataFrame(summary_data, columns=['항목', '값'])
-        df_summary.to_excel(writer, index=False, sheet_name='요약통계')
+    try:
+        export_path = build_festival_export()
+    except Exception as e:
+        flash(f'데이터 추출 중 오류: {str(e)}', 'danger')
+        return redirect(url_for('admin.admin_login'))
     
-    output.seek(0)
-    return send_file(output, download_name='festival_complete_data.xlsx', as_attachment=True)
+    # Stream the workbook from disk so memory stays flat regardless of table size
+    response = Response(stream_and_remove(export_path), mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+    response.headers['Content-Disposition'] = 'attachment; filename=festival_complete_data.xlsx'
+    response.headers['Content-Length'] = str(os.path.getsize(export_path))
+    return response
 
 @admin_bp.route('/clear-all-data', methods=['POST'])
 def clear_all_data():
@@ -1418,11 +1333,8 @@ def clear_all_data():
         # 4. Delete student accounts
         supabase.table('students').delete().neq('id', 0).execute()
         
-        # 5. Delete QR code files
-        qr_dir = 'static/qr_codes'
-        if os.path.exists(qr_dir):
-            shutil.rmtree(qr_dir)
-            os.makedirs(qr_dir)
+        # 5. Delete QR images
+        qr_assets.clear()
         
         flash('모든 데이터가 초기화되었습니다.', 'success')
         
@@ -1471,7 +1383,8 @@ def init_database_tables():
             name VARCHAR(50) NOT NULL,
             booth_names TEXT[],
             booth_count INTEGER NOT NULL,
-            issued_at TIMESTAMP DEFAULT NOW()
+            issued_at TIMESTAMP DEFAULT NOW(),
+            UNIQUE (school, grade, class, number, name)
         );
         """
         
@@ -1486,11 +1399,408 @@ def init_database_tables():
             operator_id INTEGER,
             is_active BOOLEAN DEFAULT true,
             qr_file_path VARCHAR(255),
+            auto_call_enabled BOOLEAN DEFAULT false,
+            auto_call_concurrency INTEGER DEFAULT 1,
+            no_show_timeout_minutes INTEGER DEFAULT 5,
             created_at TIMESTAMP DEFAULT NOW(),
             updated_at TIMESTAMP DEFAULT NOW()
         );
         """
-        
+
+        create_booth_auto_call_sql = """
+        ALTER TABLE booths ADD COLUMN IF NOT EXISTS auto_call_enabled BOOLEAN DEFAULT false;
+        ALTER TABLE booths ADD COLUMN IF NOT EXISTS auto_call_concurrency INTEGER DEFAULT 1;
+        ALTER TABLE booths ADD COLUMN IF NOT EXISTS no_show_timeout_minutes INTEGER DEFAULT 5;
+        """
+
+        create_queue_status_counts_view_sql = """
+        CREATE OR REPLACE VIEW queue_status_counts AS
+        SELECT booth_id, status, COUNT(*)::INTEGER AS entry_count
+        FROM queue_entries
+        GROUP BY booth_id, status;
+        """
+
+        create_apply_to_queue_function_sql = """
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_queue_entries_booth_position ON queue_entries(booth_id, queue_position);
+
+        CREATE OR REPLACE FUNCTION apply_to_queue(p_booth_id INTEGER, p_student_id INTEGER)
+        RETURNS JSON AS $$
+        DECLARE
+            v_existing queue_entries%ROWTYPE;
+            v_position INTEGER;
+            v_entry_id INTEGER;
+        BEGIN
+            -- Serialize concurrent applications to the same booth
+            PERFORM pg_advisory_xact_lock(p_booth_id);
+
+            SELECT * INTO v_existing FROM queue_entries
+            WHERE booth_id = p_booth_id AND student_id = p_student_id AND status IN ('waiting', 'called')
+            LIMIT 1;
+
+            IF FOUND THEN
+                RETURN json_build_object('ok', false, 'duplicate', true,
+                                         'entry_id', v_existing.id, 'queue_position', v_existing.queue_position);
+            END IF;
+
+            SELECT COALESCE(MAX(queue_position), 0) + 1 INTO v_position
+            FROM queue_entries WHERE booth_id = p_booth_id;
+
+            INSERT INTO queue_entries (student_id, booth_id, queue_position, status)
+            VALUES (p_student_id, p_booth_id, v_position, 'waiting')
+            RETURNING id INTO v_entry_id;
+
+            RETURN json_build_object('ok', true, 'duplicate', false,
+                                     'entry_id', v_entry_id, 'queue_position', v_position);
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+
+        create_certificate_counter_sql = """
+        CREATE TABLE IF NOT EXISTS certificate_counters (
+            prefix VARCHAR(20) PRIMARY KEY,
+            last_value INTEGER NOT NULL DEFAULT 0
+        );
+
+        -- Seed the counter from sequentially numbered certificates already issued
+        -- (legacy timestamp numbers such as 대수페-25-MMDDHHMM are 8 digits and excluded)
+        INSERT INTO certificate_counters (prefix, last_value)
+        SELECT '대수페-25', COALESCE(MAX(CAST(split_part(certificate_number, '-', 3) AS INTEGER)), 0)
+        FROM certificates WHERE certificate_number ~ '^대수페-25-[0-9]{4,6}$'
+        ON CONFLICT (prefix) DO NOTHING;
+
+        -- One certificate per student. Existing duplicates must be resolved first:
+        -- SELECT school, grade, class, number, name, COUNT(*) FROM certificates
+        -- GROUP BY 1, 2, 3, 4, 5 HAVING COUNT(*) > 1;
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_certificates_student
+        ON certificates(school, grade, class, number, name);
+
+        DROP FUNCTION IF EXISTS allocate_certificate_numbers(VARCHAR, INTEGER);
+
+        -- Number and insert certificates in one transaction so a failed insert never burns a number
+        CREATE OR REPLACE FUNCTION issue_certificates(p_prefix VARCHAR, p_rows JSONB)
+        RETURNS JSON AS $$
+        DECLARE
+            v_last INTEGER;
+            v_numbered INTEGER;
+            v_issued INTEGER;
+            v_result JSON;
+        BEGIN
+            INSERT INTO certificate_counters (prefix, last_value) VALUES (p_prefix, 0)
+            ON CONFLICT (prefix) DO NOTHING;
+
+            -- The counter row lock serializes concurrent issuers (workers, bulk jobs);
+            -- statements below see every certificate committed before the lock was granted
+            SELECT last_value INTO v_last FROM certificate_counters
+            WHERE prefix = p_prefix
+            FOR UPDATE;
+
+            WITH incoming AS (
+                SELECT e.value->>'school' AS school,
+                       (e.value->>'grade')::INTEGER AS grade,
+                       (e.value->>'class')::INTEGER AS class,
+                       (e.value->>'number')::INTEGER AS number,
+                       e.value->>'name' AS name,
+                       ARRAY(SELECT jsonb_array_elements_text(e.value->'booth_names')) AS booth_names,
+                       (e.value->>'booth_count')::INTEGER AS booth_count,
+                       e.ord
+                FROM jsonb_array_elements(p_rows) WITH ORDINALITY AS e(value, ord)
+            ),
+            pending AS (
+                -- Students without a certificate (once each), numbered in the order given
+                SELECT u.*, ROW_NUMBER() OVER (ORDER BY u.ord) AS seq
+                FROM (
+                    SELECT DISTINCT ON (i.school, i.grade, i.class, i.number, i.name) i.*
+                    FROM incoming i
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM certificates c
+                        WHERE c.school = i.school AND c.grade = i.grade AND c.class = i.class
+                          AND c.number = i.number AND c.name = i.name
+                    )
+                    ORDER BY i.school, i.grade, i.class, i.number, i.name, i.ord
+                ) u
+            ),
+            inserted AS (
+                INSERT INTO certificates (certificate_number, school, grade, class, number, name, booth_names, booth_count)
+                SELECT p_prefix || '-' || LPAD((v_last + p.seq)::TEXT, GREATEST(4, LENGTH((v_last + p.seq)::TEXT)), '0'),
+                       p.school, p.grade, p.class, p.number, p.name, p.booth_names, p.booth_count
+                FROM pending p
+                -- Backstop for writers that bypass this function
+                ON CONFLICT (school, grade, class, number, name) DO NOTHING
+                RETURNING id
+            )
+            SELECT (SELECT COUNT(*) FROM pending), (SELECT COUNT(*) FROM inserted)
+            INTO v_numbered, v_issued;
+
+            UPDATE certificate_counters SET last_value = v_last + v_numbered
+            WHERE prefix = p_prefix;
+
+            -- Certificate numbers of every requested student (new and previously issued)
+            SELECT json_build_object(
+                'issued', v_issued,
+                'certificates', COALESCE(json_agg(json_build_object(
+                    'certificate_number', c.certificate_number, 'school', c.school, 'grade', c.grade,
+                    'class', c.class, 'number', c.number, 'name', c.name
+                ) ORDER BY c.id), '[]'::JSON)
+            ) INTO v_result
+            FROM certificates c
+            WHERE (c.school, c.grade, c.class, c.number, c.name) IN (
+                SELECT e->>'school', (e->>'grade')::INTEGER, (e->>'class')::INTEGER,
+                       (e->>'number')::INTEGER, e->>'name'
+                FROM jsonb_array_elements(p_rows) e
+            );
+
+            RETURN v_result;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+
+        create_notifications_outbox_sql = """
+        ALTER TABLE notifications ADD COLUMN IF NOT EXISTS attempts INTEGER DEFAULT 0;
+        ALTER TABLE notifications ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP DEFAULT NOW();
+        ALTER TABLE notifications ADD COLUMN IF NOT EXISTS error_message TEXT;
+        ALTER TABLE notifications ADD COLUMN IF NOT EXISTS response_data TEXT;
+        -- Claim lease: only 'sending' rows older than SMS_CLAIM_LEASE_SECONDS are put back to 'pending'
+        ALTER TABLE notifications ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMP;
+        ALTER TABLE notifications ADD COLUMN IF NOT EXISTS claimed_by TEXT;
+
+        CREATE INDEX IF NOT EXISTS idx_notifications_outbox ON notifications(status, next_attempt_at);
+        CREATE INDEX IF NOT EXISTS idx_notifications_claimed ON notifications(status, claimed_at);
+        """
+
+        create_expire_no_show_function_sql = """
+        CREATE INDEX IF NOT EXISTS idx_queue_entries_status_called_at ON queue_entries(status, called_at);
+
+        -- called_at is written by the app as naive local time, so the app passes its own clock (p_now)
+        -- instead of comparing against the database's UTC NOW()
+        DROP FUNCTION IF EXISTS expire_no_show_entries(BOOLEAN);
+        DROP FUNCTION IF EXISTS expire_no_show_entries(BOOLEAN, TIMESTAMP);
+
+        -- p_exclude_ids: entries the app's queue engine has not written back yet (their DB status may be stale)
+        CREATE OR REPLACE FUNCTION expire_no_show_entries(p_requeue BOOLEAN DEFAULT false, p_now TIMESTAMP DEFAULT NULL,
+                                                          p_exclude_ids INTEGER[] DEFAULT '{}')
+        RETURNS JSON AS $$
+        DECLARE
+            v_now TIMESTAMP := COALESCE(p_now, LOCALTIMESTAMP);
+            v_result JSON;
+        BEGIN
+            IF p_requeue THEN
+                -- Take the same per-booth locks as apply_to_queue before picking new positions
+                PERFORM pg_advisory_xact_lock(stale.booth_id)
+                FROM (
+                    SELECT DISTINCT q.booth_id
+                    FROM queue_entries q JOIN booths b ON b.id = q.booth_id
+                    WHERE q.status = 'called'
+                      AND NOT (q.id = ANY(p_exclude_ids))
+                      AND b.no_show_timeout_minutes IS NOT NULL
+                      AND q.called_at < v_now - make_interval(mins => b.no_show_timeout_minutes)
+                    ORDER BY q.booth_id
+                ) stale;
+            END IF;
+
+            -- Expire every stale 'called' entry in one statement (a NULL timeout turns expiry off for that booth)
+            WITH expired AS (
+                UPDATE queue_entries q
+                SET status = 'no_show'
+                FROM booths b
+                WHERE b.id = q.booth_id
+                  AND q.status = 'called'
+                  AND NOT (q.id = ANY(p_exclude_ids))
+                  AND b.no_show_timeout_minutes IS NOT NULL
+                  AND q.called_at < v_now - make_interval(mins => b.no_show_timeout_minutes)
+                RETURNING q.*
+            ),
+            requeued AS (
+                INSERT INTO queue_entries (student_id, booth_id, queue_position, status)
+                SELECT e.student_id, e.booth_id,
+                       (SELECT COALESCE(MAX(queue_position), 0) FROM queue_entries WHERE booth_id = e.booth_id)
+                           + ROW_NUMBER() OVER (PARTITION BY e.booth_id ORDER BY e.queue_position),
+                       'waiting'
+                FROM expired e
+                WHERE p_requeue
+                RETURNING *
+            )
+            SELECT json_build_object(
+                'expired', COALESCE((SELECT json_agg(row_to_json(e)) FROM expired e), '[]'::JSON),
+                'requeued', COALESCE((SELECT json_agg(row_to_json(r)) FROM requeued r), '[]'::JSON)
+            ) INTO v_result;
+
+            RETURN v_result;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+
+        # Check-ins carry an ingest_id (idempotency key) and a dedupe_key (student + booth + time window);
+        # upsert_checkins merges repeats into the existing row instead of adding new ones
+        create_checkin_ingest_sql = """
+        ALTER TABLE checkins ADD COLUMN IF NOT EXISTS ingest_id UUID;
+        ALTER TABLE checkins ADD COLUMN IF NOT EXISTS dedupe_key TEXT;
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_checkins_ingest_id ON checkins(ingest_id);
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_checkins_dedupe_key ON checkins(dedupe_key);
+
+        CREATE OR REPLACE FUNCTION upsert_checkins(p_rows JSONB)
+        RETURNS JSON AS $$
+        DECLARE
+            v_incoming JSONB;
+            v_inserted JSONB;
+            v_updated JSONB;
+        BEGIN
+            -- Repeats inside one batch collapse to the latest submission
+            SELECT COALESCE(jsonb_agg(to_jsonb(latest)), '[]'::JSONB) INTO v_incoming
+            FROM (
+                SELECT DISTINCT ON (COALESCE(r.dedupe_key, r.ingest_id::TEXT)) r.*
+                FROM jsonb_to_recordset(p_rows) AS r(
+                    ingest_id UUID, dedupe_key TEXT, school TEXT, grade INTEGER, class INTEGER,
+                    number INTEGER, name TEXT, booth TEXT, comment TEXT, created_at TIMESTAMP
+                )
+                ORDER BY COALESCE(r.dedupe_key, r.ingest_id::TEXT), r.created_at DESC
+            ) latest;
+
+            -- New check-ins. DO NOTHING without a target skips conflicts on either unique key (ingest_id or
+            -- dedupe_key), including a row committed meanwhile by a concurrent call for the same ingest_id
+            -- (buffer flusher racing the direct fallback)
+            WITH inserted AS (
+                INSERT INTO checkins (ingest_id, dedupe_key, school, grade, class, number, name, booth, comment, created_at)
+                SELECT i.ingest_id, i.dedupe_key, i.school, i.grade, i.class, i.number, i.name, i.booth, i.comment, i.created_at
+                FROM jsonb_to_recordset(v_incoming) AS i(
+                    ingest_id UUID, dedupe_key TEXT, school TEXT, grade INTEGER, class INTEGER,
+                    number INTEGER, name TEXT, booth TEXT, comment TEXT, created_at TIMESTAMP
+                )
+                ON CONFLICT DO NOTHING
+                RETURNING checkins.*
+            )
+            SELECT COALESCE(jsonb_agg(to_jsonb(inserted)), '[]'::JSONB) INTO v_inserted FROM inserted;
+
+            -- The rest already exist (same idempotency key replayed, or same student/booth/time window).
+            -- A new statement sees rows committed by the concurrent call, so they are re-selected here
+            -- and keep the latest comment
+            WITH updated AS (
+                UPDATE checkins c
+                SET comment = i.comment
+                FROM jsonb_to_recordset(v_incoming) AS i(
+                    ingest_id UUID, dedupe_key TEXT, school TEXT, grade INTEGER, class INTEGER,
+                    number INTEGER, name TEXT, booth TEXT, comment TEXT, created_at TIMESTAMP
+                )
+                WHERE (c.ingest_id = i.ingest_id OR c.dedupe_key = i.dedupe_key)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM jsonb_array_elements(v_inserted) n WHERE (n->>'ingest_id')::UUID = i.ingest_id
+                  )
+                RETURNING c.*
+            )
+            SELECT COALESCE(jsonb_agg(to_jsonb(updated)), '[]'::JSONB) INTO v_updated FROM updated;
+
+            RETURN json_build_object('inserted', v_inserted, 'updated', v_updated);
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+
+        create_student_activity_sql = """
+        CREATE INDEX IF NOT EXISTS idx_checkins_student ON checkins(school, grade, class, number, name);
+
+        CREATE TABLE IF NOT EXISTS student_activity (
+            id SERIAL PRIMARY KEY,
+            school VARCHAR(100) NOT NULL,
+            grade INTEGER NOT NULL,
+            class INTEGER NOT NULL,
+            number INTEGER NOT NULL,
+            name VARCHAR(50) NOT NULL,
+            booth_records JSONB NOT NULL DEFAULT '{}'::JSONB,
+            booth_count INTEGER NOT NULL DEFAULT 0,
+            last_checkin_at TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT NOW(),
+            UNIQUE (school, grade, class, number, name)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_student_activity_booth_count ON student_activity(booth_count);
+
+        -- Rebuild one student's summary from their check-ins (latest comment per booth).
+        -- Concurrent check-ins for the same student are serialized with a per-student advisory lock, so the
+        -- second rebuild runs after the first commits and its READ COMMITTED snapshot includes both check-ins.
+        CREATE OR REPLACE FUNCTION refresh_student_activity(p_school TEXT, p_grade INTEGER, p_class INTEGER, p_number INTEGER, p_name TEXT)
+        RETURNS VOID AS $$
+        BEGIN
+            -- Two-key form keeps these locks apart from the single-key per-booth locks used by apply_to_queue
+            PERFORM pg_advisory_xact_lock(hashtext('student_activity'),
+                                          hashtext(concat_ws('|', p_school, p_grade, p_class, p_number, p_name)));
+
+            INSERT INTO student_activity (school, grade, class, number, name, booth_records, booth_count, last_checkin_at, updated_at)
+            SELECT p_school, p_grade, p_class, p_number, p_name,
+                   jsonb_object_agg(latest.booth, jsonb_build_object('comment', latest.comment, 'created_at', latest.created_at)),
+                   COUNT(*), MAX(latest.created_at), NOW()
+            FROM (
+                SELECT DISTINCT ON (c.booth) c.booth, c.comment, c.created_at
+                FROM checkins c
+                WHERE c.school = p_school AND c.grade = p_grade AND c.class = p_class
+                  AND c.number = p_number AND c.name = p_name
+                ORDER BY c.booth, c.created_at DESC, c.id DESC
+            ) latest
+            HAVING COUNT(*) > 0
+            ON CONFLICT (school, grade, class, number, name) DO UPDATE
+            SET booth_records = EXCLUDED.booth_records,
+                booth_count = EXCLUDED.booth_count,
+                last_checkin_at = EXCLUDED.last_checkin_at,
+                updated_at = NOW();
+
+            -- No check-ins left for this student
+            IF NOT FOUND THEN
+                DELETE FROM student_activity
+                WHERE school = p_school AND grade = p_grade AND class = p_class
+                  AND number = p_number AND name = p_name;
+            END IF;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE FUNCTION checkins_refresh_student_activity()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM refresh_student_activity(OLD.school, OLD.grade, OLD.class, OLD.number, OLD.name);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM refresh_student_activity(NEW.school, NEW.grade, NEW.class, NEW.number, NEW.name);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS trg_checkins_student_activity ON checkins;
+        CREATE TRIGGER trg_checkins_student_activity
+        AFTER INSERT OR UPDATE OR DELETE ON checkins
+        FOR EACH ROW EXECUTE FUNCTION checkins_refresh_student_activity();
+
+        -- Backfill summaries for check-ins recorded before the trigger existed
+        SELECT refresh_student_activity(school, grade, class, number, name)
+        FROM (SELECT DISTINCT school, grade, class, number, name FROM checkins) students;
+        """
+
+        # Keyset pagination walks (sort column, id); trigram indexes serve the ILIKE '%...%' searches
+        create_admin_list_indexes_sql = """
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+        CREATE INDEX IF NOT EXISTS idx_students_created_at_id ON students(created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_students_name_id ON students(name, id);
+        CREATE INDEX IF NOT EXISTS idx_students_school_id ON students(school, id);
+        CREATE INDEX IF NOT EXISTS idx_students_grade_class ON students(grade, class, id);
+        CREATE INDEX IF NOT EXISTS idx_students_name_trgm ON students USING gin (name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_students_school_trgm ON students USING gin (school gin_trgm_ops);
+
+        CREATE INDEX IF NOT EXISTS idx_student_activity_name_id ON student_activity(name, id);
+        CREATE INDEX IF NOT EXISTS idx_student_activity_school_id ON student_activity(school, id);
+        CREATE INDEX IF NOT EXISTS idx_student_activity_booth_count_id ON student_activity(booth_count, id);
+        CREATE INDEX IF NOT EXISTS idx_student_activity_last_checkin_id ON student_activity(last_checkin_at, id);
+        CREATE INDEX IF NOT EXISTS idx_student_activity_grade_class ON student_activity(grade, class, id);
+        CREATE INDEX IF NOT EXISTS idx_student_activity_name_trgm ON student_activity USING gin (name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_student_activity_school_trgm ON student_activity USING gin (school gin_trgm_ops);
+
+        CREATE INDEX IF NOT EXISTS idx_certificates_issued_at_id ON certificates(issued_at, id);
+        CREATE INDEX IF NOT EXISTS idx_certificates_name_id ON certificates(name, id);
+        CREATE INDEX IF NOT EXISTS idx_certificates_school_id ON certificates(school, id);
+        CREATE INDEX IF NOT EXISTS idx_certificates_name_trgm ON certificates USING gin (name gin_trgm_ops);
+
+        CREATE INDEX IF NOT EXISTS idx_booth_operators_created_at_id ON booth_operators(created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_booth_operators_club_name_id ON booth_operators(club_name, id);
+        CREATE INDEX IF NOT EXISTS idx_booth_operators_school_id ON booth_operators(school, id);
+        """
+
         # Try to access tables to check if they exist
         try:
             result = supabase.table('students').select('id').limit(1).execute()
@@ -1501,6 +1811,8 @@ def init_database_tables():
             result = supabase.table('notifications').select('id').limit(1).execute()
             result = supabase.table('files').select('id').limit(1).execute()
             result = supabase.table('settings').select('id').limit(1).execute()
+            result = supabase.table('queue_status_counts').select('booth_id').limit(1).execute()
+            result = supabase.table('student_activity').select('id').limit(1).execute()
             flash('모든 필요한 테이블이 이미 존재합니다.', 'info')
         except:
             # Tables don't exist, provide creation guide
@@ -1515,6 +1827,24 @@ def init_database_tables():
             print("\n-- 3. Booths Table")
             print(create_booths_sql)
             # ... (other table creation SQL would be printed)
+            print("\n-- Queue Status Counts View")
+            print(create_queue_status_counts_view_sql)
+            print("\n-- Queue Admission Function")
+            print(create_apply_to_queue_function_sql)
+            print("\n-- Certificate Number Counter")
+            print(create_certificate_counter_sql)
+            print("\n-- Notifications Outbox Columns")
+            print(create_notifications_outbox_sql)
+            print("\n-- Booth Auto-Call Settings")
+            print(create_booth_auto_call_sql)
+            print("\n-- No-Show Expiry Function")
+            print(create_expire_no_show_function_sql)
+            print("\n-- Check-in Ingest / Dedupe")
+            print(create_checkin_ingest_sql)
+            print("\n-- Student Activity Summary")
+            print(create_student_activity_sql)
+            print("\n-- Admin List Indexes")
+            print(create_admin_list_indexes_sql)
             print("=" * 60)
         
     except Exception as e:
@@ -0,0 +1,148 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 자동 호출
+
+다음 대기자 호출 처리와, 자동 호출을 켠 부스의 빈자리를 채우는 스케줄러입니다:
+- call_next_students: 대기 순서대로 N명 호출 + 이벤트 전달 + SMS outbox 기록
+- 부스 설정 (booths 테이블)
+  - auto_call_enabled: 자동 호출 사용 여부
+  - auto_call_concurrency: 동시에 '호출됨' 상태로 둘 인원
+  - no_show_timeout_minutes: 호출 후 이 시간이 지나면 빈자리로 간주
+    (그 자리에 다음 대기자를 부르면 시간 초과된 호출은 엔진을 거쳐 'no_show'로 처리)
+- 완료 처리 시 즉시, 그 외에는 Config.AUTO_CALL_INTERVAL 초마다 빈자리 확인
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from app.db import get_supabase
+from app.config import Config
+from app.repositories import run_query
+from app.queue_engine import queue_engine
+from app.events import publish_queue_change
+from app.sms_outbox import enqueue_sms_batch
+from app.wait_estimator import parse_timestamp
+
+BOOTH_SETTINGS_COLUMNS = 'id, auto_call_enabled, auto_call_concurrency, no_show_timeout_minutes'
+
+def call_next_students(booth_id, count):
+    """대기 순서대로 다음 대기자 count명 호출
+
+    반환: (호출된 항목 리스트, SMS 기록 성공 여부)
+    """
+    waiting_entries = queue_engine.next_waiting(booth_id, count)
+    if not waiting_entries:
+        return [], True
+
+    # 한 번의 업데이트로 상태를 'called'로 변경 (그 사이 상태가 바뀐 학생은 제외됨)
+    updated_entries = queue_engine.update_entries([entry['id'] for entry in waiting_entries], {
+        'status': 'called',
+        'called_at': datetime.now().isoformat()
+    }, expected_status='waiting')
+
+    called_ids = {row['id'] for row in updated_entries}
+    called_entries = [entry for entry in waiting_entries if entry['id'] in called_ids]
+    if not called_entries:
+        return [], True
+
+    publish_queue_change('called', updated_entries)
+
+    # 알림 로그도 한 번의 insert로 기록 (발송은 백그라운드에서 일괄 처리)
+    sms_queued = enqueue_sms_batch([{
+        'phone_number': entry['students']['phone'],
+        'message': f"[{entry['booths']['name']}] 참가하실 시간입니다. {entry['booths']['location']}로 3분 내 방문해 주세요.",
+        'booth_id': entry['booth_id'],
+        'student_id': entry['student_id']
+    } for entry in called_entries if entry['students'].get('phone')])
+
+    return called_entries, sms_queued
+
+def is_timed_out(entry, timeout_minutes, now=None):
+    """호출 후 timeout_minutes가 지났는지 확인"""
+    called_at = parse_timestamp(entry.get('called_at'))
+    if not called_at or not timeout_minutes:
+        return False
+    if now is None:
+        now = datetime.now(timezone.utc) if called_at.tzinfo else datetime.now()
+    return now - called_at > timedelta(minutes=timeout_minutes)
+
+def free_slots(called, concurrency, timeout_minutes, now=None):
+    """동시 호출 인원 중 비어 있는 자리 수와 시간 초과된 호출 목록
+
+    called는 부스의 '호출됨' 항목 리스트이며, 시간 초과된 호출은 빈자리로 간주합니다.
+    반환: (빈자리 수, 시간 초과된 항목 리스트 (호출 오래된 순))
+    """
+    timed_out = [entry for entry in called if is_timed_out(entry, timeout_minutes, now)]
+    timed_out.sort(key=lambda entry: str(entry.get('called_at') or ''))
+    return max(0, (concurrency or 1) - (len(called) - len(timed_out))), timed_out
+
+def fill_booth_slots(booth_id, concurrency, timeout_minutes):
+    """부스의 빈자리를 다음 대기자로 채움 (호출한 항목 리스트 반환)
+
+    시간 초과된 호출의 자리에 새 대기자를 부른 만큼, 오래된 호출부터 'no_show'로 처리합니다.
+    대기열 엔진을 거쳐 변경하므로 같은 항목의 다른 쓰기(완료 처리 등)와 순서가 섞이지 않습니다.
+    """
+    called = queue_engine.called_entries(booth_id)
+    slots, timed_out = free_slots(called, concurrency, timeout_minutes)
+    if not slots:
+        return []
+
+    called_entries, _ = call_next_students(booth_id, slots)
+
+    # 시간 초과 없이 비어 있던 자리를 먼저 채우고, 나머지는 시간 초과된 호출의 자리를 다시 쓴 것
+    open_slots = max(0, (concurrency or 1) - len(called))
+    reused = timed_out[:max(0, len(called_entries) - open_slots)]
+    if reused:
+        expired = queue_engine.update_entries([entry['id'] for entry in reused], {'status': 'no_show'}, expected_status='called')
+        publish_queue_change('no_show', expired)
+    return called_entries
+
+def get_auto_call_booths():
+    """자동 호출을 켠 부스 설정 목록"""
+    supabase = get_supabase()
+    if not supabase:
+        return []
+    result = run_query('booths', 'auto_call_booths', supabase.table('booths').select(BOOTH_SETTINGS_COLUMNS).eq('auto_call_enabled', True).eq('is_active', True))
+    return result.data or []
+
+class AutoCallScheduler:
+    """자동 호출 부스의 빈자리를 다음 대기자로 채우는 백그라운드 스레드"""
+
+    def __init__(self):
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def notify(self):
+        """완료 처리 등으로 자리가 비었을 때 즉시 확인하도록 깨움"""
+        self._wakeup.set()
+
+    def run_once(self):
+        """모든 자동 호출 부스 확인 (호출한 인원 수 반환)"""
+        total_called = 0
+        for booth in get_auto_call_booths():
+            try:
+                called_entries = fill_booth_slots(booth['id'], booth.get('auto_call_concurrency'), booth.get('no_show_timeout_minutes'))
+                total_called += len(called_entries)
+            except Exception as e:
+                print(f"자동 호출 오류 (부스 {booth['id']}): {e}")
+        if total_called:
+            print(f"📢 자동 호출: {total_called}명")
+        return total_called
+
+    def _run(self):
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"자동 호출 스레드 오류: {e}")
+            self._wakeup.wait(Config.AUTO_CALL_INTERVAL)
+            self._wakeup.clear()
+
+    def start(self):
+        """스케줄러 시작 (프로세스당 1회)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='auto-call', daemon=True)
+            self._thread.start()
+
+auto_call_scheduler = AutoCallScheduler()
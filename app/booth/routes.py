@@ -6,17 +6,26 @@
 import os
 import json
 from datetime import datetime
-from flask import Blueprint, render_template, request, redirect, url_for, jsonify, session, flash, send_file
-import qrcode
+from flask import Blueprint, render_template, request, redirect, url_for, jsonify, session, flash
 
 # Import shared utilities and database connections
 from app.db import get_supabase
-from app.utils import send_sms_notification, generate_safe_filename, create_qr_with_text, save_qr_code_file
+from app.repositories import booths_repo, queue_repo, run_query
+from app.utils import generate_safe_filename
+from app.qr_assets import qr_assets, send_booth_qr
+from app.sms_outbox import enqueue_sms
+from app.events import publish_queue_change, sse_response, booth_channel
+from app.queue_engine import queue_engine
+from app.wait_estimator import wait_estimator
+from app.auto_call import call_next_students, auto_call_scheduler
 
 # Get database connection
 supabase = get_supabase()
 SUPABASE_AVAILABLE = supabase is not None
 
+# 한 번에 호출할 수 있는 최대 인원
+MAX_GROUP_CALL_SIZE = 20
+
 # Create booth operator blueprint
 booth_bp = Blueprint('booth', __name__)
 
@@ -45,7 +54,7 @@ def api_create_account():
     
     try:
         # ID 중복 확인
-        existing_id = supabase.table('booth_operators').select('*').eq('operator_id', data['operator_id']).execute()
+        existing_id = run_query('booth_operators', 'select', supabase.table('booth_operators').select('*').eq('operator_id', data['operator_id']))
         
         if existing_id.data:
             return jsonify({'ok': False, 'message': '이미 사용 중인 ID입니다.'})
@@ -62,7 +71,7 @@ def api_create_account():
             'email': data['email']
         }
         
-        result = supabase.table('booth_operators').insert(operator_data).execute()
+        result = run_query('booth_operators', 'insert', supabase.table('booth_operators').insert(operator_data))
         
         if result.data:
             return jsonify({'ok': True, 'message': '부스 운영자 계정이 생성되었습니다.'})
@@ -86,7 +95,7 @@ def api_check_id_duplicate():
     
     try:
         # ID 중복 확인
-        result = supabase.table('booth_operators').select('id').eq('operator_id', operator_id).execute()
+        result = run_query('booth_operators', 'select', supabase.table('booth_operators').select('id').eq('operator_id', operator_id))
         
         if result.data:
             return jsonify({'ok': False, 'available': False, 'message': '이미 사용 중인 ID입니다.'})
@@ -121,7 +130,7 @@ def api_login():
     
     try:
         # 부스 운영자 계정 조회
-        result = supabase.table('booth_operators').select('*').eq('operator_id', data['operator_id']).eq('password', data['password']).execute()
+        result = run_query('booth_operators', 'select', supabase.table('booth_operators').select('*').eq('operator_id', data['operator_id']).eq('password', data['password']))
         
         if result.data:
             operator = result.data[0]
@@ -186,8 +195,7 @@ def api_create_booth():
             return jsonify({'ok': False, 'message': '필수 정보가 누락되었습니다.'})
         
         # 부스명 중복 확인
-        existing_booth = supabase.table('booths').select('*').eq('name', name).execute()
-        if existing_booth.data:
+        if booths_repo.name_taken(name):
             return jsonify({'ok': False, 'message': '이미 존재하는 부스명입니다.'})
         
         # 부스 데이터 생성
@@ -216,37 +224,17 @@ def api_create_booth():
             booth_data['pdf_file_path'] = file_path
         
         # 부스 생성
-        result = supabase.table('booths').insert(booth_data).execute()
+        created_booths = booths_repo.insert(booth_data)
         
-        if result.data:
-            created_booth = result.data[0]
+        if created_booths:
+            created_booth = created_booths[0]
             
-            # QR 코드 자동 생성
+            # QR 코드 자동 생성 (QR 이미지 저장소에 미리 만들어 둠)
             try:
-                
-                # Generate QR code URL
-                base_url = os.environ.get('BASE_URL', 'https://dgmathft.up.railway.app')
-                qr_url = f"{base_url}/checkin?booth={name}"
-                
-                # Create QR code
-                qr = qrcode.QRCode(version=1, box_size=10, border=5)
-                qr.add_data(qr_url)
-                qr.make(fit=True)
-                
-                # Generate QR code image
-                qr_img = qr.make_image(fill_color="black", back_color="white")
-                
-                # Create final image with booth name
-                final_img = create_qr_with_text(qr_img, name)
-                
-                # Save QR code file
-                qr_file_path = save_qr_code_file(name, final_img)
-                
-                # Update booth record with QR file path
-                supabase.table('booths').update({
-                    'qr_file_path': qr_file_path
-                }).eq('id', created_booth['id']).execute()
-                
+                asset = qr_assets.get(name)
+                booths_repo.update(created_booth['id'], {
+                    'qr_file_path': asset.path
+                })
             except Exception as qr_error:
                 print(f"QR 코드 생성 오류 (부스는 정상 생성됨): {str(qr_error)}")
             
@@ -270,9 +258,7 @@ def api_operator_booths():
         return jsonify({'ok': False, 'message': '운영자 ID가 필요합니다.'})
     
     try:
-        result = supabase.table('booths').select('*').eq('operator_id', operator_id).order('created_at', desc=True).execute()
-        
-        booths = result.data if result.data else []
+        booths = booths_repo.list_by_operator(operator_id)
         return jsonify({'ok': True, 'booths': booths})
         
     except Exception as e:
@@ -291,8 +277,7 @@ def edit_booth(booth_id):
     try:
         current_operator = json.loads(session.get('boothOperatorInfo'))
 
-        booth_result = supabase.table('booths').select('*').eq('id', booth_id).single().execute()
-        booth = booth_result.data
+        booth = booths_repo.get(booth_id)
         
         if not booth or booth['operator_id'] != current_operator['id']:
             flash('해당 부스를 수정할 권한이 없습니다.', 'danger')
@@ -324,13 +309,12 @@ def api_update_booth():
             return jsonify({'ok': False, 'message': '필수 정보가 누락되었습니다.'})
         
         # 해당 부스가 현재 운영자의 부스인지 다시 확인
-        existing_booth_check = supabase.table('booths').select('operator_id').eq('id', booth_id).single().execute()
-        if not existing_booth_check.data or existing_booth_check.data['operator_id'] != current_operator['id']:
+        existing_booth = booths_repo.get(booth_id)
+        if not existing_booth or existing_booth['operator_id'] != current_operator['id']:
             return jsonify({'ok': False, 'message': '부스 수정 권한이 없습니다.'}), 403
 
         # 부스명 중복 확인 (현재 부스 제외)
-        existing_booth = supabase.table('booths').select('*').eq('name', name).neq('id', booth_id).execute()
-        if existing_booth.data:
+        if booths_repo.name_taken(name, exclude_id=booth_id):
             return jsonify({'ok': False, 'message': '이미 존재하는 부스명입니다.'})
 
         update_data = {
@@ -340,6 +324,19 @@ def api_update_booth():
             'is_active': is_active,
             'updated_at': 'now()'
         }
+        
+        # 자동 호출 설정 (폼에 항목이 있을 때만 변경)
+        if 'auto_call_concurrency' in data:
+            try:
+                auto_call_concurrency = int(data.get('auto_call_concurrency') or 1)
+                no_show_timeout_minutes = int(data.get('no_show_timeout_minutes') or 5)
+            except ValueError:
+                return jsonify({'ok': False, 'message': '자동 호출 설정 값이 올바르지 않습니다.'})
+            if not 1 <= auto_call_concurrency <= MAX_GROUP_CALL_SIZE or no_show_timeout_minutes < 1:
+                return jsonify({'ok': False, 'message': f'동시 호출 인원은 1~{MAX_GROUP_CALL_SIZE}명, 미방문 대기 시간은 1분 이상이어야 합니다.'})
+            update_data['auto_call_enabled'] = 'auto_call_enabled' in data
+            update_data['auto_call_concurrency'] = auto_call_concurrency
+            update_data['no_show_timeout_minutes'] = no_show_timeout_minutes
 
         # PDF 파일 처리
         pdf_file = request.files.get('pdf_file')
@@ -353,9 +350,10 @@ def api_update_booth():
             pdf_file.save(file_path)
             update_data['pdf_file_path'] = file_path
         
-        result = supabase.table('booths').update(update_data).eq('id', booth_id).execute()
-        
-        if result.data:
+        if booths_repo.update(booth_id, update_data):
+            # 부스명이 바뀌면 이전 이름이 담긴 QR 이미지는 폐기
+            if existing_booth['name'] != name:
+                qr_assets.invalidate(existing_booth['name'])
             return jsonify({'ok': True, 'message': '부스 정보가 성공적으로 업데이트되었습니다.'})
         else:
             return jsonify({'ok': False, 'message': '부스 정보 업데이트에 실패했습니다.'})
@@ -380,15 +378,12 @@ def api_booth_queue():
         return jsonify({'ok': False, 'message': '부스 ID가 필요합니다.'})
     
     try:
-        # 대기열 조회 (학생 정보 포함)
-        result = supabase.table('queue_entries').select('''
-            *, 
-            students!inner(name, school, grade, class, number, phone)
-        ''').eq('booth_id', booth_id).order('queue_position', desc=False).execute()
+        # 대기열 조회 (학생 정보 포함, 메모리 대기열 엔진에서 응답)
+        entries = queue_engine.booth_entries(booth_id)
         
         queue = []
-        if result.data:
-            for entry in result.data:
+        if entries:
+            for entry in entries:
                 student = entry['students']
                 queue.append({
                     'id': entry['id'],
@@ -410,6 +405,20 @@ def api_booth_queue():
     except Exception as e:
         return jsonify({'ok': False, 'message': f'대기열 조회 중 오류: {str(e)}'})
 
+@booth_bp.route('/api/booth-queue/stream/<int:booth_id>')
+def api_booth_queue_stream(booth_id):
+    """부스 대기열 변경 실시간 수신 (Server-Sent Events)"""
+    if not session.get('boothOperatorInfo'):
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
+    
+    # 자신이 운영하는 부스만 구독 가능
+    current_operator = json.loads(session.get('boothOperatorInfo'))
+    booth = booths_repo.get(booth_id)
+    if not booth or booth['operator_id'] != current_operator['id']:
+        return jsonify({'ok': False, 'message': '부스 조회 권한이 없습니다.'}), 403
+    
+    return sse_response(booth_channel(booth_id))
+
 @booth_bp.route('/api/call-student', methods=['POST'])
 def api_call_student():
     """학생 호출 API"""
@@ -424,39 +433,36 @@ def api_call_student():
     
     try:
         # 대기열 엔트리 조회
-        entry_result = supabase.table('queue_entries').select('''
-            *, 
-            students!inner(name, phone),
-            booths!inner(name, location)
-        ''').eq('id', entry_id).execute()
+        entry = queue_engine.get_entry(entry_id)
         
-        if not entry_result.data:
+        if not entry:
             return jsonify({'ok': False, 'message': '대기열 엔트리를 찾을 수 없습니다.'})
         
-        entry = entry_result.data[0]
         student = entry['students']
         booth = entry['booths']
         
         # 상태를 'called'로 업데이트
-        update_result = supabase.table('queue_entries').update({
+        updated_entries = queue_engine.update_entry(entry_id, {
             'status': 'called',
-            'called_at': 'now()'
-        }).eq('id', entry_id).execute()
+            'called_at': datetime.now().isoformat()
+        })
         
-        if update_result.data:
+        if updated_entries:
+            publish_queue_change('called', updated_entries)
+            
             # SMS 알림 발송
             message = f"[{booth['name']}] 참가하실 시간입니다. {booth['location']}로 3분 내 방문해 주세요."
             
-            # SOLAPI를 통한 실제 SMS 발송
-            sms_success = send_sms_notification(
+            # 발송은 백그라운드에서 처리 (SMS 서버 응답을 기다리지 않음)
+            sms_queued = enqueue_sms(
                 phone_number=student['phone'],
                 message=message,
                 booth_id=entry['booth_id'],
                 student_id=entry['student_id']
             )
             
-            if sms_success:
-                return jsonify({'ok': True, 'message': '학생이 호출되었고 SMS가 발송되었습니다.'})
+            if sms_queued:
+                return jsonify({'ok': True, 'message': '학생이 호출되었고 SMS 발송이 예약되었습니다.'})
             else:
                 return jsonify({'ok': True, 'message': '학생이 호출되었지만 SMS 발송에 실패했습니다.'})
         else:
@@ -465,6 +471,41 @@ def api_call_student():
     except Exception as e:
         return jsonify({'ok': False, 'message': f'학생 호출 중 오류: {str(e)}'})
 
+@booth_bp.route('/api/call-next-students', methods=['POST'])
+def api_call_next_students():
+    """다음 대기자 N명 일괄 호출 API"""
+    if not SUPABASE_AVAILABLE:
+        return jsonify({'ok': False, 'message': 'Supabase not configured'}), 500
+    
+    data = request.get_json()
+    booth_id = data.get('booth_id')
+    
+    if not booth_id:
+        return jsonify({'ok': False, 'message': '부스 ID가 필요합니다.'})
+    
+    try:
+        call_count = int(data.get('count', 1))
+    except (TypeError, ValueError):
+        return jsonify({'ok': False, 'message': '호출 인원이 올바르지 않습니다.'})
+    
+    if call_count < 1 or call_count > MAX_GROUP_CALL_SIZE:
+        return jsonify({'ok': False, 'message': f'호출 인원은 1~{MAX_GROUP_CALL_SIZE}명이어야 합니다.'})
+    
+    try:
+        called_entries, sms_queued = call_next_students(booth_id, call_count)
+        
+        if not called_entries:
+            return jsonify({'ok': False, 'message': '호출할 대기 학생이 없습니다.'})
+        
+        if sms_queued:
+            message = f'{len(called_entries)}명이 호출되었고 SMS 발송이 예약되었습니다.'
+        else:
+            message = f'{len(called_entries)}명이 호출되었지만 SMS 발송에 실패했습니다.'
+        return jsonify({'ok': True, 'message': message, 'called_count': len(called_entries)})
+            
+    except Exception as e:
+        return jsonify({'ok': False, 'message': f'일괄 호출 중 오류: {str(e)}'})
+
 @booth_bp.route('/api/complete-student', methods=['POST'])
 def api_complete_student():
     """학생 완료 처리 API"""
@@ -479,12 +520,15 @@ def api_complete_student():
     
     try:
         # 상태를 'completed'로 업데이트
-        result = supabase.table('queue_entries').update({
+        updated_entries = queue_engine.update_entry(entry_id, {
             'status': 'completed',
-            'completed_at': 'now()'
-        }).eq('id', entry_id).execute()
+            'completed_at': datetime.now().isoformat()
+        })
         
-        if result.data:
+        if updated_entries:
+            wait_estimator.record_completions(updated_entries)
+            publish_queue_change('completed', updated_entries)
+            auto_call_scheduler.notify()
             return jsonify({'ok': True, 'message': '학생이 완료 처리되었습니다.'})
         else:
             return jsonify({'ok': False, 'message': '완료 처리에 실패했습니다.'})
@@ -506,39 +550,36 @@ def api_recall_student():
     
     try:
         # 대기열 엔트리 조회
-        entry_result = supabase.table('queue_entries').select('''
-            *, 
-            students!inner(name, phone),
-            booths!inner(name, location)
-        ''').eq('id', entry_id).execute()
+        entry = queue_engine.get_entry(entry_id)
         
-        if not entry_result.data:
+        if not entry:
             return jsonify({'ok': False, 'message': '대기열 엔트리를 찾을 수 없습니다.'})
         
-        entry = entry_result.data[0]
         student = entry['students']
         booth = entry['booths']
         
         # 상태를 'called'로 업데이트
-        update_result = supabase.table('queue_entries').update({
+        updated_entries = queue_engine.update_entry(entry_id, {
             'status': 'called',
-            'called_at': 'now()'
-        }).eq('id', entry_id).execute()
+            'called_at': datetime.now().isoformat()
+        })
         
-        if update_result.data:
+        if updated_entries:
+            publish_queue_change('recalled', updated_entries)
+            
             # SMS 알림 발송
             message = f"[{booth['name']}] 재호출입니다. {booth['location']}로 3분 내 방문해 주세요."
             
-            # SOLAPI를 통한 실제 SMS 발송
-            sms_success = send_sms_notification(
+            # 발송은 백그라운드에서 처리 (SMS 서버 응답을 기다리지 않음)
+            sms_queued = enqueue_sms(
                 phone_number=student['phone'],
                 message=message,
                 booth_id=entry['booth_id'],
                 student_id=entry['student_id']
             )
             
-            if sms_success:
-                return jsonify({'ok': True, 'message': '학생이 재호출되었고 SMS가 발송되었습니다.'})
+            if sms_queued:
+                return jsonify({'ok': True, 'message': '학생이 재호출되었고 SMS 발송이 예약되었습니다.'})
             else:
                 return jsonify({'ok': True, 'message': '학생이 재호출되었지만 SMS 발송에 실패했습니다.'})
         else:
@@ -560,14 +601,27 @@ def api_revert_student():
         return jsonify({'ok': False, 'message': '대기열 ID가 필요합니다.'})
     
     try:
-        # 상태를 'waiting'로 되돌리기
-        result = supabase.table('queue_entries').update({
+        entry = queue_engine.get_entry(entry_id)
+        if not entry:
+            return jsonify({'ok': False, 'message': '대기열 항목을 찾을 수 없습니다.'})
+        
+        # 완료/미방문 항목은 학생이 그 사이 같은 부스에 다시 신청했다면 되돌리지 않음 (진행 중 신청 중복 방지)
+        if entry['status'] not in ('waiting', 'called'):
+            has_active = queue_engine.has_active_entry(entry['booth_id'], entry['student_id'])
+            if has_active is None:
+                has_active = bool(queue_repo.student_statuses(entry['student_id'], [entry['booth_id']], ('waiting', 'called')))
+            if has_active:
+                return jsonify({'ok': False, 'message': '학생이 이미 이 부스에 다시 대기 신청하여 되돌릴 수 없습니다.'})
+        
+        # 상태를 'waiting'로 되돌리기 (확인 이후 상태가 바뀌었으면 변경하지 않음)
+        updated_entries = queue_engine.update_entry(entry_id, {
             'status': 'waiting',
             'called_at': None,
             'completed_at': None
-        }).eq('id', entry_id).execute()
+        }, expected_status=entry['status'])
         
-        if result.data:
+        if updated_entries:
+            publish_queue_change('reverted', updated_entries)
             return jsonify({'ok': True, 'message': '학생이 대기 상태로 되돌려졌습니다.'})
         else:
             return jsonify({'ok': False, 'message': '되돌리기에 실패했습니다.'})
@@ -588,42 +642,13 @@ def api_download_qr(booth_name):
         current_operator = json.loads(session.get('boothOperatorInfo'))
         
         # 해당 부스가 현재 운영자의 부스인지 확인
-        booth_result = supabase.table('booths').select('*').eq('name', booth_name).eq('operator_id', current_operator['id']).execute()
+        booth = booths_repo.get_by_name(booth_name)
         
-        if not booth_result.data:
+        if not booth or booth['operator_id'] != current_operator['id']:
             return jsonify({'ok': False, 'message': '해당 부스에 대한 권한이 없습니다.'}), 403
         
-        booth = booth_result.data[0]
-        
-        if booth['qr_file_path'] and os.path.exists(booth['qr_file_path']):
-            return send_file(booth['qr_file_path'], as_attachment=True, download_name=f'qr_{booth_name}.png')
-        else:
-            # QR 코드가 없으면 새로 생성
-            
-            # Generate QR code URL
-            base_url = os.environ.get('BASE_URL', 'https://dgmathft.up.railway.app')
-            qr_url = f"{base_url}/checkin?booth={booth_name}"
-            
-            # Create QR code
-            qr = qrcode.QRCode(version=1, box_size=10, border=5)
-            qr.add_data(qr_url)
-            qr.make(fit=True)
-            
-            # Generate QR code image
-            qr_img = qr.make_image(fill_color="black", back_color="white")
-            
-            # Create final image with booth name
-            final_img = create_qr_with_text(qr_img, booth_name)
-            
-            # Save QR code file
-            qr_file_path = save_qr_code_file(booth_name, final_img)
-            
-            # Update booth record with QR file path
-            supabase.table('booths').update({
-                'qr_file_path': qr_file_path
-            }).eq('id', booth['id']).execute()
-            
-            return send_file(qr_file_path, as_attachment=True, download_name=f'qr_{booth_name}.png')
+        # QR 이미지 저장소에서 바로 전송 (부스명/BASE_URL별로 한 번만 렌더링)
+        return send_booth_qr(booth_name)
             
     except Exception as e:
         return jsonify({'ok': False, 'message': f'QR 코드 다운로드 중 오류: {str(e)}'}), 500
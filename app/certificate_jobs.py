@@ -0,0 +1,254 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 확인증 일괄 발급 작업
+
+행사 당일 1,000장 이상의 확인증을 한 번에 출력하기 위한 백그라운드 작업입니다:
+- 발급 대상 학생 계산 (student_activity 요약/확인증 테이블을 페이지 단위로 조회)
+- 미발급 학생 일괄 발급 (번호 할당 + insert를 DB 함수 한 번에 처리)
+- 프로세스 풀에서 PDF 렌더링 후 ZIP 파일로 묶기
+- 진행률 조회 및 중단된 작업 재개 (작업 상태를 디스크의 manifest.json에 기록)
+"""
+
+import os
+import re
+import json
+import uuid
+import zipfile
+import threading
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from app.config import Config
+from app.settings import get_min_booth_count
+from app.repositories import student_activity_repo, sort_booth_records
+from app.certificates import (
+    PROJECT_ROOT, issue_certificates, get_certificate_renderer, student_cache_key
+)
+
+JOBS_DIR = os.path.join(PROJECT_ROOT, Config.CERTIFICATE_JOBS_DIR)
+
+# 프로세스 풀에 한 번에 넘기는 확인증 수
+RENDER_CHUNK_SIZE = 25
+
+# issue_certificates DB 함수 한 번에 넘기는 학생 수
+ISSUE_CHUNK_SIZE = 1000
+
+_JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+_jobs = {}  # job_id -> 진행 중인 작업 상태
+_jobs_lock = threading.Lock()
+
+def is_valid_job_id(job_id):
+    """작업 ID 형식 검증 (경로 조작 방지)"""
+    return bool(job_id and _JOB_ID_PATTERN.match(job_id))
+
+def _job_dir(job_id):
+    return os.path.join(JOBS_DIR, job_id)
+
+def _manifest_path(job_id):
+    return os.path.join(_job_dir(job_id), 'manifest.json')
+
+def zip_path(job_id):
+    """완성된 ZIP 파일 경로"""
+    return os.path.join(_job_dir(job_id), 'certificates.zip')
+
+def _save_manifest(job):
+    """작업 상태를 디스크에 기록 (임시 파일 후 교체)"""
+    job['updated_at'] = datetime.now().isoformat()
+    path = _manifest_path(job['job_id'])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(job, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def _load_manifest(job_id):
+    try:
+        with open(_manifest_path(job_id), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _safe_filename(cert_id, name):
+    safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).strip()
+    return f"{cert_id}_{safe_name}.pdf"
+
+# === 1단계: 발급 대상 계산 ===
+
+def collect_eligible_students():
+    """최소 체험 부스 수(get_min_booth_count) 이상 체험한 학생과 부스별 최신 소감 계산
+
+    반환: [{'student': {...}, 'booth_records': {부스명: {...}}}]
+    """
+    # student_activity에 부스별 최신 소감이 이미 모여 있으므로 대상 학생만 조회
+    eligible = []
+    for activity in student_activity_repo.iter_all(min_booth_count=get_min_booth_count()):
+        eligible.append({
+            'student': {
+                'school': activity['school'],
+                'grade': activity['grade'],
+                'class': activity['class'],
+                'number': activity['number'],
+                'name': activity['name']
+            },
+            'booth_records': sort_booth_records(activity.get('booth_records'))
+        })
+    return eligible
+
+# === 2단계: 일괄 발급 ===
+
+def issue_eligible_certificates(eligible):
+    """미발급 학생에게 확인증을 일괄 발급 (ISSUE_CHUNK_SIZE명씩 issue_certificates 호출)
+
+    반환: (전체 항목 리스트, 새로 발급한 수)
+    """
+    numbers = {}
+    issued = 0
+    for start in range(0, len(eligible), ISSUE_CHUNK_SIZE):
+        chunk = eligible[start:start + ISSUE_CHUNK_SIZE]
+        chunk_numbers, chunk_issued = issue_certificates([(entry['student'], entry['booth_records']) for entry in chunk])
+        numbers.update(chunk_numbers)
+        issued += chunk_issued
+
+    items = []
+    for entry in eligible:
+        cert_id = numbers[student_cache_key(entry['student'])]
+        items.append({
+            'student': entry['student'],
+            'booth_records': entry['booth_records'],
+            'cert_id': cert_id,
+            'filename': _safe_filename(cert_id, entry['student']['name'])
+        })
+    items.sort(key=lambda item: item['cert_id'])
+    return items, issued
+
+# === 3단계: 병렬 렌더링 ===
+
+def _render_certificate_files(job_dir, event_name, items):
+    """(작업 프로세스) 확인증 PDF를 작업 디렉토리에 파일로 저장"""
+    renderer = get_certificate_renderer()
+    for item in items:
+        path = os.path.join(job_dir, item['filename'])
+        pdf_buffer = renderer.render(item['student'], item['booth_records'], item['cert_id'], event_name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(pdf_buffer.getvalue())
+        os.replace(tmp_path, path)
+    return len(items)
+
+def _render_missing(job):
+    """아직 파일이 없는 확인증만 렌더링 (재개 시 완료분은 건너뜀)"""
+    job_dir = _job_dir(job['job_id'])
+    pending = [item for item in job['items'] if not os.path.exists(os.path.join(job_dir, item['filename']))]
+    job['rendered'] = len(job['items']) - len(pending)
+    _save_manifest(job)
+
+    if not pending:
+        return
+
+    chunks = [pending[i:i + RENDER_CHUNK_SIZE] for i in range(0, len(pending), RENDER_CHUNK_SIZE)]
+    # 요청 처리 스레드가 있는 프로세스에서 fork하지 않도록 spawn 사용
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=Config.CERTIFICATE_RENDER_WORKERS, mp_context=context) as executor:
+        futures = [executor.submit(_render_certificate_files, job_dir, job['event_name'], chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            job['rendered'] += future.result()
+            _save_manifest(job)
+
+# === 4단계: ZIP 묶기 ===
+
+def _package(job):
+    job_dir = _job_dir(job['job_id'])
+    path = zip_path(job['job_id'])
+    tmp_path = f"{path}.tmp"
+    # PDF는 이미 압축되어 있으므로 무압축으로 저장
+    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for item in job['items']:
+            archive.write(os.path.join(job_dir, item['filename']), arcname=item['filename'])
+    os.replace(tmp_path, path)
+
+# === 작업 실행/조회 ===
+
+def _run_job(job):
+    try:
+        if job.get('items') is None:
+            job['status'] = 'collecting'
+            _save_manifest(job)
+            eligible = collect_eligible_students()
+
+            job['status'] = 'issuing'
+            _save_manifest(job)
+            job['items'], job['issued'] = issue_eligible_certificates(eligible)
+            job['total'] = len(job['items'])
+
+        job['status'] = 'rendering'
+        _render_missing(job)
+
+        job['status'] = 'packaging'
+        _save_manifest(job)
+        _package(job)
+
+        job['status'] = 'done'
+        _save_manifest(job)
+    except Exception as e:
+        print(f"확인증 일괄 발급 작업 오류: {e}")
+        job['status'] = 'failed'
+        job['error'] = str(e)
+        _save_manifest(job)
+    finally:
+        with _jobs_lock:
+            _jobs.pop(job['job_id'], None)
+
+def start_bulk_certificate_job(event_name, job_id=None):
+    """일괄 발급 작업 시작 또는 재개 (작업 ID 반환)
+
+    job_id를 주면 디스크에 남은 상태에서 이어서 진행합니다.
+    """
+    with _jobs_lock:
+        if job_id:
+            if job_id in _jobs:
+                return job_id
+            job = _load_manifest(job_id)
+            if job is None:
+                raise ValueError('작업을 찾을 수 없습니다.')
+            if job['status'] == 'done':
+                return job_id
+            job['error'] = None
+        else:
+            job_id = uuid.uuid4().hex
+            os.makedirs(_job_dir(job_id), exist_ok=True)
+            job = {
+                'job_id': job_id,
+                'status': 'queued',
+                'event_name': event_name,
+                'items': None,
+                'total': 0,
+                'issued': 0,
+                'rendered': 0,
+                'error': None,
+                'created_at': datetime.now().isoformat()
+            }
+            _save_manifest(job)
+
+        _jobs[job_id] = job
+
+    threading.Thread(target=_run_job, args=(job,), daemon=True).start()
+    return job_id
+
+def get_job_progress(job_id):
+    """작업 진행률 조회 (없으면 None)"""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        job = _load_manifest(job_id)
+    if job is None:
+        return None
+
+    return {
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'total': job['total'],
+        'issued': job['issued'],
+        'rendered': job['rendered'],
+        'running': job_id in _jobs,
+        'error': job.get('error'),
+        'updated_at': job.get('updated_at')
+    }
@@ -0,0 +1,409 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 활동 확인증
+
+이 모듈은 확인증 발급과 관련된 공용 기능을 포함합니다:
+- 확인증 발급 (DB 카운터 행 기반 번호 할당 + insert를 한 트랜잭션에서 처리)
+- 확인증 PDF 렌더링 (폰트/스타일/관인 이미지를 프로세스당 한 번만 로드)
+- 렌더링된 PDF 캐시 (입력값 해시 키, 메모리 LRU + 디스크 저장소)
+"""
+
+import os
+import json
+import glob
+import hmac
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from datetime import datetime
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image as RLImage, Table, TableStyle
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from app.config import Config
+from app.repositories import certificates_repo, checkins_repo
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+FONT_PATH = os.path.join(PROJECT_ROOT, 'fonts', 'NanumGothic.ttf')
+
+# 전자관인 이미지 경로
+# 1순위: 관리자가 업로드한 커스텀 관인 (static/seal.png)
+# 2순위: 기본 관인 (image/GanIn.png)
+CUSTOM_SEAL_PATH = os.path.join(PROJECT_ROOT, 'static', 'seal.png')
+DEFAULT_SEAL_PATH = os.path.join(PROJECT_ROOT, 'image', 'GanIn.png')
+
+# 확인증 번호 접두어 (대수페-25-0001 형식)
+CERTIFICATE_PREFIX = '대수페-25'
+
+# === 확인증 발급 ===
+
+def certificate_row(student_info, booth_records):
+    """issue_certificates DB 함수에 넘기는 발급 행 (번호는 DB가 할당)"""
+    return {
+        'school': student_info['school'],
+        'grade': int(student_info['grade']),
+        'class': int(student_info['class']),
+        'number': int(student_info['number']),
+        'name': student_info['name'],
+        'booth_names': list(booth_records.keys()),
+        'booth_count': len(booth_records)
+    }
+
+def issue_certificates(entries):
+    """확인증 일괄 발급 (entries: [(학생 정보, booth_records)])
+
+    번호 할당과 insert를 issue_certificates() DB 함수 한 트랜잭션에서 처리합니다:
+    - certificate_counters 행을 잠근 뒤 아직 확인증이 없는 학생에게만 번호를 이어서 부여
+    - insert가 실패하면 카운터 증가도 함께 롤백되므로 번호가 비지 않음
+    - 여러 워커/일괄 발급 작업이 동시에 호출해도 카운터 행 잠금 순서대로 처리되어
+      같은 번호나 같은 학생의 확인증이 두 번 생기지 않음
+
+    반환: ({학생 키: 확인증 번호}, 새로 발급한 수) - 이미 발급된 학생은 기존 번호
+    """
+    rows = [certificate_row(student_info, booth_records) for student_info, booth_records in entries]
+    result = certificates_repo.issue(CERTIFICATE_PREFIX, rows)
+
+    numbers = {}
+    for cert in result.get('certificates') or []:
+        numbers.setdefault(student_cache_key(cert), cert['certificate_number'])
+    return numbers, result.get('issued') or 0
+
+def issue_certificate(student_info, booth_records):
+    """확인증 1건 발급 (확인증 번호 반환, 이미 발급된 학생이면 기존 번호)"""
+    numbers, _ = issue_certificates([(student_info, booth_records)])
+    return numbers[student_cache_key(student_info)]
+
+def get_or_issue_certificate(student_info, booth_records):
+    """이미 발급된 확인증 번호가 있으면 반환, 없으면 새로 발급"""
+    return certificates_repo.number_for(student_info) or issue_certificate(student_info, booth_records)
+
+# === 확인증 PDF 렌더링 ===
+
+def register_korean_font():
+    """한글 폰트 등록 후 폰트 이름 반환 (이미 등록된 경우 재사용)"""
+    if 'NanumGothic' in pdfmetrics.getRegisteredFontNames():
+        return 'NanumGothic'
+
+    try:
+        # 프로젝트에 포함된 나눔고딕 폰트 사용
+        if os.path.exists(FONT_PATH):
+            pdfmetrics.registerFont(TTFont('NanumGothic', FONT_PATH))
+            return 'NanumGothic'
+
+        # 폰트 파일이 없으면 CID 폰트 사용
+        pdfmetrics.registerFont(UnicodeCIDFont('HeiseiMin-W3'))
+        return 'HeiseiMin-W3'
+    except Exception as e:
+        print(f"폰트 등록 중 오류: {e}")
+        # 오류 발생 시 기본 폰트 사용
+        return 'Helvetica'
+
+class CertificateRenderer:
+    """확인증 PDF 렌더러
+
+    생성 시 폰트 등록, ParagraphStyle 구성, 관인 이미지 로드를 한 번만 수행하고
+    이후 render() 호출에서는 내용만 채워 PDF를 만듭니다.
+    """
+
+    def __init__(self):
+        self.font_name = register_korean_font()
+        self.styles = self._build_styles(self.font_name)
+        self.table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), self.font_name),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ])
+        self.seal_bytes = self._load_seal()
+        self.seal_hash = hashlib.sha256(self.seal_bytes).hexdigest() if self.seal_bytes else 'none'
+
+    @staticmethod
+    def _build_styles(font_name):
+        """확인증용 문단 스타일 구성"""
+        base = getSampleStyleSheet()
+        return {
+            'title': ParagraphStyle('TitleStyle', parent=base['Title'], fontName=font_name,
+                                    fontSize=24, alignment=TA_CENTER, spaceAfter=20, textColor=colors.black),
+            'normal': ParagraphStyle('NormalStyle', parent=base['Normal'], fontName=font_name,
+                                     fontSize=12, alignment=TA_LEFT, spaceAfter=10, textColor=colors.black),
+            'center': ParagraphStyle('CenterStyle', parent=base['Normal'], fontName=font_name,
+                                     fontSize=12, alignment=TA_CENTER, spaceAfter=10, textColor=colors.black),
+            'cert_number': ParagraphStyle('CertNumberStyle', parent=base['Normal'], fontName=font_name,
+                                          fontSize=10, alignment=TA_LEFT, textColor=colors.grey),
+        }
+
+    @staticmethod
+    def _load_seal():
+        """전자관인 이미지 바이트 로드 (없으면 None)"""
+        for seal_path in (CUSTOM_SEAL_PATH, DEFAULT_SEAL_PATH):
+            if os.path.exists(seal_path):
+                try:
+                    with open(seal_path, 'rb') as f:
+                        return f.read()
+                except Exception as e:
+                    print(f"관인 이미지 로드 실패: {e}")
+        return None
+
+    def render(self, student_info, booth_records, cert_id, event_name):
+        """확인증 PDF 생성 (BytesIO 반환)
+
+        booth_records는 {부스명: {'comment': ..., 'created_at': ...}} 형식입니다.
+        """
+        buffer = BytesIO()
+
+        # A4 용지 크기로 PDF 문서 생성
+        doc = SimpleDocTemplate(buffer, pagesize=A4,
+                                rightMargin=30*mm, leftMargin=30*mm,
+                                topMargin=20*mm, bottomMargin=20*mm)
+
+        styles = self.styles
+        story = []
+
+        # 1. 좌측 상단에 발급번호
+        story.append(Paragraph(f"발급번호: {cert_id}", styles['cert_number']))
+        story.append(Spacer(1, 20))
+
+        # 2. 상단 가운데에 행사명
+        story.append(Paragraph(f"{event_name} 활동 확인서", styles['title']))
+        story.append(Spacer(1, 20))
+
+        # 3. 학생 정보
+        student_info_text = f"""
+        <b>학교:</b> {student_info['school']}<br/>
+        <b>학급:</b> {student_info['grade']}학년 {student_info['class']}반 {student_info['number']}번<br/>
+        <b>이름:</b> {student_info['name']}<br/>
+        <b>체험 부스 수:</b> {len(booth_records)}개
+        """
+        story.append(Paragraph(student_info_text, styles['normal']))
+        story.append(Spacer(1, 20))
+
+        # 4. 체험 부스 목록
+        if booth_records:
+            story.append(Paragraph("<b>체험한 부스 목록</b>", styles['normal']))
+            story.append(Spacer(1, 10))
+
+            table_data = [['번호', '부스명', '소감']]
+            for i, (booth_name, record) in enumerate(booth_records.items(), 1):
+                comment = record.get('comment') or '소감 없음'
+                if len(comment) > 50:  # 긴 소감은 줄임
+                    comment = comment[:47] + "..."
+                table_data.append([str(i), booth_name, comment])
+
+            table = Table(table_data, colWidths=[20*mm, 50*mm, 80*mm])
+            table.setStyle(self.table_style)
+            story.append(table)
+            story.append(Spacer(1, 30))
+
+        # 5. 확인 문구
+        confirmation_text = f"""
+        위 학생은 대구광역시교육청이 주최•주관하고, 대구중등수학교육연구회가 운영한 
+        '{event_name}'에 참여하여 창의적 체험활동을 하였으므로 위 내용을 확인합니다.
+        """
+        story.append(Paragraph(confirmation_text, styles['center']))
+        story.append(Spacer(1, 30))
+
+        # 6. 발급일자
+        issue_date = datetime.now().strftime('%Y년 %m월 %d일')
+        story.append(Paragraph(f"발급일: {issue_date}", styles['center']))
+        story.append(Spacer(1, 40))
+
+        # 7. 발급기관 및 전자관인
+        story.append(Paragraph("대구중등수학교육연구회장", styles['center']))
+        story.append(Spacer(1, 20))
+
+        if self.seal_bytes:
+            try:
+                seal_img = RLImage(BytesIO(self.seal_bytes), width=60, height=60)
+                seal_img.hAlign = 'CENTER'
+                story.append(seal_img)
+            except Exception:
+                # 이미지 로드 실패시 텍스트로 대체
+                story.append(Paragraph("(관인)", styles['center']))
+        else:
+            story.append(Paragraph("(관인)", styles['center']))
+
+        doc.build(story)
+        buffer.seek(0)
+        return buffer
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+def get_certificate_renderer():
+    """프로세스 공용 확인증 렌더러 반환 (최초 호출 시 생성)"""
+    global _renderer
+
+    renderer = _renderer
+    if renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = CertificateRenderer()
+            renderer = _renderer
+    return renderer
+
+def reset_certificate_renderer():
+    """관인 변경 등으로 렌더러와 PDF 캐시 폐기 (다음 요청에서 다시 로드)"""
+    global _renderer
+
+    with _renderer_lock:
+        _renderer = None
+    certificate_pdf_cache.clear()
+
+def generate_certificate_pdf(student_info, booth_records, cert_id, event_name):
+    """확인증 PDF 생성"""
+    return get_certificate_renderer().render(student_info, booth_records, cert_id, event_name)
+
+# === 렌더링된 확인증 PDF 캐시 ===
+
+def student_cache_key(student_info):
+    """학생 식별 키 (학교-학년-반-번호-이름)"""
+    return f"{student_info['school']}-{student_info['grade']}-{student_info['class']}-{student_info['number']}-{student_info['name']}"
+
+def certificate_cache_key(student_info, booth_records, cert_id, event_name, seal_hash):
+    """확인증 PDF 내용을 결정하는 입력값 전체의 해시
+
+    발급일이 PDF에 찍히므로 날짜도 키에 포함합니다.
+    """
+    payload = json.dumps({
+        'student': student_cache_key(student_info),
+        'cert_id': cert_id,
+        'booths': [[booth_name, record.get('comment')] for booth_name, record in booth_records.items()],
+        'event_name': event_name,
+        'seal': seal_hash,
+        'issue_date': datetime.now().strftime('%Y-%m-%d')
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class CertificatePdfCache:
+    """확인증 PDF 캐시 (메모리 LRU + 디스크 저장소)
+
+    키가 입력값의 해시이므로 입력이 바뀌면 자연히 새 키가 됩니다.
+    invalidate_student()/clear()는 더 이상 쓰이지 않을 항목을 정리합니다.
+    디스크 파일명은 "<학생 해시>_<키>.pdf" 형식이라 학생 단위로 삭제할 수 있습니다.
+    """
+
+    def __init__(self, cache_dir, max_entries=256):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (student_digest, pdf_bytes)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _student_digest(student_key):
+        return hashlib.sha1(student_key.encode('utf-8')).hexdigest()[:16]
+
+    def _path(self, student_digest, key):
+        return os.path.join(self.cache_dir, f"{student_digest}_{key}.pdf")
+
+    def get(self, key, student_key):
+        """캐시된 PDF 바이트 조회 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        student_digest = self._student_digest(student_key)
+        path = self._path(student_digest, key)
+        try:
+            with open(path, 'rb') as f:
+                pdf_bytes = f.read()
+        except OSError:
+            return None
+
+        self._remember(key, student_digest, pdf_bytes)
+        return pdf_bytes
+
+    def put(self, key, student_key, pdf_bytes):
+        """PDF 바이트를 메모리와 디스크에 저장"""
+        student_digest = self._student_digest(student_key)
+        self._remember(key, student_digest, pdf_bytes)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(student_digest, key)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"확인증 캐시 저장 실패: {e}")
+
+    def _remember(self, key, student_digest, pdf_bytes):
+        with self._lock:
+            self._entries[key] = (student_digest, pdf_bytes)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_student(self, student_key):
+        """특정 학생의 캐시 항목 삭제"""
+        student_digest = self._student_digest(student_key)
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry[0] == student_digest]:
+                del self._entries[key]
+
+        for path in glob.glob(os.path.join(self.cache_dir, f"{student_digest}_*.pdf")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """전체 캐시 삭제 (행사명/관인 변경 시)"""
+        with self._lock:
+            self._entries.clear()
+
+        for path in glob.glob(os.path.join(self.cache_dir, '*.pdf')):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+certificate_pdf_cache = CertificatePdfCache(
+    os.path.join(PROJECT_ROOT, Config.CERTIFICATE_CACHE_DIR),
+    max_entries=Config.CERTIFICATE_CACHE_SIZE
+)
+
+def get_certificate_pdf(student_info, booth_records, cert_id, event_name):
+    """캐시를 거쳐 확인증 PDF 조회 ((etag, pdf_bytes) 반환)
+
+    같은 입력이면 렌더링 없이 메모리 또는 디스크에서 바로 반환합니다.
+    """
+    renderer = get_certificate_renderer()
+    key = certificate_cache_key(student_info, booth_records, cert_id, event_name, renderer.seal_hash)
+    student_key = student_cache_key(student_info)
+
+    pdf_bytes = certificate_pdf_cache.get(key, student_key)
+    if pdf_bytes is None:
+        pdf_bytes = renderer.render(student_info, booth_records, cert_id, event_name).getvalue()
+        certificate_pdf_cache.put(key, student_key, pdf_bytes)
+
+    return key, pdf_bytes
+
+def certificate_download_token(cert_id):
+    """확인증 GET 다운로드 주소용 서명 (번호만 알아서는 다른 학생 확인증을 받을 수 없도록)"""
+    return hmac.new(Config.SECRET_KEY.encode('utf-8'), cert_id.encode('utf-8'), hashlib.sha256).hexdigest()[:32]
+
+def verify_certificate_download_token(cert_id, token):
+    return bool(token) and hmac.compare_digest(certificate_download_token(cert_id), token)
+
+def invalidate_student_certificate(student_info):
+    """학생의 체크인 기록 변경 시 캐시된 확인증 PDF 폐기"""
+    certificate_pdf_cache.invalidate_student(student_cache_key(student_info))
+
+def _invalidate_changed_checkins(rows):
+    """체크인 기록이 추가/수정/삭제되면 해당 학생의 캐시된 확인증 PDF 폐기"""
+    for row in rows:
+        invalidate_student_certificate(row)
+
+checkins_repo.add_change_hook(_invalidate_changed_checkins)
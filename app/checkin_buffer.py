@@ -0,0 +1,314 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 체크인 로컬 버퍼 (write-ahead)
+
+QR 체크인을 요청 처리 중에 Supabase에 직접 넣지 않고, 로컬 SQLite(WAL) 파일에
+먼저 기록한 뒤 바로 응답합니다. DB가 느리거나 잠시 끊겨도 체크인이 유실되지 않습니다:
+- 체크인마다 ingest_id(UUID)를 붙여 로컬 로그에 기록 (커밋 후 응답)
+  - 체크인 화면이 보낸 idempotency_key가 있으면 그 값을 ingest_id로 사용 (연타해도 1건)
+- dedupe_key: 학생 5개 컬럼 + 부스 + 시간 구간(CHECKIN_DEDUPE_WINDOW_MINUTES)
+  → 같은 구간에 다시 체크인하면 새 행 대신 소감만 갱신 (QR 재스캔)
+- 백그라운드 스레드가 오래된 순으로 CHECKIN_FLUSH_BATCH_SIZE건씩 upsert_checkins DB 함수로 전송
+  - ingest_id/dedupe_key 유니크 인덱스 기준 upsert → 재시작 후 재전송해도 중복 기록 없음
+- 전송 실패 시 지수 백오프로 재시도, 반복 실패하면 한 건씩 보내 문제 행만 'failed'로 분리
+  - 'failed' 행은 원인을 고친 뒤 관리자 API로 다시 대기 상태로 돌려 재전송 (requeue_failed)
+- 로컬 기록 자체가 실패하면 요청 안에서 바로 upsert_checkins 호출
+- 버퍼 파일은 영구 볼륨에 있어야 하므로 CHECKIN_BUFFER_PATH가 비어 있으면 버퍼를 쓰지 않음
+"""
+
+import os
+import json
+import uuid
+import hashlib
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from app.db import get_supabase
+from app.config import Config
+from app.repositories import checkins_repo, student_key
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# 배치 전송이 이 횟수 이상 실패하면 한 건씩 보내 문제 행을 찾음
+ISOLATE_AFTER_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_checkins (
+    ingest_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    buffered_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pending_checkins_status ON pending_checkins(status, buffered_at);
+"""
+
+class CheckinBuffer:
+    """로컬 SQLite 체크인 로그 + Supabase 일괄 전송 스레드"""
+
+    def __init__(self, path):
+        self.path = path  # None이면 버퍼 사용 안 함 (영구 볼륨 경로 미설정)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            'buffered': 0,
+            'flushed': 0,
+            'merged': 0,
+            'failed_batches': 0,
+            'last_flush_at': None,
+            'last_error': None
+        }
+
+    # --- 로컬 로그 ---
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+
+        with self._init_lock:
+            if not self._initialized:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # WAL + FULL: 커밋마다 WAL을 fsync (프로세스/전원 종료 후에도 기록 유지)
+            conn.execute('PRAGMA synchronous=FULL')
+            if not self._initialized:
+                conn.executescript(SCHEMA)
+                self._initialized = True
+        self._local.conn = conn
+        return conn
+
+    def append(self, row):
+        """prepare_checkin()으로 만든 행을 로컬 로그에 기록 (전송은 백그라운드)
+
+        같은 ingest_id가 아직 대기 중이면 새 행 대신 내용만 바꿉니다.
+        """
+        self._connect().execute(
+            "INSERT INTO pending_checkins (ingest_id, payload, buffered_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(ingest_id) DO UPDATE SET payload = excluded.payload, status = 'pending'",
+            (row['ingest_id'], json.dumps(row, ensure_ascii=False), time.time())
+        )
+        with self._metrics_lock:
+            self._metrics['buffered'] += 1
+        self._wakeup.set()
+        return row['ingest_id']
+
+    def _due_rows(self, limit):
+        return self._connect().execute(
+            "SELECT ingest_id, payload, attempts FROM pending_checkins WHERE status = 'pending' ORDER BY buffered_at LIMIT ?",
+            (limit,)
+        ).fetchall()
+
+    def _remove(self, ingest_ids):
+        conn = self._connect()
+        conn.executemany('DELETE FROM pending_checkins WHERE ingest_id = ?', [(i,) for i in ingest_ids])
+
+    def _mark(self, ingest_ids, error, status='pending'):
+        conn = self._connect()
+        conn.executemany(
+            'UPDATE pending_checkins SET attempts = attempts + 1, last_error = ?, status = ? WHERE ingest_id = ?',
+            [(error, status, i) for i in ingest_ids]
+        )
+
+    @property
+    def enabled(self):
+        """버퍼 사용 여부 (CHECKIN_BUFFER_ENABLED + 영구 볼륨 경로 설정)"""
+        return Config.CHECKIN_BUFFER_ENABLED and bool(self.path)
+
+    def counts(self):
+        """로컬 로그의 상태별 건수 ({'pending': n, 'failed': n})"""
+        counts = {'pending': 0, 'failed': 0}
+        if not self.path:
+            return counts
+        rows = self._connect().execute('SELECT status, COUNT(*) FROM pending_checkins GROUP BY status').fetchall()
+        counts.update(dict(rows))
+        return counts
+
+    def failed_rows(self, limit=50):
+        """'failed'로 분리된 체크인 (오래된 순, 관리자 확인용)"""
+        if not self.path:
+            return []
+        rows = self._connect().execute(
+            "SELECT ingest_id, payload, attempts, last_error FROM pending_checkins WHERE status = 'failed' ORDER BY buffered_at LIMIT ?",
+            (limit,)
+        ).fetchall()
+        return [
+            {'ingest_id': ingest_id, 'checkin': json.loads(payload), 'attempts': attempts, 'last_error': last_error}
+            for ingest_id, payload, attempts, last_error in rows
+        ]
+
+    def requeue_failed(self, ingest_ids=None):
+        """'failed' 행을 다시 전송 대기 상태로 (ingest_ids가 없으면 전체, 바꾼 건수 반환)"""
+        if not self.path:
+            return 0
+        conn = self._connect()
+        if ingest_ids is None:
+            cursor = conn.execute("UPDATE pending_checkins SET status = 'pending', attempts = 0 WHERE status = 'failed'")
+            requeued = cursor.rowcount
+        else:
+            requeued = 0
+            for ingest_id in ingest_ids:
+                cursor = conn.execute(
+                    "UPDATE pending_checkins SET status = 'pending', attempts = 0 WHERE status = 'failed' AND ingest_id = ?",
+                    (ingest_id,)
+                )
+                requeued += cursor.rowcount
+        if requeued:
+            self._wakeup.set()
+        return requeued
+
+    # --- Supabase 전송 ---
+
+    def _send(self, rows):
+        """upsert_checkins 호출, 기존 행에 합쳐진(소감만 갱신된) 건수 반환"""
+        result = checkins_repo.upsert_checkins(rows)
+        return len(rows) - len(result.get('inserted') or [])
+
+    def _flush_batch(self, due):
+        ingest_ids = [ingest_id for ingest_id, _, _ in due]
+        rows = [json.loads(payload) for _, payload, _ in due]
+        try:
+            merged = self._send(rows)
+        except Exception as e:
+            self._mark(ingest_ids, str(e))
+            self._record_error(e)
+            if max(attempts for _, _, attempts in due) + 1 >= ISOLATE_AFTER_ATTEMPTS and len(due) > 1:
+                return self._isolate(due)
+            return 0, False
+
+        self._remove(ingest_ids)
+        with self._metrics_lock:
+            self._metrics['flushed'] += len(rows)
+            self._metrics['merged'] += merged
+            self._metrics['last_flush_at'] = datetime.now().isoformat()
+        return len(rows), True
+
+    def _isolate(self, due):
+        """한 건씩 전송: 일부만 실패하면 그 행은 DB 장애가 아닌 데이터 문제로 보고 'failed'로 분리"""
+        sent, failed = [], []
+        for ingest_id, payload, _ in due:
+            try:
+                self._send([json.loads(payload)])
+                sent.append(ingest_id)
+            except Exception as e:
+                failed.append((ingest_id, str(e)))
+
+        if not sent:
+            return 0, False  # 전부 실패: DB 장애로 보고 배치째 재시도
+
+        self._remove(sent)
+        for ingest_id, error in failed:
+            self._mark([ingest_id], error, status='failed')
+            print(f"체크인 전송 실패 행 분리: {ingest_id} ({error})")
+        with self._metrics_lock:
+            self._metrics['flushed'] += len(sent)
+            self._metrics['last_flush_at'] = datetime.now().isoformat()
+        return len(sent), True
+
+    def _record_error(self, error):
+        with self._metrics_lock:
+            self._metrics['failed_batches'] += 1
+            self._metrics['last_error'] = str(error)
+        print(f"체크인 전송 실패 (재시도 예정): {error}")
+
+    def flush(self):
+        """대기 중인 체크인을 모두 전송 시도
+
+        반환: (전송한 건수, 마지막 배치 성공 여부)
+        """
+        if not get_supabase():
+            return 0, False
+
+        flushed = 0
+        while True:
+            due = self._due_rows(Config.CHECKIN_FLUSH_BATCH_SIZE)
+            if not due:
+                return flushed, True
+            sent, ok = self._flush_batch(due)
+            flushed += sent
+            if not ok:
+                return flushed, False
+
+    def metrics(self):
+        """프로세스 시작 이후 버퍼 통계 + 현재 로컬 대기 건수"""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics.update(self.counts())
+        metrics['enabled'] = self.enabled
+        metrics['path'] = self.path
+        return metrics
+
+    def _run(self):
+        failures = 0
+        while True:
+            try:
+                _, ok = self.flush()
+            except Exception as e:
+                print(f"체크인 전송 스레드 오류: {e}")
+                ok = False
+
+            failures = 0 if ok else failures + 1
+            if failures:
+                # 연속 실패 시 지수 백오프 (상한 적용)
+                delay = min(Config.CHECKIN_FLUSH_INTERVAL * (2 ** (failures - 1)), Config.CHECKIN_FLUSH_MAX_DELAY)
+                time.sleep(delay)
+            else:
+                # 새 체크인이 기록되면 바로 깨어나고, 아니면 주기적으로 확인
+                self._wakeup.wait(Config.CHECKIN_FLUSH_INTERVAL)
+                self._wakeup.clear()
+
+    def start(self):
+        """전송 스레드 시작 (프로세스당 1회, 이전 실행에서 남은 체크인도 전송)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='checkin-flusher', daemon=True)
+            self._thread.start()
+
+checkin_buffer = CheckinBuffer(os.path.join(PROJECT_ROOT, Config.CHECKIN_BUFFER_PATH) if Config.CHECKIN_BUFFER_PATH else None)
+
+def _ingest_id(idempotency_key):
+    """체크인 화면이 보낸 키가 UUID면 그대로, 아니면 새로 발급"""
+    try:
+        return str(uuid.UUID(str(idempotency_key)))
+    except (TypeError, ValueError):
+        return str(uuid.uuid4())
+
+def dedupe_key(checkin_data, checked_in_at):
+    """학생 + 부스 + 시간 구간이 같으면 같은 값 (구간이 0이면 중복 병합 안 함 → None)"""
+    window = Config.CHECKIN_DEDUPE_WINDOW_MINUTES * 60
+    if window <= 0:
+        return None
+    bucket = int(checked_in_at.timestamp() // window)
+    parts = [str(value) for value in student_key(checkin_data)] + [checkin_data['booth'], str(bucket)]
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+def prepare_checkin(checkin_data, idempotency_key=None):
+    """체크인 행에 ingest_id, created_at, dedupe_key 추가"""
+    # DB에 늦게 들어가도 체험 시각은 실제 체크인 시각으로 기록
+    checked_in_at = datetime.now()
+    return dict(
+        checkin_data,
+        ingest_id=_ingest_id(idempotency_key),
+        created_at=checked_in_at.isoformat(),
+        dedupe_key=dedupe_key(checkin_data, checked_in_at)
+    )
+
+def record_checkin(checkin_data, idempotency_key=None):
+    """체크인 기록 (버퍼 사용 시 로컬 로그에 기록 후 바로 반환, 성공 여부 반환)"""
+    row = prepare_checkin(checkin_data, idempotency_key)
+    if checkin_buffer.enabled:
+        try:
+            checkin_buffer.append(row)
+            return True
+        except Exception as e:
+            print(f"체크인 로컬 기록 실패, 바로 저장으로 대체: {e}")
+    result = checkins_repo.upsert_checkins([row])
+    return bool(result.get('inserted') or result.get('updated'))
@@ -12,9 +12,82 @@ class Config:
     SOLAPI_API_SECRET = os.environ.get("SOLAPI_API_SECRET") 
     SOLAPI_SENDER_PHONE = os.environ.get("SOLAPI_SENDER_PHONE")
     
+    # 배포 주소 (부스 QR 코드에 담기는 체크인 URL)
+    BASE_URL = os.environ.get('BASE_URL', 'https://dgmathft.up.railway.app')
+    
+    # 부스 QR 이미지 저장소 (디스크 경로는 프로젝트 루트 기준)
+    QR_ASSET_DIR = os.environ.get('QR_ASSET_DIR', 'cache/qr_codes')
+    QR_ASSET_CACHE_SIZE = int(os.environ.get('QR_ASSET_CACHE_SIZE', '256'))
+    
+    # 부스 QR 인쇄용 PDF: QR 이미지 렌더링 프로세스 수
+    QR_SHEET_RENDER_WORKERS = int(os.environ.get('QR_SHEET_RENDER_WORKERS', str(min(4, os.cpu_count() or 1))))
+    
     # 파일 업로드 설정
     UPLOAD_FOLDER = 'static/uploads/booth_pdfs'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
     
+    # 렌더링된 확인증 PDF 캐시 (디스크 경로는 프로젝트 루트 기준)
+    CERTIFICATE_CACHE_DIR = os.environ.get('CERTIFICATE_CACHE_DIR', 'cache/certificates')
+    CERTIFICATE_CACHE_SIZE = int(os.environ.get('CERTIFICATE_CACHE_SIZE', '256'))
+    
+    # 확인증 일괄 발급 작업 (작업 디렉토리, 렌더링 프로세스 수)
+    CERTIFICATE_JOBS_DIR = os.environ.get('CERTIFICATE_JOBS_DIR', 'cache/certificate_jobs')
+    CERTIFICATE_RENDER_WORKERS = int(os.environ.get('CERTIFICATE_RENDER_WORKERS', str(min(4, os.cpu_count() or 1))))
+    
+    # SMS outbox 발송 (재시도 간격은 초 단위)
+    SMS_OUTBOX_POLL_INTERVAL = float(os.environ.get('SMS_OUTBOX_POLL_INTERVAL', '5'))
+    SMS_BATCH_SIZE = int(os.environ.get('SMS_BATCH_SIZE', '50'))
+    SMS_MAX_ATTEMPTS = int(os.environ.get('SMS_MAX_ATTEMPTS', '5'))
+    SMS_RETRY_BASE_DELAY = int(os.environ.get('SMS_RETRY_BASE_DELAY', '10'))
+    SMS_RETRY_MAX_DELAY = int(os.environ.get('SMS_RETRY_MAX_DELAY', '300'))
+    # 'sending'으로 선점한 뒤 이 시간이 지나도 결과가 기록되지 않은 알림만 다시 대기 상태로
+    SMS_CLAIM_LEASE_SECONDS = int(os.environ.get('SMS_CLAIM_LEASE_SECONDS', '600'))
+    
+    # 메모리 대기열 엔진 (DB와 비교하여 어긋난 항목을 바로잡는 주기, 초)
+    QUEUE_ENGINE_ENABLED = os.environ.get('QUEUE_ENGINE_ENABLED', 'true').lower() == 'true'
+    QUEUE_RECONCILE_INTERVAL = int(os.environ.get('QUEUE_RECONCILE_INTERVAL', '60'))
+    # DB 반영 실패 시 재시도 대기 시간 (초, 실패할 때마다 두 배, 상한까지)
+    QUEUE_WRITE_RETRY_BASE_DELAY = int(os.environ.get('QUEUE_WRITE_RETRY_BASE_DELAY', '1'))
+    QUEUE_WRITE_RETRY_MAX_DELAY = int(os.environ.get('QUEUE_WRITE_RETRY_MAX_DELAY', '60'))
+
+    # 대기열 실시간 알림(SSE): 스트림 하나가 gthread 스레드 하나를 차지하므로 동시 스트림 수 제한,
+    # 스트림 최대 유지 시간(초)이 지나면 연결을 닫아 스레드를 돌려줌 (브라우저가 자동 재연결)
+    SSE_MAX_STREAMS = int(os.environ.get('SSE_MAX_STREAMS', '8'))
+    SSE_MAX_STREAM_SECONDS = int(os.environ.get('SSE_MAX_STREAM_SECONDS', '300'))
+    
+    # 예상 대기 시간 계산 시 체험 기록이 없는 부스의 기본 소요 시간 (분)
+    DEFAULT_SERVICE_MINUTES = float(os.environ.get('DEFAULT_SERVICE_MINUTES', '5'))
+    
+    # 자동 호출 부스의 빈자리 확인 주기 (초)
+    AUTO_CALL_INTERVAL = int(os.environ.get('AUTO_CALL_INTERVAL', '10'))
+    
+    # 미방문 처리 (호출 후 부스별 제한 시간이 지난 학생, 확인 주기는 초 단위, 기본 꺼짐)
+    NO_SHOW_SWEEP_ENABLED = os.environ.get('NO_SHOW_SWEEP_ENABLED', 'false').lower() == 'true'
+    NO_SHOW_SWEEP_INTERVAL = int(os.environ.get('NO_SHOW_SWEEP_INTERVAL', '30'))
+    NO_SHOW_REQUEUE = os.environ.get('NO_SHOW_REQUEUE', 'false').lower() == 'true'
+    
+    # 요청당 DB 쿼리 수 상한 (초과 시 경고, STRICT면 예외)
+    MAX_QUERIES_PER_REQUEST = int(os.environ.get('MAX_QUERIES_PER_REQUEST', '20'))
+    QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', 'false').lower() == 'true'
+    
+    # settings 테이블 캐시 (전체 재조회 주기, 다른 워커의 변경 확인 주기, 초)
+    SETTINGS_CACHE_TTL = int(os.environ.get('SETTINGS_CACHE_TTL', '300'))
+    SETTINGS_VERSION_CHECK_INTERVAL = int(os.environ.get('SETTINGS_VERSION_CHECK_INTERVAL', '5'))
+    
+    # 확인증 발급에 필요한 최소 체험 부스 수 (settings의 min_booth_count가 우선)
+    MIN_BOOTH_COUNT = int(os.environ.get('MIN_BOOTH_COUNT', '3'))
+    
+    # 체크인 로컬 버퍼 (전송 주기/백오프 상한은 초 단위)
+    # CHECKIN_BUFFER_PATH는 재배포·재시작 후에도 남는 영구 볼륨의 SQLite 파일 경로여야 하며,
+    # 비어 있으면 버퍼를 쓰지 않고 요청 안에서 바로 저장 (PaaS 임시 파일시스템에 기록하면 재배포 시 유실)
+    CHECKIN_BUFFER_ENABLED = os.environ.get('CHECKIN_BUFFER_ENABLED', 'true').lower() == 'true'
+    CHECKIN_BUFFER_PATH = os.environ.get('CHECKIN_BUFFER_PATH', '')
+    CHECKIN_FLUSH_BATCH_SIZE = int(os.environ.get('CHECKIN_FLUSH_BATCH_SIZE', '200'))
+    CHECKIN_FLUSH_INTERVAL = float(os.environ.get('CHECKIN_FLUSH_INTERVAL', '2'))
+    CHECKIN_FLUSH_MAX_DELAY = float(os.environ.get('CHECKIN_FLUSH_MAX_DELAY', '60'))
+    
+    # 같은 학생이 같은 부스에 이 시간(분) 구간 안에 다시 체크인하면 소감만 갱신 (0이면 병합 안 함)
+    CHECKIN_DEDUPE_WINDOW_MINUTES = int(os.environ.get('CHECKIN_DEDUPE_WINDOW_MINUTES', '30'))
+    
     # 관리자 비밀번호
     ADMIN_PASSWORD = 'admin'
\ No newline at end of file
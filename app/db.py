@@ -65,6 +65,28 @@ def get_solapi():
     """SOLAPI 서비스 반환"""
     return solapi_service
 
+def count(table, **filters):
+    """테이블 행 수 조회 (PostgREST count='exact', head=True)
+
+    행 데이터는 전송하지 않고 Content-Range 헤더의 개수만 받습니다.
+    필터 값이 list/tuple/set이면 in_, 그 외에는 eq 조건으로 적용합니다.
+    예: count('queue_entries', booth_id=3, status='waiting')
+    """
+    if not supabase:
+        return 0
+    
+    query = supabase.table(table).select('id', count='exact', head=True)
+    for column, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            query = query.in_(column, list(value))
+        else:
+            query = query.eq(column, value)
+    
+    # 요청당 쿼리 수 집계 (repositories가 이 모듈을 import하므로 호출 시점에 가져옴)
+    from app.repositories import run_query
+    result = run_query(table, 'count', query)
+    return result.count or 0
+
 def encrypt_password(password):
     """비밀번호 암호화 함수"""
     md5_hash = hashlib.md5(password.encode('utf-8')).hexdigest()
@@ -72,4 +94,28 @@ def encrypt_password(password):
 
 def verify_password(stored_password, provided_password):
     """비밀번호 검증 함수"""
-    return stored_password == encrypt_password(provided_password)
\ No newline at end of file
+    return stored_password == encrypt_password(provided_password)
+
+def iter_rows(build_query, page_size=1000):
+    """id 오름차순 keyset 페이지 단위로 전체 행 순회
+
+    PostgREST는 페이지 지정이 없는 select를 최대 행 수(기본 1,000)에서 자르므로,
+    큰 테이블은 이 함수로 끝까지 읽어야 합니다. OFFSET(range) 대신 마지막으로 읽은 id
+    다음부터 이어서 조회하므로, 순회 중에 행이 추가/삭제되어도 이미 읽은 행이 다시 나오거나
+    남은 행을 건너뛰지 않습니다 (순회 중 추가된 행은 끝에 포함될 수 있음).
+    build_query는 매 페이지마다 새 쿼리 빌더를 반환하는 함수이며, id 컬럼을 조회해야 하고
+    정렬은 지정하지 않습니다 (이 함수가 id 순으로 정렬).
+    예: iter_rows(lambda: supabase.table('checkins').select('*'))
+    """
+    from app.repositories import run_query
+    last_id = None
+    while True:
+        query = build_query()
+        if last_id is not None:
+            query = query.gt('id', last_id)
+        rows = run_query(None, 'iter_rows', query.order('id').limit(page_size)).data or []
+        for row in rows:
+            yield row
+        if len(rows) < page_size:
+            break
+        last_id = rows[-1]['id']
@@ -0,0 +1,143 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 대기열 실시간 알림 (Server-Sent Events)
+
+대기열 상태가 바뀔 때만 변경 내용을 구독자에게 보내
+운영자·학생·관리자 화면의 반복 조회(polling)를 대체합니다:
+- 채널: booth:<부스 ID>, student:<학생 ID>, admin
+- 프로세스 내부 fan-out (gunicorn 워커 1개 기준, Procfile 참고)
+- 구독자별 버퍼가 가득 차면 가장 오래된 이벤트부터 버림
+- 스트림 하나가 gthread 스레드 하나를 차지하므로 동시 스트림 수(SSE_MAX_STREAMS)를 제한하고,
+  한도를 넘으면 503으로 거절하여 화면이 주기적 조회로 전환하도록 함
+- 스트림은 SSE_MAX_STREAM_SECONDS 후 종료되어 스레드를 돌려주고, 브라우저가 자동 재연결
+"""
+
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+from flask import Response, jsonify, stream_with_context
+
+from app.config import Config
+
+# 연결 유지용 주석 전송 간격 (초)
+KEEPALIVE_INTERVAL = 15
+
+# 구독자 한 명이 보관하는 최대 이벤트 수
+SUBSCRIBER_BUFFER_SIZE = 100
+
+class QueueEventBroker:
+    """채널별 구독자 목록을 관리하고 이벤트를 전달"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # channel -> set(queue.Queue)
+
+    def subscribe(self, channel, limit=None):
+        """채널 구독 (limit: 전체 구독자 수 상한, 넘으면 None 반환)"""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_BUFFER_SIZE)
+        with self._lock:
+            if limit is not None and sum(len(subscribers) for subscribers in self._subscribers.values()) >= limit:
+                return None
+            self._subscribers.setdefault(channel, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, channel, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # 느린 구독자는 오래된 이벤트를 버리고 최신 상태를 받음
+                try:
+                    subscriber.get_nowait()
+                    subscriber.put_nowait(event)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+queue_event_broker = QueueEventBroker()
+
+def booth_channel(booth_id):
+    return f"booth:{booth_id}"
+
+def student_channel(student_id):
+    return f"student:{student_id}"
+
+ADMIN_CHANNEL = 'admin'
+
+def publish_queue_change(change, entries):
+    """대기열 변경 사항을 부스·학생·관리자 채널에 전달
+
+    change: 'applied', 'called', 'recalled', 'completed', 'reverted', 'cancelled',
+            'no_show', 'requeued'
+    entries: 변경된 queue_entries 행 리스트 (id, booth_id, student_id 필수)
+    """
+    for entry in entries:
+        if not entry:
+            continue
+        event = {
+            'change': change,
+            'entry_id': entry.get('id'),
+            'booth_id': entry.get('booth_id'),
+            'student_id': entry.get('student_id'),
+            'status': entry.get('status'),
+            'queue_position': entry.get('queue_position'),
+            'called_at': entry.get('called_at'),
+            'completed_at': entry.get('completed_at'),
+            'timestamp': datetime.now().isoformat()
+        }
+        try:
+            queue_event_broker.publish(booth_channel(event['booth_id']), event)
+            queue_event_broker.publish(student_channel(event['student_id']), event)
+            queue_event_broker.publish(ADMIN_CHANNEL, event)
+        except Exception as e:
+            print(f"대기열 이벤트 전달 실패: {e}")
+
+def sse_stream(channel, subscriber):
+    """구독자의 이벤트를 SSE 응답 본문으로 전송 (연결이 끊기거나 최대 시간이 지나면 구독 해제)"""
+    deadline = time.monotonic() + Config.SSE_MAX_STREAM_SECONDS
+    try:
+        # 재연결 간격 안내 + 연결 확인용 이벤트
+        yield "retry: 3000\nevent: ready\ndata: {}\n\n"
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # 스레드 반환 (브라우저 EventSource가 retry 간격 뒤 재연결)
+                return
+            try:
+                event = subscriber.get(timeout=min(KEEPALIVE_INTERVAL, remaining))
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: queue\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+    finally:
+        queue_event_broker.unsubscribe(channel, subscriber)
+
+def sse_response(channel):
+    """SSE 스트리밍 응답 생성 (동시 스트림 한도를 넘으면 503, 화면은 주기적 조회로 전환)"""
+    subscriber = queue_event_broker.subscribe(channel, limit=Config.SSE_MAX_STREAMS)
+    if subscriber is None:
+        response = jsonify({'ok': False, 'poll': True, 'message': '실시간 연결이 많아 주기적 조회로 전환합니다.'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(KEEPALIVE_INTERVAL)
+        return response
+
+    response = Response(stream_with_context(sse_stream(channel, subscriber)), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # 프록시 버퍼링 방지
+    # 본문을 읽기 전에 연결이 끊겨도 자리를 반환
+    response.call_on_close(lambda: queue_event_broker.unsubscribe(channel, subscriber))
+    return response
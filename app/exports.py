@@ -0,0 +1,129 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 전체 데이터 엑셀 내보내기
+
+테이블 크기와 무관하게 메모리 사용량이 일정하도록 구성합니다:
+- 각 테이블을 id keyset 페이지 단위로 조회 (PostgREST 1,000행 제한 회피, 내보내는 중 행이 바뀌어도 중복/누락 없음)
+- openpyxl write-only 모드로 행 단위 기록
+- 완성된 파일을 임시 파일에서 청크 단위로 전송 후 삭제
+"""
+
+import os
+import tempfile
+from datetime import datetime
+from openpyxl import Workbook
+from app.db import get_supabase, iter_rows, count
+from app.utils import encrypt_password
+
+# 전송 시 한 번에 읽는 바이트 수
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def _write_sheet(workbook, title, headers, rows):
+    """write-only 시트에 헤더와 행 기록 (기록한 행 수 반환)"""
+    sheet = workbook.create_sheet(title)
+    sheet.append(headers)
+    written = 0
+    for row in rows:
+        sheet.append(row)
+        written += 1
+    return written
+
+def write_festival_workbook(path):
+    """전체 데이터를 엑셀 파일로 기록
+
+    시트 구성은 기존과 동일합니다: 체크인기록, 부스정보, 발급인증서, 학생계정목록, 요약통계
+    """
+    supabase = get_supabase()
+    workbook = Workbook(write_only=True)
+
+    # 1. 체크인 기록 (참여 학생 수는 기록하면서 함께 집계)
+    unique_students = set()
+
+    def checkin_rows():
+        for record in iter_rows(lambda: supabase.table('checkins').select('*')):
+            unique_students.add(f"{record['school']}-{record['grade']}-{record['class']}-{record['number']}-{record['name']}")
+            yield [
+                record['id'], record['school'], record['grade'], record['class'], record['number'],
+                record['name'], record['booth'], record['comment'], record['created_at']
+            ]
+
+    checkin_count = _write_sheet(workbook, '체크인기록',
+                                 ['ID', '학교명', '학년', '반', '번호', '이름', '부스명', '소감', '체크인시각'],
+                                 checkin_rows())
+
+    # 2. 부스 정보
+    def booth_rows():
+        for record in iter_rows(lambda: supabase.table('booths').select('*')):
+            yield [
+                record['id'], record['name'], record['description'] or '',
+                '활성' if record['is_active'] else '비활성',
+                record['created_at'], record['updated_at']
+            ]
+
+    _write_sheet(workbook, '부스정보',
+                 ['ID', '부스명', '설명', '활성상태', '생성일시', '수정일시'],
+                 booth_rows())
+
+    # 3. 발급 확인증
+    def certificate_rows():
+        for record in iter_rows(lambda: supabase.table('certificates').select('*')):
+            yield [
+                record['id'], record['certificate_number'], record['school'], record['grade'],
+                record['class'], record['number'], record['name'], record['booth_count'],
+                ', '.join(record['booth_names']) if record['booth_names'] else '',
+                record['issued_at']
+            ]
+
+    _write_sheet(workbook, '발급인증서',
+                 ['ID', '발급번호', '학교명', '학년', '반', '번호', '이름', '체험부스수', '체험부스명', '발급일시'],
+                 certificate_rows())
+
+    # 4. 학생 계정
+    def student_rows():
+        for record in iter_rows(lambda: supabase.table('students').select('*')):
+            yield [
+                record['id'], record['student_id'], encrypt_password(record['password']),
+                record['school'], record['grade'], record['class'], record['number'],
+                record['name'], record['created_at']
+            ]
+
+    _write_sheet(workbook, '학생계정목록',
+                 ['ID', '학생ID', '비밀번호(암호화)', '학교명', '학년', '반', '번호', '이름', '계정생성일시'],
+                 student_rows())
+
+    # 5. 요약 통계
+    _write_sheet(workbook, '요약통계', ['항목', '값'], [
+        ['전체 참여 학생 수', len(unique_students)],
+        ['전체 체크인 횟수', checkin_count],
+        ['등록된 부스 수', count('booths')],
+        ['발급된 인증서 수', count('certificates')],
+        ['등록된 학생 계정 수', count('students')],
+        ['데이터 추출 시각', datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+    ])
+
+    workbook.save(path)
+
+def build_festival_export():
+    """임시 파일에 엑셀을 생성하고 경로 반환 (호출자가 삭제 책임)"""
+    fd, path = tempfile.mkstemp(suffix='.xlsx', prefix='festival_export_')
+    os.close(fd)
+    try:
+        write_festival_workbook(path)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+def stream_and_remove(path):
+    """파일을 청크 단위로 읽어 전송하고, 전송이 끝나면 삭제"""
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"내보내기 임시 파일 삭제 실패: {e}")
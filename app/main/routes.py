@@ -8,6 +8,7 @@ from flask import Blueprint, render_template, send_file, request, jsonify
 
 # Import shared utilities and database connections
 from app.db import get_supabase
+from app.checkin_buffer import record_checkin
 
 # Get database connection
 supabase = get_supabase()
@@ -44,7 +45,7 @@ def checkin():
         
         data = request.get_json()
         
-        # Save check-in data to Supabase
+        # Append to the local check-in log; the flusher thread inserts it into Supabase
         checkin_data = {
             'school': data['school'],
             'grade': int(data['grade']),
@@ -56,8 +57,7 @@ def checkin():
         }
         
         try:
-            result = supabase.table('checkins').insert(checkin_data).execute()
-            if result.data:
+            if record_checkin(checkin_data, data.get('idempotency_key')):
                 return jsonify({'result': 'success'})
             else:
                 return jsonify({'result': 'error', 'message': 'Failed to save data'}), 500
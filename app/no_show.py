@@ -0,0 +1,110 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 미방문(no-show) 처리
+
+호출 후 부스별 제한 시간(booths.no_show_timeout_minutes) 안에 오지 않은 학생을
+주기적으로 'no_show' 상태로 바꿉니다:
+- DB 함수 expire_no_show_entries 한 번 호출로 전체 부스를 일괄 처리
+- called_at은 앱이 naive 로컬 시각으로 기록하므로 기준 시각도 앱 시계로 전달 (DB NOW()는 UTC)
+- 제한 시간이 비어 있는(NULL) 부스는 미방문 처리하지 않음
+- 대기열 엔진이 아직 DB에 반영하지 않은 항목은 제외 (DB의 'called'가 이미 지난 상태일 수 있음)
+- Config.NO_SHOW_REQUEUE가 켜져 있으면 대기열 맨 뒤에 다시 'waiting'으로 추가
+- 'no_show'는 진행 중 상태가 아니므로 학생은 다시 대기 신청할 수 있음
+- 처리 건수는 metrics()로 확인 (관리자 API)
+"""
+
+import time
+import threading
+from datetime import datetime
+from app.db import get_supabase
+from app.repositories import queue_repo
+from app.config import Config
+from app.queue_engine import queue_engine
+from app.events import publish_queue_change
+from app.auto_call import auto_call_scheduler
+
+class NoShowSweeper:
+    """시간이 지난 '호출됨' 항목을 미방문 처리하는 백그라운드 스레드"""
+
+    def __init__(self):
+        self._thread = None
+        self._lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            'runs': 0,
+            'total_expired': 0,
+            'total_requeued': 0,
+            'last_run_at': None,
+            'last_expired': 0,
+            'expired_by_booth': {}
+        }
+
+    def run_once(self):
+        """미방문 항목 일괄 처리 (미방문 처리한 항목 수 반환)"""
+        if not get_supabase():
+            return 0
+
+        swept = queue_repo.expire_no_shows(Config.NO_SHOW_REQUEUE, datetime.now(), queue_engine.pending_entry_ids())
+        expired = swept.get('expired') or []
+        requeued = swept.get('requeued') or []
+
+        # DB에서 이미 바뀐 항목을 메모리 대기열에 반영 (DB 재기록 없음)
+        expired_entries = queue_engine.apply_db_changes(expired, expected_status='called')
+
+        # 제외 목록을 만든 뒤 메모리에서 완료 등으로 바뀐 항목은 쓰기 스레드가 DB를 되돌리므로,
+        # 그 학생 몫으로 다시 추가된 대기 항목은 삭제
+        applied = {(entry['booth_id'], entry['student_id']) for entry in expired_entries}
+        stale = [entry for entry in requeued if (entry['booth_id'], entry['student_id']) not in applied]
+        requeued = [entry for entry in requeued if (entry['booth_id'], entry['student_id']) in applied]
+        for entry in stale:
+            queue_repo.delete(entry['id'])
+        for entry in requeued:
+            queue_engine.add_entry(dict(entry))
+
+        publish_queue_change('no_show', expired_entries)
+        publish_queue_change('requeued', requeued)
+        self._record(expired_entries, requeued)
+
+        if expired_entries:
+            print(f"⏰ 미방문 처리: {len(expired_entries)}명 (재대기 {len(requeued)}명)")
+            # 호출 자리가 비었으므로 자동 호출 부스는 바로 다음 대기자를 부름
+            auto_call_scheduler.notify()
+        return len(expired_entries)
+
+    def _record(self, expired, requeued):
+        with self._metrics_lock:
+            self._metrics['runs'] += 1
+            self._metrics['total_expired'] += len(expired)
+            self._metrics['total_requeued'] += len(requeued)
+            self._metrics['last_run_at'] = datetime.now().isoformat()
+            self._metrics['last_expired'] = len(expired)
+            by_booth = self._metrics['expired_by_booth']
+            for entry in expired:
+                by_booth[entry['booth_id']] = by_booth.get(entry['booth_id'], 0) + 1
+
+    def metrics(self):
+        """프로세스 시작 이후 미방문 처리 통계"""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+            metrics['expired_by_booth'] = dict(self._metrics['expired_by_booth'])
+        metrics['enabled'] = Config.NO_SHOW_SWEEP_ENABLED
+        metrics['requeue'] = Config.NO_SHOW_REQUEUE
+        metrics['interval_seconds'] = Config.NO_SHOW_SWEEP_INTERVAL
+        return metrics
+
+    def _run(self):
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"미방문 처리 오류: {e}")
+            time.sleep(Config.NO_SHOW_SWEEP_INTERVAL)
+
+    def start(self):
+        """미방문 처리 스레드 시작 (프로세스당 1회)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='no-show-sweeper', daemon=True)
+            self._thread.start()
+
+no_show_sweeper = NoShowSweeper()
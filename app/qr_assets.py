@@ -0,0 +1,182 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 부스 QR 코드 이미지
+
+부스 체크인 QR(부스명 라벨 포함) PNG를 한 번만 만들어 두고 재사용합니다:
+- 키: (부스명, BASE_URL, 스타일)의 해시 → 부스명이나 BASE_URL이 바뀌면 자연히 새 이미지
+- 메모리 LRU + 디스크 저장소 (Config.QR_ASSET_DIR, 파일명 "<부스명 해시>_<키>.png")
+- 키를 그대로 강한 ETag로 사용 → If-None-Match 요청은 304, 다운로드는 디스크 파일을 바로 전송
+"""
+
+import os
+import glob
+import json
+import hashlib
+import threading
+from io import BytesIO
+from collections import OrderedDict
+import qrcode
+from flask import send_file
+from app.config import Config
+from app.utils import create_qr_with_text
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# QR 이미지 모양 (바꾸면 키가 달라져 모든 부스 QR이 다시 만들어짐)
+QR_STYLE = {
+    'version': 1,
+    'box_size': 10,
+    'border': 5,
+    'fill_color': 'black',
+    'back_color': 'white',
+    'label': 3
+}
+
+def checkin_url(booth_name, base_url=None):
+    """QR에 담기는 부스 체크인 주소"""
+    return f"{base_url or Config.BASE_URL}/checkin?booth={booth_name}"
+
+def render_booth_qr(booth_name, base_url, style=QR_STYLE):
+    """부스명 라벨이 붙은 QR 코드 PNG 바이트 생성"""
+    qr = qrcode.QRCode(version=style['version'], box_size=style['box_size'], border=style['border'])
+    qr.add_data(checkin_url(booth_name, base_url))
+    qr.make(fit=True)
+
+    qr_img = qr.make_image(fill_color=style['fill_color'], back_color=style['back_color'])
+    final_img = create_qr_with_text(qr_img, booth_name)
+
+    buffer = BytesIO()
+    final_img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+class QrAsset:
+    """렌더링된 QR 이미지 하나 (etag = 키, path = 디스크 파일 또는 None)"""
+
+    def __init__(self, booth_name, etag, png_bytes, path):
+        self.booth_name = booth_name
+        self.etag = etag
+        self.png_bytes = png_bytes
+        self.path = path
+
+class QrAssetStore:
+    """부스 QR 이미지 저장소 (메모리 LRU + 디스크)"""
+
+    def __init__(self, asset_dir, max_entries=256):
+        self.asset_dir = asset_dir
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> QrAsset
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def asset_key(booth_name, base_url, style=QR_STYLE):
+        payload = json.dumps({'booth': booth_name, 'base_url': base_url, 'style': style}, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _name_digest(booth_name):
+        return hashlib.sha1(booth_name.encode('utf-8')).hexdigest()[:16]
+
+    def _path(self, booth_name, key):
+        return os.path.join(self.asset_dir, f"{self._name_digest(booth_name)}_{key}.png")
+
+    def lookup(self, booth_name):
+        """이미 만들어 둔 부스 QR 이미지 조회 (메모리 → 디스크, 없으면 None)"""
+        key = self.asset_key(booth_name, Config.BASE_URL)
+
+        with self._lock:
+            asset = self._entries.get(key)
+            if asset is not None:
+                self._entries.move_to_end(key)
+                return asset
+
+        path = self._path(booth_name, key)
+        try:
+            with open(path, 'rb') as f:
+                png_bytes = f.read()
+        except OSError:
+            return None
+
+        asset = QrAsset(booth_name, key, png_bytes, path)
+        self._remember(key, asset)
+        return asset
+
+    def put(self, booth_name, png_bytes):
+        """render_booth_qr()로 만든 이미지 저장 (다른 프로세스에서 렌더링한 결과 포함)"""
+        key = self.asset_key(booth_name, Config.BASE_URL)
+        path = self._write(booth_name, self._path(booth_name, key), png_bytes)
+        asset = QrAsset(booth_name, key, png_bytes, path)
+        self._remember(key, asset)
+        return asset
+
+    def get(self, booth_name):
+        """부스 QR 이미지 조회 (없으면 렌더링 후 저장)"""
+        asset = self.lookup(booth_name)
+        if asset is None:
+            asset = self.put(booth_name, render_booth_qr(booth_name, Config.BASE_URL))
+        return asset
+
+    def _write(self, booth_name, path, png_bytes):
+        """디스크에 저장하고, 같은 부스의 이전 이미지(다른 BASE_URL/스타일)는 삭제"""
+        try:
+            os.makedirs(self.asset_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(png_bytes)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"QR 이미지 저장 실패: {e}")
+            return None
+
+        for old_path in glob.glob(os.path.join(self.asset_dir, f"{self._name_digest(booth_name)}_*.png")):
+            if old_path != path:
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    pass
+        return path
+
+    def _remember(self, key, asset):
+        with self._lock:
+            self._entries[key] = asset
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, booth_name):
+        """부스 삭제/이름 변경 시 해당 부스의 이미지 삭제"""
+        with self._lock:
+            for key in [k for k, asset in self._entries.items() if asset.booth_name == booth_name]:
+                del self._entries[key]
+
+        for path in glob.glob(os.path.join(self.asset_dir, f"{self._name_digest(booth_name)}_*.png")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """전체 삭제 (부스 전체 초기화 시)"""
+        with self._lock:
+            self._entries.clear()
+
+        for path in glob.glob(os.path.join(self.asset_dir, '*.png')):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+qr_assets = QrAssetStore(
+    os.path.join(PROJECT_ROOT, Config.QR_ASSET_DIR),
+    max_entries=Config.QR_ASSET_CACHE_SIZE
+)
+
+def send_booth_qr(booth_name, as_attachment=True):
+    """부스 QR 이미지 응답 (강한 ETag, If-None-Match면 304)"""
+    asset = qr_assets.get(booth_name)
+    source = asset.path if asset.path else BytesIO(asset.png_bytes)
+    return send_file(
+        source,
+        mimetype='image/png',
+        as_attachment=as_attachment,
+        download_name=f'qr_{booth_name}.png',
+        etag=asset.etag
+    )
@@ -0,0 +1,114 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 부스 QR 인쇄용 PDF
+
+활성 부스 전체의 QR 포스터를 A4 한 장씩 하나의 PDF로 묶습니다:
+- QR 이미지는 QR 이미지 저장소(app.qr_assets)에 있으면 그대로 사용
+- 없는 이미지만 프로세스 풀에서 렌더링한 뒤 저장소에 저장 (다음 다운로드부터 재사용)
+- 페이지 조립은 현재 프로세스에서 reportlab canvas로 처리 (이미지 배치만 하므로 빠름)
+"""
+
+import multiprocessing
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader, simpleSplit
+from reportlab.pdfgen import canvas
+from reportlab.pdfbase import pdfmetrics
+from app.config import Config
+from app.qr_assets import qr_assets, render_booth_qr
+from app.certificates import register_korean_font
+
+# 렌더링할 QR이 이 수보다 적으면 프로세스 풀 없이 바로 렌더링 (spawn 비용이 더 큼)
+POOL_MIN_BOOTHS = 8
+
+# 프로세스 풀에 한 번에 넘기는 부스 수
+RENDER_CHUNK_SIZE = 10
+
+PAGE_MARGIN = 20 * mm
+QR_SIZE = 130 * mm
+
+def _render_chunk(base_url, booth_names):
+    """(작업 프로세스) 부스 QR PNG 렌더링 → [(부스명, PNG 바이트)]"""
+    return [(name, render_booth_qr(name, base_url)) for name in booth_names]
+
+def collect_qr_images(booth_names):
+    """부스별 QR PNG 바이트 ({부스명: bytes}), 저장소에 없는 것만 새로 렌더링"""
+    images = {}
+    missing = []
+    for name in booth_names:
+        asset = qr_assets.lookup(name)
+        if asset is not None:
+            images[name] = asset.png_bytes
+        else:
+            missing.append(name)
+
+    if len(missing) < POOL_MIN_BOOTHS:
+        for name in missing:
+            images[name] = qr_assets.get(name).png_bytes
+        return images
+
+    chunks = [missing[i:i + RENDER_CHUNK_SIZE] for i in range(0, len(missing), RENDER_CHUNK_SIZE)]
+    # 요청 처리 스레드가 있는 프로세스에서 fork하지 않도록 spawn 사용
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=Config.QR_SHEET_RENDER_WORKERS, mp_context=context) as executor:
+        for rendered in executor.map(_render_chunk, [Config.BASE_URL] * len(chunks), chunks):
+            for name, png_bytes in rendered:
+                images[name] = qr_assets.put(name, png_bytes).png_bytes
+    return images
+
+def _draw_centered_lines(pdf, lines, font_name, font_size, top):
+    """가운데 정렬로 여러 줄 출력, 마지막 줄 아래 y 좌표 반환"""
+    page_width = A4[0]
+    leading = font_size * 1.3
+    pdf.setFont(font_name, font_size)
+    y = top
+    for line in lines:
+        y -= leading
+        pdf.drawCentredString(page_width / 2, y, line)
+    return y
+
+def _fit_title(text, font_name, max_width, max_size=40, min_size=22):
+    """부스명이 한 줄에 들어가도록 글자 크기를 줄이고, 최소 크기에서도 넘치면 줄바꿈"""
+    size = max_size
+    while size > min_size and pdfmetrics.stringWidth(text, font_name, size) > max_width:
+        size -= 2
+    return simpleSplit(text, font_name, size, max_width), size
+
+def _draw_booth_page(pdf, font_name, booth, png_bytes, event_name):
+    page_width, page_height = A4
+    content_width = page_width - 2 * PAGE_MARGIN
+
+    y = _draw_centered_lines(pdf, [event_name], font_name, 16, page_height - PAGE_MARGIN)
+
+    title_lines, title_size = _fit_title(booth['name'], font_name, content_width)
+    y = _draw_centered_lines(pdf, title_lines, font_name, title_size, y - 8 * mm)
+
+    image = ImageReader(BytesIO(png_bytes))
+    image_width, image_height = image.getSize()
+    qr_width = QR_SIZE
+    qr_height = QR_SIZE * image_height / image_width
+    y -= 8 * mm + qr_height
+    pdf.drawImage(image, (page_width - qr_width) / 2, y, width=qr_width, height=qr_height)
+
+    if booth.get('location'):
+        location_lines = simpleSplit(f"위치: {booth['location']}", font_name, 20, content_width)
+        y = _draw_centered_lines(pdf, location_lines, font_name, 20, y - 6 * mm)
+
+    _draw_centered_lines(pdf, ['QR 코드를 스캔하여 체크인하세요'], font_name, 14, PAGE_MARGIN + 14 * 1.3)
+    pdf.showPage()
+
+def build_qr_sheet(booths, event_name):
+    """부스 목록([{name, location}])의 QR 포스터 PDF (부스당 A4 한 장) BytesIO 반환"""
+    images = collect_qr_images([booth['name'] for booth in booths])
+    font_name = register_korean_font()
+
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    pdf.setTitle(f"{event_name} 부스 QR 코드")
+    for booth in booths:
+        _draw_booth_page(pdf, font_name, booth, images[booth['name']], event_name)
+    pdf.save()
+
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,555 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 메모리 대기열 엔진
+
+부스별 대기열 상태를 프로세스 메모리에 보관하고 DB에는 비동기로 반영합니다:
+- 시작 시 queue_entries(+ 학생/부스 정보)를 읽어 메모리 구성 (hydrate)
+- 조회(부스 대기열, 내 대기신청, 대기 인원)는 메모리에서 바로 응답
+- 상태 변경은 메모리에 먼저 반영 후 쓰기 스레드가 DB에 기록 (write-through)
+  - 같은 항목의 쓰기는 최신 값으로 합쳐 한 번에 반영하므로 순서가 뒤바뀌지 않음
+  - DB 반영에 실패하면 버리지 않고 점점 긴 간격으로 재시도
+- 주기적으로 DB와 비교하여 어긋난 항목을 바로잡음 (reconciliation)
+- 캐시에 없는 학생/부스 정보는 잠금 밖에서 조회 (DB 응답을 기다리는 동안 다른 요청을 막지 않음)
+- 부스 정보가 수정/삭제되면 booths_repo 변경 hook으로 캐시된 부스 정보를 폐기
+
+메모리가 기준이 되므로 gunicorn 워커 1개 구성을 전제로 합니다 (Procfile 참고).
+엔진이 준비되지 않았으면 모든 메서드가 기존처럼 DB를 직접 조회합니다.
+"""
+
+import time
+import queue
+import threading
+from datetime import datetime
+from app.db import get_supabase, iter_rows
+from app.config import Config
+from app.repositories import booths_repo, run_query
+
+STUDENT_COLUMNS = 'id, name, school, grade, class, number, phone'
+BOOTH_COLUMNS = 'id, name, location, description, auto_call_enabled, auto_call_concurrency'
+
+# 동기화 시 비교하는 컬럼 (시각 컬럼은 표기 형식만 다를 수 있어 조용히 갱신)
+RECONCILE_KEYS = ('booth_id', 'student_id', 'status', 'queue_position')
+
+class BoothQueue:
+    """부스 하나의 대기열 (상태별로 queue_position 순서 유지)"""
+
+    def __init__(self, booth_id):
+        self.booth_id = booth_id
+        self.entries = {}      # entry_id -> entry (queue_position으로 O(1) 순번 조회)
+        self.by_status = {}    # status -> {entry_id: entry} (queue_position 순)
+
+    def add(self, entry):
+        self.entries[entry['id']] = entry
+        self._index(entry)
+
+    def remove(self, entry_id):
+        entry = self.entries.pop(entry_id, None)
+        if entry:
+            self.by_status.get(entry['status'], {}).pop(entry_id, None)
+        return entry
+
+    def update(self, entry_id, fields):
+        entry = self.entries.get(entry_id)
+        if not entry:
+            return None
+        self.by_status.get(entry['status'], {}).pop(entry_id, None)
+        entry.update(fields)
+        self._index(entry)
+        return entry
+
+    def _index(self, entry):
+        bucket = self.by_status.setdefault(entry['status'], {})
+        bucket[entry['id']] = entry
+        # 끝에 붙는 경우(신규 신청)가 대부분이므로 순서가 어긋날 때만 재정렬
+        if len(bucket) > 1:
+            keys = list(bucket)
+            if bucket[keys[-2]]['queue_position'] > entry['queue_position']:
+                self.by_status[entry['status']] = dict(sorted(bucket.items(), key=lambda item: item[1]['queue_position']))
+
+    def ordered(self):
+        return sorted(self.entries.values(), key=lambda entry: entry['queue_position'])
+
+    def status_entries(self, status):
+        return list(self.by_status.get(status, {}).values())
+
+    def count(self, status):
+        return len(self.by_status.get(status, {}))
+
+class QueueEngine:
+    """부스별 메모리 대기열 + 비동기 DB 반영"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._booths = {}         # booth_id -> BoothQueue
+        self._entry_booth = {}    # entry_id -> booth_id
+        self._student_index = {}  # student_id -> {entry_id: booth_id}
+        self._students = {}       # student_id -> 학생 정보
+        self._booth_info = {}     # booth_id -> 부스 정보
+        self._pending_writes = {} # entry_id -> (operation, fields) 아직 DB에 반영되지 않은 쓰기 (최신 값으로 합침)
+        self._in_flight = {}      # entry_id -> (operation, fields) 쓰기 스레드가 반영 중인 쓰기
+        self._touched = {}        # entry_id -> 마지막으로 변경/반영된 시점의 순번
+        self._seq = 0
+        self._writes = queue.Queue()  # 반영할 entry_id (항목당 최대 1개)
+        self._ready = False
+        self._threads_started = False
+
+    @property
+    def ready(self):
+        return self._ready
+
+    # === 초기화 / 동기화 ===
+
+    def _load_state(self):
+        """DB에서 대기열 전체와 관련 학생/부스 정보 조회"""
+        supabase = get_supabase()
+        entries = list(iter_rows(lambda: supabase.table('queue_entries').select('*')))
+
+        booth_info = {row['id']: row for row in iter_rows(lambda: supabase.table('booths').select(BOOTH_COLUMNS))}
+
+        students = {}
+        student_ids = list({entry['student_id'] for entry in entries})
+        for start in range(0, len(student_ids), 500):
+            result = run_query('students', 'queue_engine_students', supabase.table('students').select(STUDENT_COLUMNS).in_('id', student_ids[start:start + 500]))
+            for row in result.data or []:
+                students[row['id']] = row
+
+        return entries, booth_info, students
+
+    def _build(self, entries):
+        booths = {}
+        entry_booth = {}
+        student_index = {}
+        for entry in entries:
+            booth_queue = booths.get(entry['booth_id'])
+            if booth_queue is None:
+                booth_queue = booths[entry['booth_id']] = BoothQueue(entry['booth_id'])
+            booth_queue.add(dict(entry))
+            entry_booth[entry['id']] = entry['booth_id']
+            student_index.setdefault(entry['student_id'], {})[entry['id']] = entry['booth_id']
+        return booths, entry_booth, student_index
+
+    def hydrate(self):
+        """DB 상태로 메모리 대기열 구성"""
+        if not get_supabase():
+            return False
+
+        entries, booth_info, students = self._load_state()
+        booths, entry_booth, student_index = self._build(entries)
+        with self._lock:
+            self._booths = booths
+            self._entry_booth = entry_booth
+            self._student_index = student_index
+            self._booth_info = booth_info
+            self._students = students
+            self._ready = True
+        print(f"✅ 대기열 엔진 준비 완료: 부스 {len(booths)}개, 항목 {len(entries)}개")
+        return True
+
+    def reconcile(self):
+        """DB와 메모리를 비교하여 어긋난 항목 수정 (수정한 항목 수 반환)
+
+        아직 DB에 반영되지 않은 쓰기가 있는 항목은 메모리 값을 유지합니다.
+        """
+        if not self._ready:
+            return 0
+
+        with self._lock:
+            started_seq = self._seq
+        entries, booth_info, students = self._load_state()
+        db_entries = {entry['id']: entry for entry in entries}
+        drift = 0
+
+        with self._lock:
+            for entry_id in set(self._entry_booth) | set(db_entries):
+                # 반영 대기 중이거나 DB 조회 이후 바뀐 항목은 메모리 값을 유지
+                if entry_id in self._pending_writes or entry_id in self._in_flight or self._touched.get(entry_id, 0) > started_seq:
+                    continue
+                db_entry = db_entries.get(entry_id)
+                memory_entry = self._find(entry_id)
+                if db_entry is None:
+                    self._remove(entry_id)
+                    drift += 1
+                elif memory_entry is None:
+                    self._add(dict(db_entry))
+                    drift += 1
+                elif any(memory_entry.get(key) != db_entry.get(key) for key in RECONCILE_KEYS):
+                    self._remove(entry_id)
+                    self._add(dict(db_entry))
+                    drift += 1
+                else:
+                    memory_entry.update(db_entry)
+
+            self._booth_info = booth_info
+            self._students.update(students)
+
+        if drift:
+            print(f"⚠️ 대기열 엔진 동기화: {drift}개 항목 수정")
+        return drift
+
+    def start(self):
+        """메모리 구성 후 쓰기/동기화 스레드 시작 (프로세스당 1회)"""
+        with self._lock:
+            if self._threads_started:
+                return
+            self._threads_started = True
+
+        if not self.hydrate():
+            return
+        threading.Thread(target=self._run_writer, name='queue-writer', daemon=True).start()
+        threading.Thread(target=self._run_reconciler, name='queue-reconciler', daemon=True).start()
+
+    # === 내부 상태 조작 (잠금 안에서 호출) ===
+
+    def _touch(self, entry_id):
+        self._seq += 1
+        self._touched[entry_id] = self._seq
+
+    def _find(self, entry_id):
+        booth_id = self._entry_booth.get(entry_id)
+        if booth_id is None:
+            return None
+        return self._booths[booth_id].entries.get(entry_id)
+
+    def _add(self, entry):
+        booth_queue = self._booths.get(entry['booth_id'])
+        if booth_queue is None:
+            booth_queue = self._booths[entry['booth_id']] = BoothQueue(entry['booth_id'])
+        booth_queue.add(entry)
+        self._entry_booth[entry['id']] = entry['booth_id']
+        self._student_index.setdefault(entry['student_id'], {})[entry['id']] = entry['booth_id']
+
+    def _remove(self, entry_id):
+        booth_id = self._entry_booth.pop(entry_id, None)
+        if booth_id is None:
+            return None
+        entry = self._booths[booth_id].remove(entry_id)
+        if entry:
+            student_entries = self._student_index.get(entry['student_id'], {})
+            student_entries.pop(entry_id, None)
+            if not student_entries:
+                self._student_index.pop(entry['student_id'], None)
+        return entry
+
+    def _student_rows(self, student_id):
+        entry_booths = self._student_index.get(student_id, {})
+        return [self._booths[booth_id].entries[entry_id] for entry_id, booth_id in entry_booths.items()]
+
+    # === 학생/부스 정보 (잠금 밖에서 조회) ===
+
+    def _fetch_details(self, student_ids, booth_ids):
+        """캐시에 없는 학생/부스 정보 조회 (잠금 없이 호출)"""
+        supabase = get_supabase()
+        students = {}
+        booths = {}
+        student_ids = list(student_ids)
+        for start in range(0, len(student_ids), 500):
+            result = run_query('students', 'queue_engine_students', supabase.table('students').select(STUDENT_COLUMNS).in_('id', student_ids[start:start + 500]))
+            for row in result.data or []:
+                students[row['id']] = row
+        if booth_ids:
+            result = run_query('booths', 'queue_engine_booths', supabase.table('booths').select(BOOTH_COLUMNS).in_('id', list(booth_ids)))
+            for row in result.data or []:
+                booths[row['id']] = row
+        return students, booths
+
+    def _with_details(self, rows, students=True, booths=True):
+        """항목 사본에 학생(students)/부스(booths) 정보 추가
+
+        캐시에 없는 정보만 잠금을 놓은 상태에서 한 번에 조회한 뒤 저장합니다.
+        """
+        with self._lock:
+            missing_students = {row['student_id'] for row in rows if row['student_id'] not in self._students} if students else set()
+            missing_booths = {row['booth_id'] for row in rows if row['booth_id'] not in self._booth_info} if booths else set()
+
+        if missing_students or missing_booths:
+            fetched_students, fetched_booths = self._fetch_details(missing_students, missing_booths)
+        else:
+            fetched_students, fetched_booths = {}, {}
+
+        with self._lock:
+            self._students.update(fetched_students)
+            self._booth_info.update(fetched_booths)
+            for row in rows:
+                if students:
+                    row['students'] = self._students.get(row['student_id']) or {}
+                if booths:
+                    row['booths'] = self._booth_info.get(row['booth_id']) or {}
+        return rows
+
+    def invalidate_booths(self, rows):
+        """수정/삭제된 부스의 캐시된 이름·위치 정보 폐기 (booths_repo 변경 hook)"""
+        with self._lock:
+            for row in rows:
+                if row.get('id') is not None:
+                    self._booth_info.pop(row['id'], None)
+
+    # === 비동기 DB 반영 ===
+
+    def _enqueue_write(self, operation, entry_id, fields=None):
+        """항목의 쓰기를 반영 대기 중인 쓰기와 합쳐 보관 (항목당 DB 쓰기 1건으로 순서 유지)"""
+        self._touch(entry_id)
+        pending = self._pending_writes.get(entry_id)
+        if pending is None or operation == 'delete':
+            self._pending_writes[entry_id] = (operation, dict(fields or {}))
+        else:
+            self._pending_writes[entry_id] = ('update', {**pending[1], **fields})
+        # 반영 중인 항목은 쓰기 스레드가 끝난 뒤 다시 넣음
+        if pending is None and entry_id not in self._in_flight:
+            self._writes.put(entry_id)
+
+    def _apply_write(self, operation, entry_id, fields):
+        table = get_supabase().table('queue_entries')
+        if operation == 'delete':
+            run_query('queue_entries', 'queue_engine_delete', table.delete().eq('id', entry_id))
+        else:
+            run_query('queue_entries', 'queue_engine_update', table.update(fields).eq('id', entry_id))
+
+    def _retry_delay(self, failures):
+        """연속 실패 횟수에 따른 재시도 대기 시간 (초, 지수 증가 + 상한)"""
+        return min(Config.QUEUE_WRITE_RETRY_MAX_DELAY, Config.QUEUE_WRITE_RETRY_BASE_DELAY * (2 ** (failures - 1)))
+
+    def _write_next(self, failures):
+        """대기 중인 쓰기 1건 반영 (갱신된 연속 실패 횟수 반환)"""
+        entry_id = self._writes.get()
+        with self._lock:
+            write = self._pending_writes.pop(entry_id, None)
+            if write is None:
+                return failures
+            self._in_flight[entry_id] = write
+
+        operation, fields = write
+        try:
+            self._apply_write(operation, entry_id, fields)
+        except Exception as e:
+            failures += 1
+            delay = self._retry_delay(failures)
+            print(f"❌ 대기열 DB 반영 실패 (entry {entry_id}, {delay}초 후 재시도): {e}")
+            with self._lock:
+                self._in_flight.pop(entry_id, None)
+                newer = self._pending_writes.get(entry_id)
+                if newer is None:
+                    self._pending_writes[entry_id] = write
+                elif newer[0] == 'update':
+                    # 실패한 쓰기 위에 그 사이 바뀐 값을 덮어씀
+                    self._pending_writes[entry_id] = (operation, {**fields, **newer[1]})
+                self._writes.put(entry_id)
+            time.sleep(delay)
+            return failures
+
+        with self._lock:
+            self._touch(entry_id)
+            self._in_flight.pop(entry_id, None)
+            if entry_id in self._pending_writes:
+                self._writes.put(entry_id)
+        return 0
+
+    def _run_writer(self):
+        failures = 0
+        while True:
+            failures = self._write_next(failures)
+
+    def pending_entry_ids(self):
+        """아직 DB에 반영되지 않은 쓰기가 있는 항목 id 집합"""
+        with self._lock:
+            return set(self._pending_writes) | set(self._in_flight)
+
+    def _run_reconciler(self):
+        while True:
+            time.sleep(Config.QUEUE_RECONCILE_INTERVAL)
+            try:
+                self.reconcile()
+            except Exception as e:
+                print(f"대기열 동기화 오류: {e}")
+
+    # === 조회 ===
+
+    def booth_entries(self, booth_id):
+        """부스 대기열 (queue_position 순, 학생 정보 포함)"""
+        if not self._ready:
+            result = run_query('queue_entries', 'booth_entries', get_supabase().table('queue_entries').select(f'*, students!inner({STUDENT_COLUMNS})').eq('booth_id', booth_id).order('queue_position', desc=False))
+            return result.data or []
+
+        with self._lock:
+            booth_queue = self._booths.get(int(booth_id))
+            if not booth_queue:
+                return []
+            rows = [dict(entry) for entry in booth_queue.ordered()]
+        return self._with_details(rows, booths=False)
+
+    def student_entries(self, student_id):
+        """학생의 대기 신청 목록 (신청 최신순, 부스 정보 포함)"""
+        if not self._ready:
+            result = run_query('queue_entries', 'student_entries', get_supabase().table('queue_entries').select(f'*, booths!inner({BOOTH_COLUMNS})').eq('student_id', student_id).order('applied_at', desc=True))
+            return result.data or []
+
+        with self._lock:
+            rows = [dict(entry) for entry in self._student_rows(int(student_id))]
+        rows.sort(key=lambda row: row.get('applied_at') or '', reverse=True)
+        return self._with_details(rows, students=False)
+
+    def get_entry(self, entry_id):
+        """대기열 항목 1건 (학생/부스 정보 포함, 없으면 None)"""
+        if not self._ready:
+            result = run_query('queue_entries', 'get_entry', get_supabase().table('queue_entries').select(f'*, students!inner({STUDENT_COLUMNS}), booths!inner({BOOTH_COLUMNS})').eq('id', entry_id))
+            return result.data[0] if result.data else None
+
+        with self._lock:
+            entry = self._find(int(entry_id))
+            if not entry:
+                return None
+            row = dict(entry)
+        return self._with_details([row])[0]
+
+    def next_waiting(self, booth_id, limit):
+        """대기 순서대로 다음 대기자 조회 (학생/부스 정보 포함)"""
+        if not self._ready:
+            result = run_query('queue_entries', 'next_waiting', get_supabase().table('queue_entries').select(f'*, students!inner({STUDENT_COLUMNS}), booths!inner({BOOTH_COLUMNS})').eq('booth_id', booth_id).eq('status', 'waiting').order('queue_position', desc=False).limit(limit))
+            return result.data or []
+
+        with self._lock:
+            booth_queue = self._booths.get(int(booth_id))
+            if not booth_queue:
+                return []
+            rows = [dict(entry) for entry in booth_queue.status_entries('waiting')[:limit]]
+        return self._with_details(rows)
+
+    def called_entries(self, booth_id):
+        """부스의 '호출됨' 항목 (학생/부스 정보 없이 항목 값만, 호출 순)"""
+        if not self._ready:
+            result = run_query('queue_entries', 'called_entries', get_supabase().table('queue_entries').select('id, booth_id, student_id, status, queue_position, called_at').eq('booth_id', booth_id).eq('status', 'called').order('queue_position', desc=False))
+            return result.data or []
+
+        with self._lock:
+            booth_queue = self._booths.get(int(booth_id))
+            if not booth_queue:
+                return []
+            return [dict(entry) for entry in booth_queue.status_entries('called')]
+
+    def waiting_counts(self):
+        """부스별 대기 인원 ({booth_id: count}, 엔진 미준비 시 None)"""
+        if not self._ready:
+            return None
+        with self._lock:
+            return {booth_id: booth_queue.count('waiting') for booth_id, booth_queue in self._booths.items()}
+
+    def status_counts(self):
+        """부스별·상태별 인원 ({booth_id: {status: count}}, 엔진 미준비 시 None)"""
+        if not self._ready:
+            return None
+        with self._lock:
+            return {
+                booth_id: {status: len(bucket) for status, bucket in booth_queue.by_status.items() if bucket}
+                for booth_id, booth_queue in self._booths.items()
+            }
+
+    def student_statuses(self, student_id):
+        """학생의 부스별 진행 중인 신청 상태 ({booth_id: status}, 엔진 미준비 시 None)"""
+        if not self._ready:
+            return None
+        statuses = {}
+        with self._lock:
+            for entry in self._student_rows(int(student_id)):
+                # 같은 부스에 호출된 신청이 있으면 호출 상태를 우선
+                if entry['status'] == 'called' or (entry['status'] == 'waiting' and entry['booth_id'] not in statuses):
+                    statuses[entry['booth_id']] = entry['status']
+        return statuses
+
+    def entries_with_status(self, status):
+        """특정 상태의 전체 항목 (엔진 미준비 시 빈 리스트)"""
+        if not self._ready:
+            return []
+        with self._lock:
+            return [dict(entry) for booth_queue in self._booths.values() for entry in booth_queue.status_entries(status)]
+
+    def waiting_ahead(self, booth_id, entry_id):
+        """대기 중인 항목 앞에 남은 대기자 수 (대기 중이 아니거나 엔진 미준비 시 None)"""
+        if not self._ready:
+            return None
+        with self._lock:
+            booth_queue = self._booths.get(int(booth_id))
+            if not booth_queue:
+                return None
+            for ahead, entry in enumerate(booth_queue.status_entries('waiting')):
+                if entry['id'] == entry_id:
+                    return ahead
+        return None
+
+    def has_active_entry(self, booth_id, student_id):
+        """진행 중(waiting/called) 신청 여부 (엔진 미준비 시 None)"""
+        statuses = self.student_statuses(student_id)
+        if statuses is None:
+            return None
+        return int(booth_id) in statuses
+
+    # === 변경 ===
+
+    def add_entry(self, entry):
+        """DB에 추가된 대기열 항목을 메모리에 반영 (apply_to_queue 이후)"""
+        if not self._ready:
+            return
+        entry.setdefault('applied_at', datetime.now().isoformat())
+        entry.setdefault('called_at', None)
+        entry.setdefault('completed_at', None)
+        with self._lock:
+            self._touch(entry['id'])
+            self._add(dict(entry))
+
+    def update_entries(self, entry_ids, fields, expected_status=None):
+        """대기열 항목 상태 변경 (변경된 행 리스트 반환)
+
+        expected_status를 주면 현재 상태가 일치하는 항목만 변경합니다.
+        """
+        if not self._ready:
+            query = get_supabase().table('queue_entries').update(fields).in_('id', list(entry_ids))
+            if expected_status:
+                query = query.eq('status', expected_status)
+            return run_query('queue_entries', 'update_entries', query).data or []
+
+        updated = []
+        with self._lock:
+            for entry_id in entry_ids:
+                entry = self._find(int(entry_id))
+                if not entry or (expected_status and entry['status'] != expected_status):
+                    continue
+                updated.append(dict(self._booths[entry['booth_id']].update(entry['id'], fields)))
+                self._enqueue_write('update', entry['id'], fields)
+        return updated
+
+    def apply_db_changes(self, rows, expected_status=None):
+        """DB에서 직접 변경된 행을 메모리에 반영 (DB에 다시 쓰지 않음, 반영된 행 리스트 반환)
+
+        expected_status를 주면 메모리 상태가 일치하는 항목만 반영합니다.
+        그 사이 메모리에서 바뀐 항목은 쓰기 스레드가 메모리 값으로 DB를 덮어씁니다.
+        """
+        if not self._ready:
+            return list(rows)
+
+        applied = []
+        with self._lock:
+            for row in rows:
+                entry = self._find(int(row['id']))
+                if not entry or (expected_status and entry['status'] != expected_status):
+                    continue
+                self._touch(entry['id'])
+                fields = {key: row[key] for key in ('status', 'queue_position', 'called_at', 'completed_at') if key in row}
+                applied.append(dict(self._booths[entry['booth_id']].update(entry['id'], fields)))
+        return applied
+
+    def update_entry(self, entry_id, fields, expected_status=None):
+        """대기열 항목 1건 상태 변경 (변경된 행 리스트 반환)"""
+        return self.update_entries([entry_id], fields, expected_status)
+
+    def delete_entry(self, entry_id):
+        """대기열 항목 삭제 (삭제된 행 리스트 반환)"""
+        if not self._ready:
+            return run_query('queue_entries', 'delete_entry', get_supabase().table('queue_entries').delete().eq('id', entry_id)).data or []
+
+        with self._lock:
+            entry = self._remove(int(entry_id))
+            if not entry:
+                return []
+            self._enqueue_write('delete', entry['id'])
+        return [dict(entry)]
+
+queue_engine = QueueEngine()
+
+booths_repo.add_change_hook(queue_engine.invalidate_booths)
@@ -0,0 +1,111 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 대기열 집계
+
+부스 목록 및 관리자 대기열 현황에 필요한 정보를 부스 수와 무관하게
+고정된 횟수의 쿼리로 조회합니다:
+- 부스별·상태별 대기 인원 (queue_status_counts 뷰, 1회)
+- 학생 본인의 진행 중인 대기 신청 (in_ 쿼리, 1회)
+- 전체 상태별 합계 (부스별 집계를 메모리에서 합산)
+
+메모리 대기열 엔진이 준비되어 있으면 대기열 관련 집계는 DB 조회 없이 엔진에서 가져옵니다.
+"""
+
+from app.db import get_supabase
+from app.repositories import queue_repo, booths_repo
+from app.queue_engine import queue_engine
+from app.wait_estimator import wait_estimator, booth_concurrency
+
+# 학생이 "신청 중"으로 간주되는 대기열 상태
+ACTIVE_QUEUE_STATUSES = ['waiting', 'called']
+
+def get_waiting_counts():
+    """부스별 대기 인원 조회 ({booth_id: count})
+
+    queue_status_counts 뷰(booth_id, status 별 GROUP BY)를 한 번만 조회합니다.
+    """
+    counts = queue_engine.waiting_counts()
+    if counts is not None:
+        return counts
+    
+    supabase = get_supabase()
+    if not supabase:
+        return {}
+
+    counts = {}
+    for row in queue_repo.status_counts(status='waiting'):
+        counts[row['booth_id']] = row['entry_count']
+    return counts
+
+def get_student_application_statuses(student_id, booth_ids):
+    """학생의 부스별 진행 중인 대기 신청 상태 조회 ({booth_id: status})"""
+    supabase = get_supabase()
+    if not supabase or not student_id or not booth_ids:
+        return {}
+    
+    statuses = queue_engine.student_statuses(student_id)
+    if statuses is not None:
+        booth_ids = set(booth_ids)
+        return {booth_id: status for booth_id, status in statuses.items() if booth_id in booth_ids}
+
+    statuses = {}
+    for row in queue_repo.student_statuses(student_id, booth_ids, ACTIVE_QUEUE_STATUSES):
+        # 'called' 상태가 있으면 'waiting'보다 우선 표시
+        if statuses.get(row['booth_id']) != 'called':
+            statuses[row['booth_id']] = row['status']
+    return statuses
+
+def build_student_booth_list(student_id=None):
+    """학생용 활성 부스 목록 구성
+
+    부스 조회 1회 + 대기 인원 집계 1회 + 학생 신청 상태 1회,
+    총 3회의 쿼리 결과를 메모리에서 합칩니다.
+    새로 신청할 경우의 예상 대기 시간(평균/p90, 분)을 함께 제공합니다.
+    """
+    supabase = get_supabase()
+    if not supabase:
+        return []
+
+    booth_rows = booths_repo.list_active()
+    if not booth_rows:
+        return []
+
+    waiting_counts = get_waiting_counts()
+    application_statuses = get_student_application_statuses(student_id, [booth['id'] for booth in booth_rows])
+
+    booths = []
+    for booth in booth_rows:
+        booths.append({
+            'id': booth['id'],
+            'name': booth['name'],
+            'location': booth['location'],
+            'description': booth['description'],
+            'pdf_file_path': booth['pdf_file_path'],
+            'queue_count': waiting_counts.get(booth['id'], 0),
+            **wait_estimator.estimate(booth['id'], waiting_counts.get(booth['id'], 0), booth_concurrency(booth)),
+            'created_at': booth['created_at'],
+            'application_status': application_statuses.get(booth['id'])  # 'waiting', 'called', 또는 None
+        })
+    return booths
+
+def get_queue_status_counts():
+    """부스별·상태별 대기열 인원 조회 ({booth_id: {status: count}})"""
+    counts = queue_engine.status_counts()
+    if counts is not None:
+        return counts
+    
+    supabase = get_supabase()
+    if not supabase:
+        return {}
+
+    counts = {}
+    for row in queue_repo.status_counts():
+        counts.setdefault(row['booth_id'], {})[row['status']] = row['entry_count']
+    return counts
+
+def summarize_status_counts(status_counts):
+    """부스별 집계를 합산하여 전체 상태별 인원 계산 ({status: count})"""
+    totals = {}
+    for booth_counts in status_counts.values():
+        for status, count in booth_counts.items():
+            totals[status] = totals.get(status, 0) + count
+    return totals
@@ -0,0 +1,560 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 데이터 접근 계층 (repository)
+
+라우트마다 복사되어 있던 Supabase 조회를 테이블별 저장소 클래스로 모았습니다:
+- StudentsRepo, CheckinsRepo, StudentActivityRepo, QueueRepo, CertificatesRepo, BoothsRepo, BoothOperatorsRepo, SettingsRepo
+- 요청 단위 캐시: 같은 요청에서 같은 행은 다시 조회하지 않고, 쓰기 시 해당 테이블 캐시를 비움 (BatchLoader)
+- 변경 hook: insert/update/delete 후 변경된 행으로 호출 (확인증 PDF 캐시 무효화, 대기열 엔진 부스 정보 등)
+- 관리자 목록 페이지: list_page()로 검색·정렬 + keyset(정렬값, id) 커서 페이지 조회
+- 계측: 저장소와 앱 모듈(대기열 엔진, SMS outbox, 자동 호출, db.count/iter_rows, 운영자 관리 라우트)의
+  쿼리는 run_query()를 거치며 요청당 쿼리 수를 집계
+  - 응답 헤더 X-Query-Count, 엔드포인트별 통계는 endpoint_query_stats()
+  - Config.MAX_QUERIES_PER_REQUEST 초과 시 경고 (QUERY_BUDGET_STRICT면 예외)
+  - 관리자 DB 설정/전체 초기화 화면의 일회성 쿼리와 SMS 직접 발송 대체 경로는 집계하지 않음
+"""
+
+import json
+import base64
+import threading
+from flask import g, has_request_context, request
+from app.db import get_supabase
+from app.config import Config
+
+# 학생 한 명을 식별하는 컬럼 (checkins/certificates에는 학생 id가 없음)
+STUDENT_KEY_COLUMNS = ('school', 'grade', 'class', 'number', 'name')
+
+# in_ 조회 한 번에 넣는 최대 키 수 (URL 길이 제한)
+IN_CHUNK_SIZE = 500
+
+# 전체 조회 시 페이지 크기 (PostgREST 기본 최대 행 수)
+PAGE_SIZE = 1000
+
+# 관리자 목록 API 한 페이지 기본/최대 크기
+LIST_PAGE_SIZE = 50
+MAX_LIST_PAGE_SIZE = 200
+
+class QueryBudgetExceeded(RuntimeError):
+    """요청당 쿼리 수 상한 초과 (Config.QUERY_BUDGET_STRICT일 때만 발생)"""
+
+class InvalidListQuery(ValueError):
+    """목록 조회 파라미터(정렬 컬럼, 검색값, 커서) 오류"""
+
+# === 계측 ===
+
+_endpoint_stats = {}
+_endpoint_stats_lock = threading.Lock()
+
+def query_count():
+    """현재 요청에서 실행한 쿼리 수"""
+    if not has_request_context():
+        return 0
+    return g.get('query_count', 0)
+
+def _count_query(table, operation):
+    if not has_request_context():
+        return
+    g.query_count = g.get('query_count', 0) + 1
+
+    limit = Config.MAX_QUERIES_PER_REQUEST
+    if limit and g.query_count > limit:
+        if Config.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(f"요청당 쿼리 수 상한({limit}) 초과: {request.endpoint}")
+        if not g.get('query_budget_warned'):
+            g.query_budget_warned = True
+            print(f"⚠️ 요청당 쿼리 수 상한({limit}) 초과: {request.endpoint} ({table} {operation})")
+
+def run_query(table, operation, query):
+    """쿼리 실행 + 요청당 쿼리 수 집계 (요청 밖의 백그라운드 스레드에서는 실행만)"""
+    _count_query(table, operation)
+    return query.execute()
+
+def _record_endpoint(response):
+    count = query_count()
+    endpoint = request.endpoint or request.path
+    with _endpoint_stats_lock:
+        stats = _endpoint_stats.setdefault(endpoint, {'requests': 0, 'queries': 0, 'max_queries': 0})
+        stats['requests'] += 1
+        stats['queries'] += count
+        stats['max_queries'] = max(stats['max_queries'], count)
+    response.headers['X-Query-Count'] = str(count)
+    return response
+
+def endpoint_query_stats():
+    """엔드포인트별 요청 수, 총 쿼리 수, 최대 쿼리 수, 평균 쿼리 수"""
+    with _endpoint_stats_lock:
+        return {
+            endpoint: dict(stats, avg_queries=round(stats['queries'] / stats['requests'], 2))
+            for endpoint, stats in _endpoint_stats.items()
+        }
+
+def install_query_budget(app):
+    """응답마다 X-Query-Count 헤더를 붙이고 엔드포인트별 쿼리 수 집계"""
+    app.after_request(_record_endpoint)
+
+# === 공용 헬퍼 ===
+
+def student_key(record):
+    """학생 식별 튜플 (school, grade, class, number, name)"""
+    return (record['school'], int(record['grade']), int(record['class']), int(record['number']), record['name'])
+
+def sort_booth_records(records):
+    """부스별 소감을 최신 체험 순으로 정렬 (JSONB는 키 순으로 돌아오므로 확인증 표시 전에 정렬)"""
+    return dict(sorted((records or {}).items(), key=lambda item: str(item[1].get('created_at') or ''), reverse=True))
+
+def filter_student(query, student):
+    """학생 식별 컬럼 5개로 eq 조건 적용"""
+    for column, value in zip(STUDENT_KEY_COLUMNS, student_key(student)):
+        query = query.eq(column, value)
+    return query
+
+def encode_cursor(values):
+    """keyset 커서 문자열 (마지막 행의 [정렬값, id])"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise InvalidListQuery('잘못된 커서입니다.')
+    if not isinstance(values, list) or len(values) != 2:
+        raise InvalidListQuery('잘못된 커서입니다.')
+    return values
+
+def _filter_value(value):
+    """or_ 필터 안의 값 표기 (문자열은 쉼표·괄호가 있어도 되도록 따옴표로 감쌈)"""
+    if isinstance(value, str):
+        return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    return json.dumps(value)
+
+class BatchLoader:
+    """키(column 값)로 행을 조회하고 요청 단위로 캐시하는 로더
+
+    같은 요청에서 이미 조회한 키(없는 행 포함)는 다시 조회하지 않고, 나머지 키는 in_ 한 번으로 조회합니다.
+    요청 밖(백그라운드 스레드)에서는 캐시 없이 매번 조회합니다.
+    """
+
+    def __init__(self, repo, column='id', columns='*'):
+        self.repo = repo
+        self.column = column
+        self.columns = columns
+
+    def _normalize(self, key):
+        return int(key) if self.column == 'id' else key
+
+    def _rows(self):
+        cache = self.repo._request_cache()
+        if cache is None:
+            return None
+        return cache.setdefault(('rows', self.column, self.columns), {})
+
+    def _fetch(self, keys):
+        keys = list(keys)
+        fetched = {}
+        for start in range(0, len(keys), IN_CHUNK_SIZE):
+            query = self.repo._table().select(self.columns).in_(self.column, keys[start:start + IN_CHUNK_SIZE])
+            for row in self.repo._rows('batch_select', query):
+                fetched[row[self.column]] = row
+        return fetched
+
+    def load_many(self, keys):
+        """키 목록 조회 ({키: 행}, 없는 키는 제외)"""
+        keys = [self._normalize(key) for key in keys if key is not None]
+        rows = self._rows()
+        if rows is None:
+            return self._fetch(set(keys))
+
+        missing = {key for key in keys if key not in rows}
+        if missing:
+            fetched = self._fetch(missing)
+            for key in missing:
+                rows[key] = fetched.get(key)  # 없는 행도 기록하여 같은 요청에서 다시 조회하지 않음
+        return {key: rows[key] for key in keys if rows.get(key) is not None}
+
+    def load(self, key):
+        """키 하나 조회 (없으면 None)"""
+        if key is None:
+            return None
+        return self.load_many([key]).get(self._normalize(key))
+
+# === 저장소 ===
+
+class Repo:
+    """테이블 하나에 대한 저장소 기본 클래스"""
+
+    table = None
+
+    # list_page() 설정: 조회 컬럼, 허용 정렬 컬럼, 기본 정렬, 검색 파라미터 ({파라미터: 'ilike' | 'eq'})
+    list_columns = '*'
+    sort_columns = ('id',)
+    default_sort = ('id', False)
+    search_columns = {}
+
+    def __init__(self):
+        self._change_hooks = []
+        self.by_id = BatchLoader(self)
+
+    def _table(self):
+        return get_supabase().table(self.table)
+
+    def _run(self, operation, query):
+        return run_query(self.table, operation, query)
+
+    def _rows(self, operation, query):
+        return self._run(operation, query).data or []
+
+    def _first(self, operation, query):
+        rows = self._rows(operation, query)
+        return rows[0] if rows else None
+
+    def _iter(self, operation, build_query):
+        """id keyset 페이지 단위로 전체 행 순회 (app.db.iter_rows와 같은 방식, build_query는 정렬 없이 id 포함 조회)"""
+        last_id = None
+        while True:
+            query = build_query()
+            if last_id is not None:
+                query = query.gt('id', last_id)
+            rows = self._rows(operation, query.order('id').limit(PAGE_SIZE))
+            for row in rows:
+                yield row
+            if len(rows) < PAGE_SIZE:
+                break
+            last_id = rows[-1]['id']
+
+    # --- 관리자 목록 페이지 ---
+
+    def _search(self, query, search):
+        for column, mode in self.search_columns.items():
+            value = (search or {}).get(column)
+            if value in (None, ''):
+                continue
+            if mode == 'ilike':
+                query = query.ilike(column, f"%{value}%")
+            else:
+                try:
+                    query = query.eq(column, int(value))
+                except (TypeError, ValueError):
+                    raise InvalidListQuery(f'{column} 값은 숫자여야 합니다.')
+        return query
+
+    def list_page(self, search=None, sort=None, descending=None, cursor=None, limit=LIST_PAGE_SIZE, query_filter=None):
+        """검색·정렬된 목록의 한 페이지 (rows, 다음 페이지 커서 또는 None)
+
+        OFFSET 대신 (정렬값, id) keyset으로 이어서 조회하므로 뒤쪽 페이지도 인덱스만 탐색합니다.
+        query_filter는 고정 조건을 추가하는 함수입니다 (예: 최소 체험 부스 수).
+        """
+        sort = sort or self.default_sort[0]
+        if sort not in self.sort_columns:
+            raise InvalidListQuery(f'정렬할 수 없는 컬럼입니다: {sort}')
+        if descending is None:
+            descending = self.default_sort[1] if sort == self.default_sort[0] else False
+        limit = max(1, min(int(limit or LIST_PAGE_SIZE), MAX_LIST_PAGE_SIZE))
+
+        query = self._search(self._table().select(self.list_columns), search)
+        if query_filter:
+            query = query_filter(query)
+
+        op = 'lt' if descending else 'gt'
+        if cursor:
+            last_value, last_id = decode_cursor(cursor)
+            if sort == 'id':
+                query = query.filter('id', op, int(last_id))
+            elif last_value is None:
+                # NULL 정렬값은 방향과 관계없이 맨 뒤 (nullslast) → 남은 NULL 행만 id 순으로
+                query = query.or_(f"and({sort}.is.null,id.{op}.{int(last_id)})")
+            else:
+                value = _filter_value(last_value)
+                query = query.or_(f"{sort}.{op}.{value},and({sort}.eq.{value},id.{op}.{int(last_id)}),{sort}.is.null")
+
+        if sort != 'id':
+            # 정렬값이 비어 있는 행(last_checkin_at, created_at 등)은 맨 뒤, 같은 값끼리는 id(NOT NULL) 순
+            query = query.order(sort, desc=descending, nullsfirst=False)
+        query = query.order('id', desc=descending)
+
+        rows = self._rows('list_page', query.limit(limit + 1))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1][sort], rows[-1]['id']])
+        return rows, next_cursor
+
+    def count(self, search=None, query_filter=None):
+        """list_page()와 같은 조건의 전체 행 수 (행 데이터 없이 개수만 조회)"""
+        query = self._search(self._table().select('id', count='exact', head=True), search)
+        if query_filter:
+            query = query_filter(query)
+        return self._run('count', query).count or 0
+
+    # --- 요청 단위 캐시 / 변경 hook ---
+
+    def _request_cache(self):
+        if not has_request_context():
+            return None
+        if 'repo_cache' not in g:
+            g.repo_cache = {}
+        return g.repo_cache.setdefault(self.table, {})
+
+    def add_change_hook(self, hook):
+        """insert/update/delete 후 변경된 행 리스트로 호출할 함수 등록"""
+        self._change_hooks.append(hook)
+
+    def _changed(self, rows):
+        cache = self._request_cache()
+        if cache is not None:
+            cache.clear()
+        for hook in self._change_hooks:
+            try:
+                hook(rows)
+            except Exception as e:
+                print(f"{self.table} 변경 hook 오류: {e}")
+        return rows
+
+    # --- 공통 조회 / 변경 ---
+
+    def get(self, row_id):
+        """id로 행 1건 조회 (같은 요청에서는 한 번만 조회)"""
+        return self.by_id.load(row_id)
+
+    def insert(self, data):
+        """행 추가 (추가된 행 리스트 반환)"""
+        return self._changed(self._rows('insert', self._table().insert(data)))
+
+    def update(self, row_id, data):
+        """id로 행 수정 (수정된 행 리스트 반환)"""
+        return self._changed(self._rows('update', self._table().update(data).eq('id', row_id)))
+
+    def delete(self, row_id):
+        """id로 행 삭제 (삭제된 행 리스트 반환)"""
+        return self._changed(self._rows('delete', self._table().delete().eq('id', row_id)))
+
+class StudentsRepo(Repo):
+    table = 'students'
+
+    list_columns = 'id, student_id, password, school, grade, class, number, name, created_at'
+    sort_columns = ('created_at', 'name', 'school', 'grade', 'class', 'student_id', 'id')
+    default_sort = ('created_at', True)
+    search_columns = {'school': 'ilike', 'grade': 'eq', 'class': 'eq', 'name': 'ilike', 'student_id': 'ilike'}
+
+    def find_by_login_id(self, login_id, exclude_id=None):
+        """로그인 ID로 학생 조회 (exclude_id는 수정 시 본인 제외용)"""
+        query = self._table().select('*').eq('student_id', login_id)
+        if exclude_id is not None:
+            query = query.neq('id', exclude_id)
+        return self._first('find_by_login_id', query)
+
+    def login_id_taken(self, login_id):
+        return bool(self._rows('login_id_taken', self._table().select('id').eq('student_id', login_id)))
+
+    def authenticate(self, login_id, password):
+        return self._first('authenticate', self._table().select('*').eq('student_id', login_id).eq('password', password))
+
+    def find_by_class_number(self, school, grade, class_, number):
+        """같은 학교·학년·반·번호의 학생 조회"""
+        query = self._table().select('*').eq('school', school).eq('grade', int(grade)).eq('class', int(class_)).eq('number', int(number))
+        return self._first('find_by_class_number', query)
+
+class CheckinsRepo(Repo):
+    table = 'checkins'
+
+    def for_student(self, student, columns='booth, comment, created_at'):
+        """학생의 체크인 기록 (최신순)"""
+        query = filter_student(self._table().select(columns), student).order('created_at', desc=True)
+        return self._rows('for_student', query)
+
+    def iter_all(self, columns='*'):
+        """전체 체크인 기록 순회 (페이지 단위)"""
+        return self._iter('iter_all', lambda: self._table().select(columns))
+
+    def upsert_checkins(self, rows):
+        """체크인 일괄 저장 (upsert_checkins DB 함수)
+
+        ingest_id나 dedupe_key가 같은 기존 행이 있으면 새 행 대신 소감만 갱신합니다.
+        반환: {'inserted': [새 행], 'updated': [소감이 갱신된 기존 행]}
+        """
+        query = get_supabase().rpc('upsert_checkins', {'p_rows': rows})
+        result = self._run('upsert_checkins', query).data or {}
+        self._changed((result.get('inserted') or []) + (result.get('updated') or []))
+        return result
+
+    def update_comment(self, record_id, comment):
+        return self.update(record_id, {'comment': comment})
+
+class CertificatesRepo(Repo):
+    table = 'certificates'
+
+    sort_columns = ('issued_at', 'certificate_number', 'name', 'school', 'booth_count', 'id')
+    default_sort = ('issued_at', True)
+    search_columns = {'school': 'ilike', 'grade': 'eq', 'class': 'eq', 'name': 'ilike', 'certificate_number': 'ilike'}
+
+    def __init__(self):
+        super().__init__()
+        self.by_number = BatchLoader(self, column='certificate_number')
+
+    def get_by_number(self, certificate_number):
+        return self.by_number.load(certificate_number)
+
+    def number_for(self, student):
+        """학생에게 발급된 확인증 번호 (없으면 None)"""
+        row = self._first('number_for', filter_student(self._table().select('certificate_number'), student))
+        return row['certificate_number'] if row else None
+
+    def issue(self, prefix, rows):
+        """확인증 번호 할당 + 일괄 insert (issue_certificates DB 함수)
+
+        반환: {'issued': 새로 발급한 수, 'certificates': [요청한 학생들의 확인증 행]}
+        """
+        query = get_supabase().rpc('issue_certificates', {'p_prefix': prefix, 'p_rows': rows})
+        result = self._run('issue_certificates', query).data or {}
+        self._changed(result.get('certificates') or [])
+        return result
+
+    def numbers_for(self, students):
+        """여러 학생의 확인증 번호 ({학생 키: 확인증 번호}, 이름 in_ 조회 후 학생 키로 매칭)"""
+        wanted = {student_key(student) for student in students}
+        names = sorted({key[-1] for key in wanted})
+        numbers = {}
+        for start in range(0, len(names), IN_CHUNK_SIZE):
+            query = self._table().select('certificate_number, school, grade, class, number, name').in_('name', names[start:start + IN_CHUNK_SIZE]).order('id')
+            for row in self._rows('numbers_for', query):
+                key = student_key(row)
+                if key in wanted:
+                    numbers.setdefault(key, row['certificate_number'])
+        return numbers
+
+def min_booth_filter(min_booth_count):
+    """student_activity 조회에 최소 체험 부스 수 조건을 거는 query_filter"""
+    return lambda query: query.gte('booth_count', min_booth_count)
+
+class StudentActivityRepo(Repo):
+    """학생별 체험 요약 (student_activity, checkins 트리거가 갱신)
+
+    행마다 학생 식별 컬럼 5개, booth_records({부스명: {'comment', 'created_at'}}),
+    booth_count, last_checkin_at을 가집니다.
+    """
+
+    table = 'student_activity'
+
+    list_columns = 'id, school, grade, class, number, name, booth_count, last_checkin_at'
+    sort_columns = ('name', 'school', 'grade', 'booth_count', 'last_checkin_at', 'id')
+    default_sort = ('name', False)
+    search_columns = {'school': 'ilike', 'grade': 'eq', 'class': 'eq', 'name': 'ilike'}
+
+    def for_student(self, student):
+        """학생의 체험 요약 1건 (체크인이 없으면 None)"""
+        return self._first('for_student', filter_student(self._table().select('*'), student))
+
+    def booth_records(self, student):
+        """학생의 부스별 최신 소감 ({부스명: {'comment', 'created_at'}}, 최신 체험 순)"""
+        activity = self.for_student(student)
+        if not activity:
+            return {}
+        return sort_booth_records(activity.get('booth_records'))
+
+    def iter_all(self, columns='*', min_booth_count=None):
+        """전체 학생 체험 요약 순회 (min_booth_count를 주면 그 이상 체험한 학생만)"""
+        def build_query():
+            query = self._table().select(columns)
+            if min_booth_count:
+                query = min_booth_filter(min_booth_count)(query)
+            return query
+        return self._iter('iter_all', build_query)
+
+class BoothsRepo(Repo):
+    table = 'booths'
+
+    def __init__(self):
+        super().__init__()
+        self.by_name = BatchLoader(self, column='name')
+
+    def get_by_name(self, name):
+        return self.by_name.load(name)
+
+    def name_taken(self, name, exclude_id=None):
+        """같은 이름의 다른 부스가 있는지 확인"""
+        query = self._table().select('id').eq('name', name)
+        if exclude_id is not None:
+            query = query.neq('id', exclude_id)
+        return bool(self._rows('name_taken', query))
+
+    def list_active(self, columns='id, name, location, description, pdf_file_path, created_at, auto_call_enabled, auto_call_concurrency'):
+        return self._rows('list_active', self._table().select(columns).eq('is_active', True).order('created_at', desc=True))
+
+    def list_with_operators(self, columns='*, booth_operators(club_name)'):
+        """전체 부스 + 운영자 정보 (등록 최신순)"""
+        return self._rows('list_with_operators', self._table().select(columns).order('created_at', desc=True))
+
+    def list_by_operator(self, operator_id):
+        return self._rows('list_by_operator', self._table().select('*').eq('operator_id', operator_id).order('created_at', desc=True))
+
+    def update_by_name(self, name, data):
+        return self._changed(self._rows('update', self._table().update(data).eq('name', name)))
+
+    def delete_by_name(self, name):
+        return self._changed(self._rows('delete', self._table().delete().eq('name', name)))
+
+class BoothOperatorsRepo(Repo):
+    table = 'booth_operators'
+
+    list_columns = 'id, operator_id, school, club_name, booth_topic, phone, email, is_active, created_at'
+
+    sort_columns = ('created_at', 'club_name', 'school', 'operator_id', 'id')
+    default_sort = ('created_at', True)
+    search_columns = {'school': 'ilike', 'club_name': 'ilike', 'operator_id': 'ilike'}
+
+class QueueRepo(Repo):
+    table = 'queue_entries'
+
+    def apply(self, booth_id, student_id):
+        """대기 신청 (중복 확인 + 순번 할당 + 삽입, apply_to_queue DB 함수)"""
+        query = get_supabase().rpc('apply_to_queue', {
+            'p_booth_id': int(booth_id),
+            'p_student_id': int(student_id)
+        })
+        return self._run('apply_to_queue', query).data
+
+    def expire_no_shows(self, requeue, now, exclude_ids=()):
+        """미방문 항목 일괄 처리 (expire_no_show_entries DB 함수)
+
+        now: 앱 기준 현재 시각 (called_at과 같은 naive 로컬 시각, DB의 UTC NOW() 대신 사용)
+        exclude_ids: 처리하지 않을 항목 id (대기열 엔진이 아직 DB에 반영하지 않은 항목)
+        """
+        query = get_supabase().rpc('expire_no_show_entries', {
+            'p_requeue': requeue,
+            'p_now': now.isoformat(),
+            'p_exclude_ids': sorted(exclude_ids)
+        })
+        return self._run('expire_no_show_entries', query).data or {}
+
+    def status_counts(self, status=None):
+        """부스별·상태별 인원 (queue_status_counts 뷰 행 리스트)"""
+        query = get_supabase().table('queue_status_counts').select('booth_id, status, entry_count')
+        if status:
+            query = query.eq('status', status)
+        return self._rows('status_counts', query)
+
+    def student_statuses(self, student_id, booth_ids, statuses):
+        """학생의 부스별 신청 상태 행 (booth_id, status)"""
+        query = self._table().select('booth_id, status').eq('student_id', student_id).in_('booth_id', list(booth_ids)).in_('status', list(statuses))
+        return self._rows('student_statuses', query)
+
+class SettingsRepo(Repo):
+    table = 'settings'
+
+    def list_all(self):
+        """전체 설정 행 (id 순, 같은 key가 여러 번 있으면 나중 행이 우선)"""
+        return self._rows('list', self._table().select('key, value').order('id'))
+
+    def get_value(self, key):
+        row = self._first('get_value', self._table().select('value').eq('key', key).order('id', desc=True).limit(1))
+        return row['value'] if row else None
+
+    def upsert(self, rows):
+        return self._changed(self._rows('upsert', self._table().upsert(rows)))
+
+students_repo = StudentsRepo()
+checkins_repo = CheckinsRepo()
+certificates_repo = CertificatesRepo()
+student_activity_repo = StudentActivityRepo()
+booths_repo = BoothsRepo()
+booth_operators_repo = BoothOperatorsRepo()
+queue_repo = QueueRepo()
+settings_repo = SettingsRepo()
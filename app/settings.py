@@ -0,0 +1,114 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 설정 캐시
+
+settings 테이블(행사명 등)을 한 번에 읽어 메모리에 보관합니다:
+- 전체 설정 행을 1회 조회하여 Config.SETTINGS_CACHE_TTL 초 동안 재사용
+- 요청 안에서는 처음 읽은 값을 그대로 사용 (flask.g)
+- 값 변경 시 settings_version 행을 함께 갱신하고, 다른 워커는
+  Config.SETTINGS_VERSION_CHECK_INTERVAL 초마다 버전만 확인하여 바뀌었으면 다시 읽음
+"""
+
+import time
+import threading
+from flask import g, has_request_context
+from app.db import get_supabase
+from app.config import Config
+from app.repositories import settings_repo
+
+DEFAULT_EVENT_NAME = "대구수학축제"
+
+# 변경 시마다 갱신되는 버전 행의 key
+VERSION_KEY = 'settings_version'
+
+class SettingsCache:
+    """settings 테이블 전체를 메모리에 보관 (TTL + 버전 확인)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+
+    def _load(self):
+        values = {}
+        for row in settings_repo.list_all():
+            values[row['key']] = row['value']
+        now = time.monotonic()
+        with self._lock:
+            self._values = values
+            self._loaded_at = now
+            self._checked_at = now
+        return values
+
+    def _is_stale(self, now):
+        """TTL이 지났거나 다른 워커가 버전을 올렸으면 True"""
+        if self._values is None or now - self._loaded_at > Config.SETTINGS_CACHE_TTL:
+            return True
+        if now - self._checked_at < Config.SETTINGS_VERSION_CHECK_INTERVAL:
+            return False
+
+        self._checked_at = now
+        return settings_repo.get_value(VERSION_KEY) != self._values.get(VERSION_KEY)
+
+    def values(self):
+        """전체 설정 ({key: value}, 조회 실패 시 마지막으로 읽은 값 또는 빈 dict)"""
+        if not get_supabase():
+            return {}
+        try:
+            if self._is_stale(time.monotonic()):
+                return self._load()
+        except Exception as e:
+            print(f"설정 조회 중 오류: {e}")
+        return self._values or {}
+
+    def invalidate(self):
+        """다음 조회 때 다시 읽도록 비움"""
+        with self._lock:
+            self._values = None
+
+settings_cache = SettingsCache()
+
+def get_settings():
+    """현재 설정 (같은 요청 안에서는 한 번만 읽음)"""
+    if not has_request_context():
+        return settings_cache.values()
+    if 'settings' not in g:
+        g.settings = settings_cache.values()
+    return g.settings
+
+def get_setting(key, default=None):
+    value = get_settings().get(key)
+    return default if value in (None, '') else value
+
+def set_setting(key, value, description=None):
+    """설정 저장 + 버전 갱신 (성공 여부 반환)"""
+    if not get_supabase():
+        return False
+    try:
+        settings_repo.upsert([
+            {'key': key, 'value': value, 'description': description},
+            {'key': VERSION_KEY, 'value': str(time.time_ns()), 'description': '설정 변경 버전'}
+        ])
+    except Exception as e:
+        print(f"설정 저장 중 오류 ({key}): {e}")
+        return False
+
+    settings_cache.invalidate()
+    if has_request_context():
+        g.pop('settings', None)
+    return True
+
+def get_event_name():
+    """행사명 조회"""
+    return get_setting('event_name', DEFAULT_EVENT_NAME)
+
+def set_event_name(event_name):
+    """행사명 설정"""
+    return set_setting('event_name', event_name, '행사명')
+
+def get_min_booth_count():
+    """확인증 발급에 필요한 최소 체험 부스 수"""
+    try:
+        return int(get_setting('min_booth_count', Config.MIN_BOOTH_COUNT))
+    except (TypeError, ValueError):
+        return Config.MIN_BOOTH_COUNT
@@ -0,0 +1,221 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - SMS 발송 대기열 (outbox)
+
+학생 호출/재호출 시 SMS를 요청 처리 중에 직접 보내지 않고,
+notifications 테이블에 'pending' 행만 기록한 뒤 바로 응답합니다.
+백그라운드 발송 스레드가 대기 중인 알림을 꺼내 발송하고 상태를 갱신합니다:
+- pending → sending → sent / dev_mode
+- 대기 중인 알림은 SMS_BATCH_SIZE 단위로 묶어 SOLAPI 1회 호출로 발송
+- 발송 실패 시 지수 백오프로 재시도, 최대 횟수 초과 시 failed
+- 선점 시 claimed_at/claimed_by를 기록하고, SMS_CLAIM_LEASE_SECONDS가 지나도
+  결과가 기록되지 않은 'sending' 행만 다시 대기 상태로 (다른 워커가 발송 중인 행은 건드리지 않음)
+- SOLAPI가 접수하면 다른 처리보다 먼저 'sent'로 기록, 실패 건은 메시지별 키(알림 id)로 구분
+"""
+
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from app.db import get_supabase, get_solapi
+from app.config import Config
+from app.repositories import run_query
+from app.utils import deliver_sms_batch, send_sms_notification
+
+# 선점한 워커 식별 (claimed_by)
+WORKER_ID = f"{socket.gethostname()}-{os.getpid()}"
+
+# 'sent' 기록 재시도 횟수 (기록이 끝내 실패하면 선점 기간이 지난 뒤 재발송될 수 있음)
+RECORD_SENT_ATTEMPTS = 3
+
+_wakeup = threading.Event()
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+def enqueue_sms_batch(notifications):
+    """여러 SMS를 한 번의 insert로 outbox에 기록
+
+    notifications: [{'phone_number', 'message', 'booth_id', 'student_id'}]
+    기록 자체가 실패하면 알림이 유실되지 않도록 즉시 발송으로 대체합니다.
+    """
+    if not notifications:
+        return True
+
+    supabase = get_supabase()
+    if supabase:
+        now = datetime.now().isoformat()
+        rows = [{
+            'phone_number': notification['phone_number'],
+            'message': notification['message'],
+            'status': 'pending',
+            'booth_id': notification.get('booth_id'),
+            'student_id': notification.get('student_id'),
+            'attempts': 0,
+            'next_attempt_at': now
+        } for notification in notifications]
+        try:
+            run_query('notifications', 'enqueue', supabase.table('notifications').insert(rows))
+            _wakeup.set()
+            return True
+        except Exception as e:
+            print(f"SMS outbox 기록 실패, 즉시 발송으로 대체: {e}")
+
+    results = [send_sms_notification(n['phone_number'], n['message'], n.get('booth_id'), n.get('student_id')) for n in notifications]
+    return all(results)
+
+def enqueue_sms(phone_number, message, booth_id=None, student_id=None):
+    """발송할 SMS 1건을 outbox에 기록 (발송은 백그라운드에서 진행)"""
+    return enqueue_sms_batch([{
+        'phone_number': phone_number,
+        'message': message,
+        'booth_id': booth_id,
+        'student_id': student_id
+    }])
+
+def _retry_delay(attempts):
+    """재시도 대기 시간 (지수 백오프, 상한 적용)"""
+    delay = Config.SMS_RETRY_BASE_DELAY * (2 ** (attempts - 1))
+    return timedelta(seconds=min(delay, Config.SMS_RETRY_MAX_DELAY))
+
+def _claim_due_notifications(supabase):
+    """발송 시각이 된 알림을 'sending'으로 선점하여 반환 (조회 1회 + 업데이트 1회)"""
+    due = run_query('notifications', 'due', supabase.table('notifications').select('id, phone_number, message, attempts').eq('status', 'pending').lte('next_attempt_at', datetime.now().isoformat()).order('id').limit(Config.SMS_BATCH_SIZE))
+    if not due.data:
+        return []
+
+    # 상태 조건부 업데이트로 다른 워커와 중복 발송 방지 (실제로 선점한 행만 반환됨)
+    claimed = run_query('notifications', 'claim', supabase.table('notifications').update({
+        'status': 'sending',
+        'claimed_at': datetime.now().isoformat(),
+        'claimed_by': WORKER_ID
+    }).in_('id', [row['id'] for row in due.data]).eq('status', 'pending'))
+    claimed_ids = {row['id'] for row in claimed.data or []}
+    return [row for row in due.data if row['id'] in claimed_ids]
+
+def _failed_notification_ids(response):
+    """일괄 발송 응답에서 접수 실패한 알림 id 추출 (메시지별 custom_fields['key'])"""
+    failed = set()
+    for failed_message in getattr(response, 'failed_message_list', None) or []:
+        key = (getattr(failed_message, 'custom_fields', None) or {}).get('key')
+        if key is not None:
+            failed.add(str(key))
+    return failed
+
+def _record_results(supabase, notifications, outcome, extra):
+    """같은 결과의 알림을 시도 횟수별로 묶어 업데이트 (대부분 1회)"""
+    by_attempts = {}
+    for notification in notifications:
+        attempts = (notification.get('attempts') or 0) + 1
+        by_attempts.setdefault(attempts, []).append(notification['id'])
+
+    for attempts, ids in by_attempts.items():
+        update = {'attempts': attempts, **extra}
+        if outcome == 'failed':
+            if attempts >= Config.SMS_MAX_ATTEMPTS:
+                update['status'] = 'failed'
+            else:
+                update['status'] = 'pending'
+                update['next_attempt_at'] = (datetime.now() + _retry_delay(attempts)).isoformat()
+        else:
+            update['status'] = outcome
+        run_query('notifications', 'record_results', supabase.table('notifications').update(update).in_('id', ids))
+
+def _record_sent(supabase, notifications, extra):
+    """접수된 알림을 'sent'로 기록 (재발송을 막는 기록이므로 몇 번 재시도)"""
+    for attempt in range(1, RECORD_SENT_ATTEMPTS + 1):
+        try:
+            _record_results(supabase, notifications, 'sent', extra)
+            return
+        except Exception as e:
+            print(f"SMS 발송 성공 기록 실패 ({attempt}/{RECORD_SENT_ATTEMPTS}): {e}")
+            time.sleep(0.5 * attempt)
+
+def _dispatch_batch(supabase, notifications):
+    """선점한 알림을 SOLAPI 1회 호출로 일괄 발송 후 결과 기록"""
+    now = datetime.now().isoformat()
+
+    if not get_solapi():
+        for notification in notifications:
+            print(f"📱 [개발모드] SMS 발송: {notification['phone_number']} → {notification['message']}")
+        _record_results(supabase, notifications, 'dev_mode', {'sent_at': now})
+        return
+
+    try:
+        response = deliver_sms_batch([(n['phone_number'], n['message'], n['id']) for n in notifications])
+    except Exception as sms_error:
+        print(f"❌ SMS 일괄 발송 실패 ({len(notifications)}건): {sms_error}")
+        _record_results(supabase, notifications, 'failed', {'error_message': str(sms_error)})
+        return
+
+    # SOLAPI가 접수한 알림은 다른 처리보다 먼저 'sent'로 기록
+    failed_ids = _failed_notification_ids(response)
+    sent = [n for n in notifications if str(n['id']) not in failed_ids]
+    failed = [n for n in notifications if str(n['id']) in failed_ids]
+    if sent:
+        _record_sent(supabase, sent, {'sent_at': now, 'error_message': None})
+
+    print(f"✅ SMS 일괄 발송: 성공 {len(sent)}건, 실패 {len(failed)}건")
+    if failed:
+        _record_results(supabase, failed, 'failed', {'error_message': 'SOLAPI 접수 실패'})
+    if sent:
+        try:
+            run_query('notifications', 'response_data', supabase.table('notifications').update({'response_data': str(response)}).in_('id', [n['id'] for n in sent]))
+        except Exception as e:
+            print(f"SMS 발송 응답 기록 실패: {e}")
+
+def drain_outbox():
+    """발송 시각이 된 알림을 모두 처리 (처리한 건수 반환)"""
+    supabase = get_supabase()
+    if not supabase:
+        return 0
+
+    processed = 0
+    while True:
+        notifications = _claim_due_notifications(supabase)
+        if not notifications:
+            return processed
+        try:
+            _dispatch_batch(supabase, notifications)
+        except Exception as e:
+            print(f"SMS 발송 결과 기록 실패: {e}")
+        processed += len(notifications)
+
+def _reclaim_expired(supabase):
+    """선점 기간(SMS_CLAIM_LEASE_SECONDS)이 지나도 결과가 없는 'sending' 알림을 다시 대기 상태로
+
+    발송 중 워커가 종료된 경우입니다. 다른 워커가 지금 발송 중인 행은 선점 기간 안이므로 건드리지 않습니다.
+    """
+    expired_before = (datetime.now() - timedelta(seconds=Config.SMS_CLAIM_LEASE_SECONDS)).isoformat()
+    try:
+        reclaimed = run_query('notifications', 'reclaim', supabase.table('notifications').update({'status': 'pending', 'claimed_by': None}).eq('status', 'sending').lt('claimed_at', expired_before))
+        if reclaimed.data:
+            print(f"선점 기간이 지난 SMS {len(reclaimed.data)}건을 다시 대기 상태로 변경")
+    except Exception as e:
+        print(f"중단된 SMS 복구 실패: {e}")
+
+def _run_dispatcher():
+    reclaimed_at = 0.0
+    while True:
+        supabase = get_supabase()
+        if supabase and time.monotonic() - reclaimed_at >= Config.SMS_CLAIM_LEASE_SECONDS / 2:
+            _reclaim_expired(supabase)
+            reclaimed_at = time.monotonic()
+
+        try:
+            drain_outbox()
+        except Exception as e:
+            print(f"SMS 발송 스레드 오류: {e}")
+        # 새 알림이 기록되면 바로 깨어나고, 아니면 재시도 시각 확인을 위해 주기적으로 깨어남
+        _wakeup.wait(Config.SMS_OUTBOX_POLL_INTERVAL)
+        _wakeup.clear()
+
+def start_sms_dispatcher():
+    """백그라운드 SMS 발송 스레드 시작 (프로세스당 1회)"""
+    global _dispatcher
+
+    with _dispatcher_lock:
+        if _dispatcher and _dispatcher.is_alive():
+            return _dispatcher
+        _dispatcher = threading.Thread(target=_run_dispatcher, name='sms-dispatcher', daemon=True)
+        _dispatcher.start()
+        return _dispatcher
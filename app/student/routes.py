@@ -10,7 +10,6 @@
 - 학생 활동 기록 관리
 """
 
-import os
 import base64
 import hashlib
 from flask import Blueprint, render_template, request, redirect, url_for, jsonify, send_file, session, flash
@@ -20,22 +19,24 @@ from io import BytesIO
 import qrcode
 from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch, mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image as RLImage, Table, TableStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 
 # Blueprint 생성
 student_bp = Blueprint('student', __name__, url_prefix='/student')
 
 # Import shared utilities and database connections (lazy loading)
 from app.db import get_supabase, get_solapi
-from app.config import Config
+from app.queue_stats import build_student_booth_list
+from app.certificates import (
+    get_or_issue_certificate, get_certificate_pdf, certificate_download_token, verify_certificate_download_token
+)
+from app.repositories import students_repo, checkins_repo, certificates_repo, student_activity_repo, queue_repo
+from app.settings import get_event_name, get_min_booth_count
+from app.checkin_buffer import record_checkin
+from app.sms_outbox import enqueue_sms
+from app.events import publish_queue_change, sse_response, student_channel
+from app.queue_engine import queue_engine
+from app.wait_estimator import wait_estimator, booth_concurrency
+from app.auto_call import auto_call_scheduler
 
 # Database connections will be initialized lazily
 def get_student_supabase():
@@ -48,48 +49,6 @@ def get_student_solapi():
 
 # === 헬퍼 함수들 ===
 
-def get_event_name():
-    """행사명 가져오기"""
-    supabase = get_student_supabase()
-    if not supabase:
-        return "대구수학축제"
-    
-    try:
-        result = supabase.table('settings').select('value').eq('key', 'event_name').execute()
-        if result.data:
-            return result.data[0]['value']
-        else:
-            return "대구수학축제"
-    except:
-        return "대구수학축제"
-
-def generate_certificate_number():
-    """대수페-25-0001 형식의 순차 인증서 번호 생성"""
-    supabase = get_student_supabase()
-    if not supabase:
-        return "대수페-25-TEMP"
-    
-    try:
-        # 최신 인증서 번호 조회
-        result = supabase.table('certificates').select('certificate_number').order('id', desc=True).limit(1).execute()
-        
-        if result.data:
-            last_number = result.data[0]['certificate_number']
-            # "대수페-25-0001" 형식에서 마지막 숫자 추출
-            parts = last_number.split('-')
-            if len(parts) == 3 and parts[0] == '대수페' and parts[1] == '25':
-                last_seq = int(parts[2])
-                new_seq = last_seq + 1
-            else:
-                new_seq = 1
-        else:
-            new_seq = 1
-        
-        return f"대수페-25-{new_seq:04d}"
-    except Exception as e:
-        # 오류 발생 시 현재 시간 기반 번호 생성
-        return f"대수페-25-{datetime.now().strftime('%m%d%H%M')}"
-
 def encrypt_password(password):
     """비밀번호를 암호화 (Base64 + MD5 해시)"""
     try:
@@ -101,257 +60,6 @@ def encrypt_password(password):
     except:
         return "***ENCRYPTED***"
 
-def send_sms_notification(phone_number, message, booth_id=None, student_id=None):
-    """SOLAPI를 사용한 SMS 알림 발송"""
-    try:
-        solapi_service = get_student_solapi()
-        if not solapi_service:
-            print(f"SMS 발송 (개발 모드 - SOLAPI 비활성화): {phone_number} - {message}")
-            return True
-        
-        # 전화번호 형식 정리 (하이픈 제거, 국가번호 처리)
-        clean_phone = phone_number.replace('-', '').replace(' ', '')
-        if clean_phone.startswith('010'):
-            clean_phone = '+82' + clean_phone[1:]  # 010 -> +8210
-        elif not clean_phone.startswith('+82'):
-            clean_phone = '+82' + clean_phone
-        
-        # SOLAPI를 통한 SMS 발송
-        response = solapi_service.send_one({
-            'to': clean_phone,
-            'from': Config.SOLAPI_SENDER_PHONE,
-            'text': message
-        })
-        
-        # 발송 결과 로깅
-        success = True
-        error_message = None
-        
-        if hasattr(response, 'status_code'):
-            if response.status_code == 200:
-                print(f"✅ SMS 발송 성공: {phone_number}")
-                success = True
-            else:
-                print(f"❌ SMS 발송 실패: {phone_number}, 상태코드: {response.status_code}")
-                success = False
-                error_message = f"HTTP {response.status_code}"
-        else:
-            print(f"✅ SMS 발송 완료: {phone_number}")
-            success = True
-        
-        # 알림 로그 저장
-        supabase = get_student_supabase()
-        if supabase:
-            try:
-                log_data = {
-                    'phone_number': phone_number,
-                    'message': message,
-                    'success': success,
-                    'error_message': error_message,
-                    'booth_id': booth_id,
-                    'student_id': student_id
-                }
-                supabase.table('notifications').insert(log_data).execute()
-            except Exception as log_error:
-                print(f"알림 로그 저장 실패: {log_error}")
-        
-        return success
-        
-    except Exception as e:
-        print(f"SMS 발송 중 오류: {e}")
-        
-        # 실패 로그 저장
-        supabase = get_student_supabase()
-        if supabase:
-            try:
-                log_data = {
-                    'phone_number': phone_number,
-                    'message': message,
-                    'success': False,
-                    'error_message': str(e),
-                    'booth_id': booth_id,
-                    'student_id': student_id
-                }
-                supabase.table('notifications').insert(log_data).execute()
-            except Exception as log_error:
-                print(f"실패 로그 저장 실패: {log_error}")
-        
-        return False
-
-def generate_certificate_pdf(student_info, booth_records, cert_id, event_name):
-    """새로운 형식의 확인증 PDF 생성"""
-    buffer = BytesIO()
-    
-    # A4 용지 크기로 PDF 문서 생성
-    doc = SimpleDocTemplate(buffer, pagesize=A4, 
-                          rightMargin=30*mm, leftMargin=30*mm,
-                          topMargin=20*mm, bottomMargin=20*mm)
-    
-    # 스타일 설정
-    styles = getSampleStyleSheet()
-    
-    # 한글 폰트 등록
-    font_name = 'Helvetica'  # 기본값
-    try:
-        # 프로젝트에 포함된 나눔고딕 폰트 사용
-        font_path = os.path.join(os.path.dirname(__file__), '..', 'fonts', 'NanumGothic.ttf')
-        if os.path.exists(font_path):
-            pdfmetrics.registerFont(TTFont('NanumGothic', font_path))
-            font_name = 'NanumGothic'
-        else:
-            # 폰트 파일이 없으면 CID 폰트 사용
-            pdfmetrics.registerFont(UnicodeCIDFont('HeiseiMin-W3'))
-            font_name = 'HeiseiMin-W3'
-    except Exception as e:
-        print(f"폰트 등록 중 오류: {e}")
-        # 오류 발생 시 기본 폰트 사용
-        font_name = 'Helvetica'
-    
-    # 커스텀 스타일 정의
-    title_style = ParagraphStyle(
-        'TitleStyle',
-        parent=styles['Title'],
-        fontName=font_name,
-        fontSize=24,
-        alignment=TA_CENTER,
-        spaceAfter=20,
-        textColor=colors.black
-    )
-    
-    header_style = ParagraphStyle(
-        'HeaderStyle',
-        parent=styles['Normal'],
-        fontName=font_name,
-        fontSize=18,
-        alignment=TA_CENTER,
-        spaceAfter=15,
-        textColor=colors.black
-    )
-    
-    normal_style = ParagraphStyle(
-        'NormalStyle',
-        parent=styles['Normal'],
-        fontName=font_name,
-        fontSize=12,
-        alignment=TA_LEFT,
-        spaceAfter=10,
-        textColor=colors.black
-    )
-    
-    center_style = ParagraphStyle(
-        'CenterStyle',
-        parent=styles['Normal'],
-        fontName=font_name,
-        fontSize=12,
-        alignment=TA_CENTER,
-        spaceAfter=10,
-        textColor=colors.black
-    )
-    
-    # PDF 내용 구성
-    story = []
-    
-    # 1. 좌측 상단에 발급번호
-    cert_number_text = f"발급번호: {cert_id}"
-    cert_number_style = ParagraphStyle(
-        'CertNumberStyle',
-        parent=styles['Normal'],
-        fontName=font_name,
-        fontSize=10,
-        alignment=TA_LEFT,
-        textColor=colors.grey
-    )
-    story.append(Paragraph(cert_number_text, cert_number_style))
-    story.append(Spacer(1, 20))
-    
-    # 2. 상단 가운데에 행사명
-    title_text = f"{event_name} 활동 확인서"
-    story.append(Paragraph(title_text, title_style))
-    story.append(Spacer(1, 20))
-    
-    # 3. 학생 정보
-    student_info_text = f"""
-    <b>학교:</b> {student_info['school']}<br/>
-    <b>학급:</b> {student_info['grade']}학년 {student_info['class']}반 {student_info['number']}번<br/>
-    <b>이름:</b> {student_info['name']}<br/>
-    <b>체험 부스 수:</b> {len(booth_records)}개
-    """
-    story.append(Paragraph(student_info_text, normal_style))
-    story.append(Spacer(1, 20))
-    
-    # 4. 체험 부스 목록
-    if booth_records:
-        story.append(Paragraph("<b>체험한 부스 목록</b>", normal_style))
-        story.append(Spacer(1, 10))
-        
-        # 테이블 데이터 준비
-        table_data = [['번호', '부스명', '소감']]
-        for i, (booth_name, record) in enumerate(booth_records.items(), 1):
-            comment = record.get('comment', '소감 없음')
-            if len(comment) > 50:  # 긴 소감은 줄임
-                comment = comment[:47] + "..."
-            table_data.append([str(i), booth_name, comment])
-        
-        # 테이블 생성
-        table = Table(table_data, colWidths=[20*mm, 50*mm, 80*mm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), font_name),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
-        story.append(table)
-        story.append(Spacer(1, 30))
-    
-    # 5. 확인 문구
-    confirmation_text = f"""
-    위 학생은 대구광역시교육청이 주최•주관하고, 대구중등수학교육연구회가 운영한 
-    '{event_name}'에 참여하여 창의적 체험활동을 하였으므로 위 내용을 확인합니다.
-    """
-    story.append(Paragraph(confirmation_text, center_style))
-    story.append(Spacer(1, 30))
-    
-    # 6. 발급일자
-    issue_date = datetime.now().strftime('%Y년 %m월 %d일')
-    story.append(Paragraph(f"발급일: {issue_date}", center_style))
-    story.append(Spacer(1, 40))
-    
-    # 7. 발급기관 및 전자관인
-    story.append(Paragraph("대구중등수학교육연구회장", center_style))
-    story.append(Spacer(1, 20))
-    
-    # 전자관인 이미지 추가
-    # 1순위: 관리자가 업로드한 커스텀 관인 (static/seal.png)
-    # 2순위: 기본 관인 (image/GanIn.png)
-    custom_seal_path = os.path.join(os.path.dirname(__file__), '..', 'static', 'seal.png')
-    default_seal_path = os.path.join(os.path.dirname(__file__), '..', 'image', 'GanIn.png')
-    
-    seal_path = None
-    if os.path.exists(custom_seal_path):
-        seal_path = custom_seal_path
-    elif os.path.exists(default_seal_path):
-        seal_path = default_seal_path
-    
-    if seal_path:
-        try:
-            seal_img = RLImage(seal_path, width=60, height=60)
-            seal_img.hAlign = 'CENTER'
-            story.append(seal_img)
-        except:
-            # 이미지 로드 실패시 텍스트로 대체
-            story.append(Paragraph("(관인)", center_style))
-    else:
-        story.append(Paragraph("(관인)", center_style))
-    
-    # PDF 생성
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
-
 # === 학생 라우트들 ===
 
 # --- 학생 정보 입력 페이지 ---
@@ -370,15 +78,11 @@ def api_create_student_account():
     
     try:
         # 중복 확인: 같은 학교, 학년, 반, 번호
-        existing = supabase.table('students').select('*').eq('school', data['school']).eq('grade', int(data['grade'])).eq('class', int(data['class'])).eq('number', int(data['number'])).execute()
-        
-        if existing.data:
+        if students_repo.find_by_class_number(data['school'], data['grade'], data['class'], data['number']):
             return jsonify({'ok': False, 'message': '이미 등록된 학생입니다.'})
         
         # ID 중복 확인
-        existing_id = supabase.table('students').select('*').eq('student_id', data['student_id']).execute()
-        
-        if existing_id.data:
+        if students_repo.login_id_taken(data['student_id']):
             return jsonify({'ok': False, 'message': '이미 사용 중인 ID입니다.'})
         
         # 새 학생 계정 생성
@@ -394,9 +98,7 @@ def api_create_student_account():
             'email': data.get('email', '')
         }
         
-        result = supabase.table('students').insert(student_data).execute()
-        
-        if result.data:
+        if students_repo.insert(student_data):
             return jsonify({'ok': True, 'message': '계정이 생성되었습니다.'})
         else:
             return jsonify({'ok': False, 'message': '계정 생성에 실패했습니다.'})
@@ -415,10 +117,12 @@ def api_student_login():
     
     try:
         # 학생 계정 조회
-        result = supabase.table('students').select('*').eq('student_id', data['student_id']).eq('password', data['password']).execute()
+        student = students_repo.authenticate(data['student_id'], data['password'])
         
-        if result.data:
-            student = result.data[0]
+        if student:
+            # 서버 세션에 학생 ID 저장 (실시간 알림 구독 권한 확인용)
+            session['student_id'] = student['id']
+            
             return jsonify({
                 'ok': True,
                 'student': {
@@ -453,9 +157,7 @@ def api_check_id_duplicate():
     
     try:
         # ID 중복 확인
-        result = supabase.table('students').select('id').eq('student_id', student_id).execute()
-        
-        if result.data:
+        if students_repo.login_id_taken(student_id):
             return jsonify({'ok': False, 'available': False, 'message': '이미 사용 중인 ID입니다.'})
         else:
             return jsonify({'ok': True, 'available': True, 'message': '사용 가능한 ID입니다.'})
@@ -496,34 +198,8 @@ def api_student_booth_list():
     student_id = data.get('student_id')
     
     try:
-        # 모든 활성 부스 조회
-        booths_result = supabase.table('booths').select('*').eq('is_active', True).order('created_at', desc=True).execute()
-        
-        booths = []
-        if booths_result.data:
-            for booth in booths_result.data:
-                # 각 부스의 대기열 수 계산
-                queue_result = supabase.table('queue_entries').select('id').eq('booth_id', booth['id']).eq('status', 'waiting').execute()
-                queue_count = len(queue_result.data) if queue_result.data else 0
-                
-                # 해당 학생의 이 부스에 대한 대기신청 상태 확인
-                application_status = None
-                if student_id:
-                    student_queue_result = supabase.table('queue_entries').select('status').eq('booth_id', booth['id']).eq('student_id', student_id).in_('status', ['waiting', 'called']).execute()
-                    if student_queue_result.data:
-                        application_status = student_queue_result.data[0]['status']
-                
-                booth_data = {
-                    'id': booth['id'],
-                    'name': booth['name'],
-                    'location': booth['location'],
-                    'description': booth['description'],
-                    'pdf_file_path': booth['pdf_file_path'],
-                    'queue_count': queue_count,
-                    'created_at': booth['created_at'],
-                    'application_status': application_status  # 추가: 'waiting', 'called', 또는 None
-                }
-                booths.append(booth_data)
+        # 활성 부스 목록 + 대기 인원 + 신청 상태 (부스 수와 무관하게 3회 조회)
+        booths = build_student_booth_list(student_id)
         
         return jsonify({'ok': True, 'booths': booths})
         
@@ -545,33 +221,29 @@ def api_apply_to_queue():
         return jsonify({'ok': False, 'message': '부스 ID와 학생 ID가 필요합니다.'})
     
     try:
-        # 중복 신청 확인
-        existing_queue = supabase.table('queue_entries').select('*').eq('booth_id', booth_id).eq('student_id', student_id).in_('status', ['waiting', 'called']).execute()
-        
-        if existing_queue.data:
+        # 메모리 대기열에 진행 중인 신청이 있으면 DB 호출 없이 바로 응답
+        if queue_engine.has_active_entry(booth_id, student_id):
             return jsonify({'ok': False, 'message': '이미 해당 부스에 대기 신청하셨습니다.'})
         
-        # 현재 대기열 최대 순번 조회
-        max_position_result = supabase.table('queue_entries').select('queue_position').eq('booth_id', booth_id).order('queue_position', desc=True).limit(1).execute()
+        # 중복 확인 + 순번 할당 + 삽입을 DB 함수 한 번으로 원자적으로 처리
+        admission = queue_repo.apply(booth_id, student_id)
+        if not admission:
+            return jsonify({'ok': False, 'message': '대기 신청에 실패했습니다.'})
         
-        next_position = 1
-        if max_position_result.data:
-            next_position = max_position_result.data[0]['queue_position'] + 1
+        if admission.get('duplicate'):
+            return jsonify({'ok': False, 'message': '이미 해당 부스에 대기 신청하셨습니다.'})
         
-        # 대기열 엔트리 생성
-        queue_data = {
-            'student_id': student_id,
-            'booth_id': booth_id,
-            'queue_position': next_position,
-            'status': 'waiting'
+        new_entry = {
+            'id': admission['entry_id'],
+            'booth_id': int(booth_id),
+            'student_id': int(student_id),
+            'status': 'waiting',
+            'queue_position': admission['queue_position']
         }
+        queue_engine.add_entry(new_entry)
+        publish_queue_change('applied', [new_entry])
         
-        result = supabase.table('queue_entries').insert(queue_data).execute()
-        
-        if result.data:
-            return jsonify({'ok': True, 'message': '대기 신청이 완료되었습니다.', 'queue_position': next_position})
-        else:
-            return jsonify({'ok': False, 'message': '대기 신청에 실패했습니다.'})
+        return jsonify({'ok': True, 'message': '대기 신청이 완료되었습니다.', 'queue_position': admission['queue_position']})
             
     except Exception as e:
         return jsonify({'ok': False, 'message': f'대기 신청 중 오류: {str(e)}'})
@@ -590,16 +262,21 @@ def api_my_queue():
         return jsonify({'ok': False, 'message': '학생 ID가 필요합니다.'})
     
     try:
-        # 학생의 대기열 조회 (부스 정보 포함)
-        result = supabase.table('queue_entries').select('''
-            *, 
-            booths!inner(name, location, description)
-        ''').eq('student_id', student_id).order('applied_at', desc=True).execute()
+        # 학생의 대기열 조회 (부스 정보 포함, 메모리 대기열 엔진에서 응답)
+        entries = queue_engine.student_entries(student_id)
         
         queue = []
-        if result.data:
-            for entry in result.data:
+        if entries:
+            for entry in entries:
                 booth = entry['booths']
+                
+                # 대기 중인 신청만 예상 대기 시간 계산
+                eta = {'estimated_wait_minutes': None, 'estimated_wait_p90_minutes': None}
+                if entry['status'] == 'waiting':
+                    ahead = queue_engine.waiting_ahead(entry['booth_id'], entry['id'])
+                    if ahead is not None:
+                        eta = wait_estimator.estimate(entry['booth_id'], ahead, booth_concurrency(booth))
+                
                 queue.append({
                     'id': entry['id'],
                     'booth_name': booth['name'],
@@ -609,7 +286,8 @@ def api_my_queue():
                     'status': entry['status'],
                     'applied_at': entry['applied_at'],
                     'called_at': entry['called_at'],
-                    'completed_at': entry['completed_at']
+                    'completed_at': entry['completed_at'],
+                    **eta
                 })
         
         return jsonify({'ok': True, 'queue': queue})
@@ -617,6 +295,14 @@ def api_my_queue():
     except Exception as e:
         return jsonify({'ok': False, 'message': f'대기신청 목록 조회 중 오류: {str(e)}'})
 
+# --- 내 대기신청 실시간 수신 (Server-Sent Events) ---
+@student_bp.route('/api/my-queue/stream/<int:student_id>')
+def api_my_queue_stream(student_id):
+    # 로그인한 본인의 대기열만 구독 가능
+    if session.get('student_id') != student_id:
+        return jsonify({'ok': False, 'message': 'Unauthorized'}), 401
+    return sse_response(student_channel(student_id))
+
 # --- 대기 취소 API ---
 @student_bp.route('/api/cancel-queue', methods=['POST'])
 def api_cancel_queue():
@@ -632,9 +318,10 @@ def api_cancel_queue():
     
     try:
         # 대기열 엔트리 삭제
-        result = supabase.table('queue_entries').delete().eq('id', entry_id).execute()
+        deleted_entries = queue_engine.delete_entry(entry_id)
         
-        if result.data:
+        if deleted_entries:
+            publish_queue_change('cancelled', deleted_entries)
             return jsonify({'ok': True, 'message': '대기 신청이 취소되었습니다.'})
         else:
             return jsonify({'ok': False, 'message': '대기 취소에 실패했습니다.'})
@@ -651,7 +338,7 @@ def checkin():
         if not supabase:
             return jsonify({'result': 'error', 'message': 'Supabase not configured'}), 500
         data = request.get_json()
-        # 데이터를 Supabase에 저장
+        # 로컬 체크인 로그에 기록 (Supabase 저장은 백그라운드 전송 스레드가 처리)
         checkin_data = {
             'school': data['school'],
             'grade': int(data['grade']),
@@ -661,8 +348,7 @@ def checkin():
             'booth': data['booth'],
             'comment': data['comment']
         }
-        result = supabase.table('checkins').insert(checkin_data).execute()
-        if result.data:
+        if record_checkin(checkin_data, data.get('idempotency_key')):
             return jsonify({'result': 'success'})
         else:
             return jsonify({'result': 'error', 'message': 'Failed to save data'}), 500
@@ -691,43 +377,26 @@ def api_student_records():
         return jsonify({'ok': False, 'message': 'Supabase not configured'}), 500
     
     data = request.get_json()
-    school = data['school']
-    grade = data['grade']
-    class_ = data['class']
-    number = data['number']
-    name = data['name']
     
     # Supabase에서 해당 학생의 모든 활동 내역 조회
-    result = supabase.table('checkins').select('id, booth, comment, created_at').eq('school', school).eq('grade', int(grade)).eq('class', int(class_)).eq('number', int(number)).eq('name', name).order('created_at', desc=True).execute()
-    
-    records = []
-    booth_set = set()
-    
-    if result.data:
-        for record in result.data:
-            records.append({
-                'id': record['id'],
-                'booth': record['booth'],
-                'comment': record['comment'],
-                'created_at': record['created_at']
-            })
-            booth_set.add(record['booth'])
+    records = checkins_repo.for_student(data, columns='id, booth, comment, created_at')
+    booth_set = {record['booth'] for record in records}
     
     booth_count = len(booth_set)
-    can_get_certificate = booth_count >= 3
+    min_booth_count = get_min_booth_count()
+    can_get_certificate = booth_count >= min_booth_count
     
     # 이미 발급된 확인증이 있는지 확인
     certificate_number = None
     if can_get_certificate:
-        existing_cert = supabase.table('certificates').select('certificate_number').eq('school', school).eq('grade', int(grade)).eq('class', int(class_)).eq('number', int(number)).eq('name', name).execute()
-        if existing_cert.data:
-            certificate_number = existing_cert.data[0]['certificate_number']
+        certificate_number = certificates_repo.number_for(data)
     
     return jsonify({
         'ok': True,
         'records': records,
         'booth_count': booth_count,
         'can_get_certificate': can_get_certificate,
+        'min_booth_count': min_booth_count,
         'certificate_number': certificate_number
     })
 
@@ -738,50 +407,14 @@ def api_certificate():
     if not supabase:
         return jsonify({'ok': False, 'message': 'Supabase not configured'}), 500
     data = request.get_json()
-    school = data['school']
-    grade = data['grade']
-    class_ = data['class']
-    number = data['number']
-    name = data['name']
     
     # Supabase에서 해당 학생의 활동 내역 조회 (부스별 최신 소감 포함)
-    result = supabase.table('checkins').select('booth, comment, created_at').eq('school', school).eq('grade', int(grade)).eq('class', int(class_)).eq('number', int(number)).eq('name', name).order('created_at', desc=True).execute()
-    
-    booth_records = {}
-    if result.data:
-        for record in result.data:
-            booth_name = record['booth']
-            # 부스별로 가장 최신 기록만 저장
-            if booth_name not in booth_records:
-                booth_records[booth_name] = {
-                    'comment': record['comment'],
-                    'created_at': record['created_at']
-                }
+    booth_records = student_activity_repo.booth_records(data)
     
     booth_count = len(booth_records)
-    if booth_count >= 3:
-        # 이미 발급된 인증서가 있는지 확인
-        existing_cert = supabase.table('certificates').select('certificate_number').eq('school', school).eq('grade', int(grade)).eq('class', int(class_)).eq('number', int(number)).eq('name', name).execute()
-        
-        if existing_cert.data:
-            # 기존 인증서 있음
-            cert_id = existing_cert.data[0]['certificate_number']
-        else:
-            # 새 인증서 발급
-            cert_id = generate_certificate_number()
-            booth_names = list(booth_records.keys())
-            
-            # 인증서 테이블에 저장
-            supabase.table('certificates').insert({
-                'certificate_number': cert_id,
-                'school': school,
-                'grade': int(grade),
-                'class': int(class_),
-                'number': int(number),
-                'name': name,
-                'booth_names': booth_names,
-                'booth_count': booth_count
-            }).execute()
+    if booth_count >= get_min_booth_count():
+        # 이미 발급된 인증서가 있으면 그 번호를, 없으면 새로 발급
+        cert_id = get_or_issue_certificate(data, booth_records)
         
         return jsonify({
             'ok': True, 
@@ -801,64 +434,55 @@ def api_generate_certificate_pdf():
         return jsonify({'error': 'Supabase not configured'}), 500
     
     data = request.get_json()
-    school = data['school']
-    grade = data['grade']
-    class_ = data['class']
-    number = data['number']
-    name = data['name']
     
     try:
         # 학생의 활동 내역 조회 (부스별 최신 소감 포함)
-        result = supabase.table('checkins').select('booth, comment, created_at').eq('school', school).eq('grade', int(grade)).eq('class', int(class_)).eq('number', int(number)).eq('name', name).order('created_at', desc=True).execute()
-        
-        booth_records = {}
-        if result.data:
-            for record in result.data:
-                booth_name = record['booth']
-                # 부스별로 가장 최신 기록만 저장
-                if booth_name not in booth_records:
-                    booth_records[booth_name] = {
-                        'comment': record['comment'],
-                        'created_at': record['created_at']
-                    }
+        booth_records = student_activity_repo.booth_records(data)
         
         booth_count = len(booth_records)
-        if booth_count < 3:
-            return jsonify({'error': f'체험 부스가 부족합니다. (현재 {booth_count}개, 최소 3개 필요)'}), 400
+        min_booth_count = get_min_booth_count()
+        if booth_count < min_booth_count:
+            return jsonify({'error': f'체험 부스가 부족합니다. (현재 {booth_count}개, 최소 {min_booth_count}개 필요)'}), 400
         
-        # 이미 발급된 인증서 확인
-        existing_cert = supabase.table('certificates').select('certificate_number').eq('school', school).eq('grade', int(grade)).eq('class', int(class_)).eq('number', int(number)).eq('name', name).execute()
+        # 이미 발급된 인증서가 있으면 그 번호를, 없으면 새로 발급
+        cert_id = get_or_issue_certificate(data, booth_records)
         
-        if existing_cert.data:
-            cert_id = existing_cert.data[0]['certificate_number']
-        else:
-            # 새 인증서 발급
-            cert_id = generate_certificate_number()
-            booth_names = list(booth_records.keys())
-            
-            # 인증서 테이블에 저장
-            supabase.table('certificates').insert({
-                'certificate_number': cert_id,
-                'school': school,
-                'grade': int(grade),
-                'class': int(class_),
-                'number': int(number),
-                'name': name,
-                'booth_names': booth_names,
-                'booth_count': booth_count
-            }).execute()
+        # PDF는 확인증 번호별 GET 주소에서 내려받음 (브라우저 캐시 + If-None-Match → 304)
+        return redirect(certificate_pdf_url(cert_id), code=303)
+        
+    except Exception as e:
+        print(f"PDF 생성 중 오류: {str(e)}")
+        return jsonify({'error': f'PDF 생성 중 오류: {str(e)}'}), 500
+
+def certificate_pdf_url(cert_id):
+    """확인증 PDF GET 다운로드 주소 (서명 포함)"""
+    return url_for('student.download_certificate_pdf', certificate_number=cert_id, token=certificate_download_token(cert_id))
+
+# --- 확인증 PDF 다운로드 (GET, 확인증 번호별) ---
+@student_bp.route('/certificate/<certificate_number>.pdf')
+def download_certificate_pdf(certificate_number):
+    if not get_student_supabase():
+        return jsonify({'error': 'Supabase not configured'}), 500
+    if not verify_certificate_download_token(certificate_number, request.args.get('token')):
+        return jsonify({'error': '잘못된 다운로드 주소입니다.'}), 403
+    
+    try:
+        certificate_info = certificates_repo.get_by_number(certificate_number)
+        if not certificate_info:
+            return jsonify({'error': '확인증을 찾을 수 없습니다.'}), 404
         
-        # 현재 행사명 가져오기
-        event_name = get_event_name()
+        # 학생의 활동 내역 조회 (부스별 최신 소감 포함)
+        booth_records = student_activity_repo.booth_records(certificate_info)
         
-        # PDF 생성
-        pdf_buffer = generate_certificate_pdf(data, booth_records, cert_id, event_name)
+        # PDF 생성 (입력값이 같으면 캐시된 PDF 재사용, 같은 ETag면 304)
+        etag, pdf_bytes = get_certificate_pdf(certificate_info, booth_records, certificate_number, get_event_name())
         
         return send_file(
-            pdf_buffer,
+            BytesIO(pdf_bytes),
             mimetype='application/pdf',
             as_attachment=True,
-            download_name=f'{name}_활동확인서.pdf'
+            download_name=f'{certificate_info["name"]}_활동확인서.pdf',
+            etag=etag
         )
         
     except Exception as e:
@@ -877,12 +501,8 @@ def api_update_comment():
     new_comment = data['comment']
     
     try:
-        # 체크인 기록의 소감 업데이트
-        result = supabase.table('checkins').update({
-            'comment': new_comment
-        }).eq('id', record_id).execute()
-        
-        if result.data:
+        # 체크인 기록의 소감 업데이트 (캐시된 확인증 PDF는 변경 hook에서 폐기)
+        if checkins_repo.update_comment(record_id, new_comment):
             return jsonify({'ok': True, 'message': '소감이 수정되었습니다.'})
         else:
             return jsonify({'ok': False, 'message': '기록을 찾을 수 없습니다.'})
@@ -901,9 +521,7 @@ def api_delete_record():
     
     try:
         # 체크인 기록 삭제
-        result = supabase.table('checkins').delete().eq('id', record_id).execute()
-        
-        if result.data:
+        if checkins_repo.delete(record_id):
             return jsonify({'ok': True, 'message': '기록이 삭제되었습니다.'})
         else:
             return jsonify({'ok': False, 'message': '기록을 찾을 수 없습니다.'})
@@ -931,10 +549,10 @@ def api_add_record():
             'comment': data['comment']
         }
         
-        result = supabase.table('checkins').insert(checkin_data).execute()
+        inserted = checkins_repo.insert(checkin_data)
         
-        if result.data:
-            return jsonify({'ok': True, 'message': '새 기록이 추가되었습니다.', 'record': result.data[0]})
+        if inserted:
+            return jsonify({'ok': True, 'message': '새 기록이 추가되었습니다.', 'record': inserted[0]})
         else:
             return jsonify({'ok': False, 'message': '기록 추가에 실패했습니다.'})
     except Exception as e:
@@ -957,39 +575,36 @@ def api_call_student():
     
     try:
         # 대기열 엔트리 조회
-        entry_result = supabase.table('queue_entries').select('''
-            *, 
-            students!inner(name, phone),
-            booths!inner(name, location)
-        ''').eq('id', entry_id).execute()
+        entry = queue_engine.get_entry(entry_id)
         
-        if not entry_result.data:
+        if not entry:
             return jsonify({'ok': False, 'message': '대기열 엔트리를 찾을 수 없습니다.'})
         
-        entry = entry_result.data[0]
         student = entry['students']
         booth = entry['booths']
         
         # 상태를 'called'로 업데이트
-        update_result = supabase.table('queue_entries').update({
+        updated_entries = queue_engine.update_entry(entry_id, {
             'status': 'called',
-            'called_at': 'now()'
-        }).eq('id', entry_id).execute()
+            'called_at': datetime.now().isoformat()
+        })
         
-        if update_result.data:
+        if updated_entries:
+            publish_queue_change('called', updated_entries)
+            
             # SMS 알림 발송
             message = f"[{booth['name']}] 참가하실 시간입니다. {booth['location']}로 3분 내 방문해 주세요."
             
-            # SOLAPI를 통한 실제 SMS 발송
-            sms_success = send_sms_notification(
+            # 발송은 백그라운드에서 처리 (SMS 서버 응답을 기다리지 않음)
+            sms_queued = enqueue_sms(
                 phone_number=student['phone'],
                 message=message,
                 booth_id=entry['booth_id'],
                 student_id=entry['student_id']
             )
             
-            if sms_success:
-                return jsonify({'ok': True, 'message': '학생이 호출되었고 SMS가 발송되었습니다.'})
+            if sms_queued:
+                return jsonify({'ok': True, 'message': '학생이 호출되었고 SMS 발송이 예약되었습니다.'})
             else:
                 return jsonify({'ok': True, 'message': '학생이 호출되었지만 SMS 발송에 실패했습니다.'})
         else:
@@ -1013,12 +628,15 @@ def api_complete_student():
     
     try:
         # 상태를 'completed'로 업데이트
-        result = supabase.table('queue_entries').update({
+        updated_entries = queue_engine.update_entry(entry_id, {
             'status': 'completed',
-            'completed_at': 'now()'
-        }).eq('id', entry_id).execute()
+            'completed_at': datetime.now().isoformat()
+        })
         
-        if result.data:
+        if updated_entries:
+            wait_estimator.record_completions(updated_entries)
+            publish_queue_change('completed', updated_entries)
+            auto_call_scheduler.notify()
             return jsonify({'ok': True, 'message': '학생이 완료 처리되었습니다.'})
         else:
             return jsonify({'ok': False, 'message': '완료 처리에 실패했습니다.'})
@@ -4,9 +4,8 @@
 이 파일은 app.py에서 추출한 유틸리티 함수들을 포함합니다:
 - 파일 처리 관련 함수
 - SMS 발송 기능
-- 인증서 생성
 - 암호화 및 보안
-- QR 코드 생성
+- QR 코드 라벨 그리기
 - 데이터 포맷팅 함수들
 """
 
@@ -15,19 +14,9 @@ import base64
 import hashlib
 import uuid
 import math
+import threading
 from datetime import datetime, timedelta
-from io import BytesIO
-import qrcode
 from PIL import Image, ImageDraw, ImageFont
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch, mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image as RLImage, Table, TableStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 from werkzeug.utils import secure_filename
 from app.db import get_solapi, get_supabase
 from app.config import Config
@@ -70,6 +59,33 @@ def format_phone_number(phone_number):
         print(f"전화번호 포맷팅 중 오류: {e}")
         return phone_number
 
+def deliver_sms(phone_number, message):
+    """SOLAPI로 SMS 1건 발송 (실패 시 예외 발생, 로그 저장 없음)"""
+    message_obj = RequestMessage(
+        from_=Config.SOLAPI_SENDER_PHONE,
+        to=format_phone_number(phone_number),
+        text=message
+    )
+    return get_solapi().send(message_obj)
+
+def deliver_sms_batch(messages):
+    """SOLAPI 1회 호출로 여러 SMS 발송 (messages: [(전화번호, 내용, 메시지 키)])
+
+    SDK의 send는 메시지 리스트를 받아 하나의 그룹으로 접수합니다 (구 send_many).
+    메시지 키는 custom_fields['key']로 실려 접수 실패 목록(failed_message_list)에 그대로 돌아오므로,
+    같은 번호로 보낸 메시지가 여러 건이어도 어느 메시지가 실패했는지 구분할 수 있습니다.
+    """
+    message_objs = [
+        RequestMessage(
+            from_=Config.SOLAPI_SENDER_PHONE,
+            to=format_phone_number(phone_number),
+            text=message,
+            custom_fields={'key': str(key)}
+        )
+        for phone_number, message, key in messages
+    ]
+    return get_solapi().send(message_objs)
+
 def send_sms_notification(phone_number, message, booth_id=None, student_id=None):
     """SMS 알림 발송"""
     try:
@@ -97,14 +113,8 @@ def send_sms_notification(phone_number, message, booth_id=None, student_id=None)
         
         formatted_phone = format_phone_number(phone_number)
         
-        message_obj = RequestMessage(
-            from_=Config.SOLAPI_SENDER_PHONE,
-            to=formatted_phone,
-            text=message
-        )
-        
         try:
-            response = solapi_service.send(message_obj)
+            response = deliver_sms(formatted_phone, message)
             print(f"✅ SMS 발송 성공: {formatted_phone}")
             
             if supabase:
@@ -148,214 +158,97 @@ def send_sms_notification(phone_number, message, booth_id=None, student_id=None)
         print(f"SMS 발송 중 예상치 못한 오류: {e}")
         return False
 
-def generate_qr_code(text, booth_name=None):
-    """QR 코드 생성"""
-    try:
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(text)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        if booth_name:
-            img = create_qr_with_text(img, booth_name)
-        
-        return img
-    except Exception as e:
-        print(f"QR 코드 생성 중 오류: {e}")
-        return None
+# QR 라벨용 한글 폰트 (크기별로 프로세스당 한 번만 로드)
+LABEL_FONT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fonts', 'NanumGothic.ttf')
+LABEL_FONT_SIZES = (28, 24, 20, 16)
+LABEL_MAX_LINES = 2
+LABEL_PADDING = 10
+
+_label_fonts = {}
+_label_font_lock = threading.Lock()
+
+def get_label_font(size):
+    """크기별 라벨 폰트 (폰트 파일이 없으면 기본 폰트, 한글은 표시되지 않음)"""
+    font = _label_fonts.get(size)
+    if font is not None:
+        return font
+
+    with _label_font_lock:
+        if size not in _label_fonts:
+            try:
+                _label_fonts[size] = ImageFont.truetype(LABEL_FONT_PATH, size)
+            except OSError as e:
+                print(f"라벨 폰트 로드 실패, 기본 폰트 사용: {e}")
+                _label_fonts[size] = ImageFont.load_default()
+        return _label_fonts[size]
+
+def wrap_label(text, font, max_width):
+    """max_width 안에 들어가도록 줄바꿈 (공백 우선, 공백 없는 긴 이름은 글자 단위)"""
+    lines = []
+    current = ''
+    for char in text:
+        candidate = current + char
+        if current and font.getlength(candidate) > max_width:
+            # 마지막 공백에서 끊을 수 있으면 단어를 다음 줄로 넘김
+            cut = current.rfind(' ')
+            if cut > 0 and char != ' ':
+                lines.append(current[:cut])
+                current = current[cut + 1:] + char
+            else:
+                lines.append(current.rstrip())
+                current = char.lstrip()
+        else:
+            current = candidate
+    if current:
+        lines.append(current)
+    return lines
+
+def layout_label(text, max_width):
+    """가장 큰 글자 크기부터 LABEL_MAX_LINES 줄 안에 들어가는 크기를 골라 (폰트, 줄 목록) 반환
+
+    가장 작은 크기에서도 넘치면 마지막 줄을 말줄임표로 자릅니다.
+    """
+    for size in LABEL_FONT_SIZES:
+        font = get_label_font(size)
+        lines = wrap_label(text, font, max_width)
+        if len(lines) <= LABEL_MAX_LINES:
+            return font, lines
+
+    lines = lines[:LABEL_MAX_LINES]
+    last = lines[-1]
+    while last and font.getlength(last + '…') > max_width:
+        last = last[:-1]
+    lines[-1] = last + '…'
+    return font, lines
 
 def create_qr_with_text(qr_img, booth_name):
-    """QR 코드에 텍스트 라벨 추가"""
+    """QR 코드 아래에 부스명 라벨 추가 (긴 이름은 글자 크기 축소/줄바꿈)"""
     try:
+        # qrcode의 PilImage 래퍼는 PIL 이미지로 변환 (최신 Pillow의 paste는 래퍼를 받지 않음)
+        if hasattr(qr_img, 'get_image'):
+            qr_img = qr_img.get_image()
         img_width, img_height = qr_img.size
-        new_height = img_height + 60
+        font, lines = layout_label(booth_name, img_width - 2 * LABEL_PADDING)
+        
+        # 한글/영문 대표 글자로 줄 높이 계산 (기본 폰트도 지원하는 getbbox 사용)
+        line_height = font.getbbox('가Ag')[3] + 6
+        new_height = img_height + LABEL_PADDING * 2 + line_height * len(lines)
         
         new_img = Image.new('RGB', (img_width, new_height), 'white')
         new_img.paste(qr_img, (0, 0))
         
         draw = ImageDraw.Draw(new_img)
-        
-        try:
-            font = ImageFont.truetype("arial.ttf", 16)
-        except:
-            font = ImageFont.load_default()
-        
-        text_width = draw.textlength(booth_name, font=font)
-        text_x = (img_width - text_width) // 2
-        text_y = img_height + 10
-        
-        draw.text((text_x, text_y), booth_name, fill='black', font=font)
+        text_y = img_height + LABEL_PADDING
+        for line in lines:
+            text_x = (img_width - font.getlength(line)) // 2
+            draw.text((text_x, text_y), line, fill='black', font=font)
+            text_y += line_height
         
         return new_img
     except Exception as e:
         print(f"QR 코드 텍스트 추가 중 오류: {e}")
         return qr_img
 
-def save_qr_code_file(booth_name, img):
-    """QR 코드 파일 저장"""
-    try:
-        qr_dir = 'static/qr_codes'
-        os.makedirs(qr_dir, exist_ok=True)
-        
-        safe_name = "".join(c for c in booth_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        qr_filename = f"{safe_name}_qr.png"
-        qr_path = os.path.join(qr_dir, qr_filename)
-        
-        img.save(qr_path)
-        return qr_path
-        
-    except Exception as e:
-        print(f"QR 코드 파일 저장 중 오류: {e}")
-        return None
-
-def generate_certificate_number():
-    """순차적 인증서 번호 생성 (대수페-25-XXXX 형식)"""
-    try:
-        supabase = get_supabase()
-        if not supabase:
-            return f"대수페-25-{datetime.now().strftime('%m%d%H%M')}"
-        
-        try:
-            result = supabase.table('certificates').select('certificate_number').order('id', desc=True).limit(1).execute()
-            
-            if result.data:
-                last_number = result.data[0]['certificate_number']
-                if last_number.startswith('대수페-25-'):
-                    try:
-                        last_num = int(last_number.split('-')[-1])
-                        new_num = last_num + 1
-                        return f"대수페-25-{new_num:04d}"
-                    except:
-                        return f"대수페-25-{datetime.now().strftime('%m%d%H%M')}"
-            
-            return "대수페-25-0001"
-            
-        except Exception as db_error:
-            print(f"인증서 번호 조회 실패: {db_error}")
-            return f"대수페-25-{datetime.now().strftime('%m%d%H%M')}"
-            
-    except Exception as e:
-        print(f"인증서 번호 생성 중 오류: {e}")
-        return f"대수페-25-{datetime.now().strftime('%m%d%H%M')}"
-
-def generate_certificate_pdf(student_info, booth_records, cert_id, event_name):
-    """PDF 인증서 생성"""
-    try:
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*inch, bottomMargin=1*inch)
-        
-        story = []
-        styles = getSampleStyleSheet()
-        
-        try:
-            pdfmetrics.registerFont(UnicodeCIDFont('HeiseiKakuGo-W5'))
-            korean_font = 'HeiseiKakuGo-W5'
-        except:
-            korean_font = 'Helvetica'
-        
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName=korean_font
-        )
-        
-        content_style = ParagraphStyle(
-            'CustomContent',
-            parent=styles['Normal'],
-            fontSize=14,
-            spaceAfter=12,
-            alignment=TA_LEFT,
-            fontName=korean_font
-        )
-        
-        center_style = ParagraphStyle(
-            'CustomCenter',
-            parent=styles['Normal'],
-            fontSize=16,
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            fontName=korean_font
-        )
-        
-        story.append(Paragraph(f"{event_name} 활동 확인증", title_style))
-        story.append(Spacer(1, 20))
-        
-        story.append(Paragraph(f"확인증 번호: {cert_id}", content_style))
-        story.append(Spacer(1, 10))
-        
-        story.append(Paragraph(f"학교: {student_info.get('school', '')}", content_style))
-        story.append(Paragraph(f"학년: {student_info.get('grade', '')}학년", content_style))
-        story.append(Paragraph(f"반: {student_info.get('class', '')}반", content_style))
-        story.append(Paragraph(f"번호: {student_info.get('number', '')}번", content_style))
-        story.append(Paragraph(f"이름: {student_info.get('name', '')}", content_style))
-        story.append(Spacer(1, 20))
-        
-        booth_names = [record.get('booth_name', '') for record in booth_records]
-        story.append(Paragraph(f"체험 부스: {', '.join(booth_names)}", content_style))
-        story.append(Paragraph(f"총 체험 부스 수: {len(booth_names)}개", content_style))
-        story.append(Spacer(1, 30))
-        
-        story.append(Paragraph("위 학생은 수학축제 부스 체험 활동을 성실히 이수하였음을 확인합니다.", center_style))
-        story.append(Spacer(1, 40))
-        
-        story.append(Paragraph(f"발급일: {datetime.now().strftime('%Y년 %m월 %d일')}", content_style))
-        story.append(Paragraph(f"{event_name} 운영위원회", content_style))
-        
-        doc.build(story)
-        
-        buffer.seek(0)
-        return buffer
-        
-    except Exception as e:
-        print(f"PDF 인증서 생성 중 오류: {e}")
-        return None
-
-def get_event_name():
-    """행사명 조회"""
-    try:
-        supabase = get_supabase()
-        if not supabase:
-            return "대구수학축제"
-        
-        result = supabase.table('settings').select('value').eq('key', 'event_name').execute()
-        
-        if result.data:
-            return result.data[0]['value']
-        else:
-            return "대구수학축제"
-            
-    except Exception as e:
-        print(f"행사명 조회 중 오류: {e}")
-        return "대구수학축제"
-
-def set_event_name(event_name):
-    """행사명 설정"""
-    try:
-        supabase = get_supabase()
-        if not supabase:
-            return False
-        
-        result = supabase.table('settings').upsert({
-            'key': 'event_name',
-            'value': event_name,
-            'description': '행사명'
-        }).execute()
-        
-        return True
-        
-    except Exception as e:
-        print(f"행사명 설정 중 오류: {e}")
-        return False
-
 def create_upload_directory(directory_path):
     """업로드 디렉토리 생성"""
     try:
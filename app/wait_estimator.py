@@ -0,0 +1,124 @@
+"""
+대구수학축제 부스 예약 및 관리 시스템 - 예상 대기 시간
+
+부스별 체험 소요 시간(호출 → 완료)을 최근 N건 기준으로 누적 집계하여
+대기 중인 학생의 예상 대기 시간을 계산합니다:
+- 완료 처리 시마다 해당 부스 집계만 갱신 (전체 기록 재조회 없음)
+- 평균과 90퍼센타일(p90)을 함께 제공
+- 기록이 없는 부스는 기본 소요 시간(Config.DEFAULT_SERVICE_MINUTES) 사용
+- 자동 호출 부스는 동시 호출 인원(auto_call_concurrency)만큼 나누어 계산
+"""
+
+import math
+import threading
+from collections import deque
+from datetime import datetime
+from app.config import Config
+
+# 부스별로 보관하는 최근 체험 기록 수
+SERVICE_WINDOW_SIZE = 50
+
+# 이보다 길거나 음수인 기록은 호출 후 방치 등으로 보고 제외 (초)
+MAX_SERVICE_SECONDS = 2 * 60 * 60
+
+def parse_timestamp(value):
+    """DB/메모리의 시각 값을 datetime으로 변환 (실패 시 None)"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+def service_seconds(entry):
+    """대기열 항목의 호출 → 완료 소요 시간 (초, 계산 불가 시 None)"""
+    called_at = parse_timestamp(entry.get('called_at'))
+    completed_at = parse_timestamp(entry.get('completed_at'))
+    if not called_at or not completed_at:
+        return None
+    if (called_at.tzinfo is None) != (completed_at.tzinfo is None):
+        called_at = called_at.replace(tzinfo=None)
+        completed_at = completed_at.replace(tzinfo=None)
+    seconds = (completed_at - called_at).total_seconds()
+    if seconds <= 0 or seconds > MAX_SERVICE_SECONDS:
+        return None
+    return seconds
+
+def booth_concurrency(booth):
+    """부스에서 동시에 체험하는 인원 (자동 호출 부스는 auto_call_concurrency, 그 외 1)"""
+    if not booth or not booth.get('auto_call_enabled'):
+        return 1
+    return max(1, booth.get('auto_call_concurrency') or 1)
+
+class BoothServiceStats:
+    """부스 하나의 최근 체험 소요 시간 (이동 평균)"""
+
+    def __init__(self):
+        self.samples = deque(maxlen=SERVICE_WINDOW_SIZE)
+        self.total = 0.0
+
+    def add(self, seconds):
+        if len(self.samples) == self.samples.maxlen:
+            self.total -= self.samples[0]
+        self.samples.append(seconds)
+        self.total += seconds
+
+    def mean(self):
+        return self.total / len(self.samples) if self.samples else None
+
+    def p90(self):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * 0.9) - 1)]
+
+class WaitTimeEstimator:
+    """부스별 체험 소요 시간 집계 및 예상 대기 시간 계산"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._booths = {}  # booth_id -> BoothServiceStats
+
+    def record(self, entry):
+        """완료된 대기열 항목 1건 반영"""
+        seconds = service_seconds(entry)
+        if seconds is None:
+            return
+        with self._lock:
+            stats = self._booths.get(entry['booth_id'])
+            if stats is None:
+                stats = self._booths[entry['booth_id']] = BoothServiceStats()
+            stats.add(seconds)
+
+    def record_completions(self, entries):
+        """완료 처리된 항목들 반영 (api_complete_student 이후 호출)"""
+        for entry in entries:
+            if entry.get('status') == 'completed':
+                self.record(entry)
+
+    def seed(self, completed_entries):
+        """시작 시 기존 완료 기록으로 초기화 (완료 시각 순)"""
+        for entry in sorted(completed_entries, key=lambda e: str(e.get('completed_at') or '')):
+            self.record(entry)
+
+    def service_time(self, booth_id):
+        """부스의 (평균, p90) 체험 소요 시간 (초)"""
+        default = Config.DEFAULT_SERVICE_MINUTES * 60
+        with self._lock:
+            stats = self._booths.get(booth_id)
+            if stats is None or not stats.samples:
+                return default, default
+            return stats.mean(), stats.p90()
+
+    def estimate(self, booth_id, ahead, concurrency=1):
+        """앞에 ahead명이 있을 때 예상 대기 시간 (분 단위, 평균/p90)"""
+        mean, p90 = self.service_time(booth_id)
+        slots = max(1, concurrency or 1)
+        return {
+            'estimated_wait_minutes': math.ceil(ahead * mean / slots / 60),
+            'estimated_wait_p90_minutes': math.ceil(ahead * p90 / slots / 60)
+        }
+
+wait_estimator = WaitTimeEstimator()
@@ -0,0 +1,88 @@
+// 관리자 목록 공용: 검색·정렬 조건으로 목록 API를 페이지 단위로 불러와 표에 이어 붙임
+// 목록 API 응답: { ok, items, next_cursor, total(첫 페이지만) }
+
+function escapeHtml(value) {
+    return String(value === null || value === undefined ? '' : value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
+
+// onclick="fn(${jsArgs(a, b)})" 처럼 HTML 속성 안에 넣을 함수 인자 목록
+function jsArgs(...args) {
+    return escapeHtml(JSON.stringify(args).slice(1, -1));
+}
+
+// options: url, tbody, renderRow(item), moreButton, totalLabel, emptyMessage, colspan, pageSize
+function createPagedList(options) {
+    const state = { params: {}, cursor: null, loading: false, done: false, generation: 0 };
+
+    function setMessage(message) {
+        options.tbody.innerHTML = `<tr><td colspan="${options.colspan || 1}" style="padding: 20px; text-align: center; color: #ccc;">${escapeHtml(message)}</td></tr>`;
+    }
+
+    async function load() {
+        if (state.loading || state.done) return;
+        state.loading = true;
+        const generation = state.generation;
+        if (options.moreButton) options.moreButton.disabled = true;
+
+        const query = new URLSearchParams();
+        Object.entries(state.params).forEach(([key, value]) => {
+            if (value !== '' && value !== null && value !== undefined) query.set(key, value);
+        });
+        query.set('limit', options.pageSize || 50);
+        if (state.cursor) query.set('cursor', state.cursor);
+
+        try {
+            const response = await fetch(`${options.url}?${query.toString()}`);
+            const data = await response.json();
+            if (generation !== state.generation) return;  // 그 사이 검색 조건이 바뀜
+            if (!data.ok) {
+                if (!state.cursor) setMessage(data.message || '목록을 불러오지 못했습니다.');
+                else alert(data.message || '목록을 불러오지 못했습니다.');
+                return;
+            }
+
+            if (!state.cursor) {
+                options.tbody.innerHTML = '';
+                if (options.totalLabel && data.total !== undefined) options.totalLabel.textContent = data.total;
+                if (!data.items.length) setMessage(options.emptyMessage || '항목이 없습니다.');
+            }
+            options.tbody.insertAdjacentHTML('beforeend', data.items.map(options.renderRow).join(''));
+
+            state.cursor = data.next_cursor;
+            state.done = !data.next_cursor;
+        } catch (error) {
+            console.error('Error:', error);
+            alert('목록을 불러오는 중 오류가 발생했습니다.');
+        } finally {
+            if (generation !== state.generation) return;
+            state.loading = false;
+            if (options.moreButton) {
+                options.moreButton.disabled = false;
+                options.moreButton.style.display = state.done ? 'none' : 'inline-block';
+            }
+        }
+    }
+
+    if (options.moreButton) options.moreButton.addEventListener('click', load);
+
+    return {
+        // 검색 조건(search 컬럼, sort, order)을 바꾸고 첫 페이지부터 다시 조회
+        search(params) {
+            state.params = params || {};
+            state.cursor = null;
+            state.done = false;
+            state.loading = false;
+            state.generation += 1;
+            return load();
+        },
+        reload() {
+            return this.search(state.params);
+        },
+        loadMore: load
+    };
+}
@@ -0,0 +1,12 @@
+import pytest
+
+import app.db
+from fake_supabase import FakeSupabase
+
+@pytest.fixture
+def fake_supabase(monkeypatch):
+    """app.db의 Supabase 클라이언트를 메모리 위의 가짜 클라이언트로 교체"""
+    client = FakeSupabase()
+    monkeypatch.setattr(app.db, 'supabase', client)
+    monkeypatch.setattr(app.db, 'SUPABASE_AVAILABLE', True)
+    return client
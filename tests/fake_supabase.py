@@ -0,0 +1,263 @@
+"""
+테스트용 가짜 Supabase 클라이언트
+
+앱이 쓰는 PostgREST 쿼리 빌더 일부(select/insert/update/upsert/delete, eq·in_·gt 등 필터,
+list_page()가 만드는 or_ 조건, order(nullsfirst)/limit/range, count='exact')와 rpc()를 메모리 위에서 흉내 냅니다.
+요청 하나(execute)는 클라이언트 잠금 안에서 원자적으로 처리되고, rpc 함수는
+register_function()으로 등록한 파이썬 함수가 같은 잠금 안에서 실행됩니다 (DB 함수 = 한 트랜잭션).
+"""
+
+import copy
+import json
+import bisect
+import threading
+
+class FakeResult:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+def _matches(row, column, op, value):
+    actual = row.get(column)
+    if op == 'eq':
+        return actual == value
+    if op == 'neq':
+        return actual != value
+    if op == 'in':
+        return actual in value
+    if op == 'is':
+        return actual is None if value in (None, 'null') else actual == value
+    if actual is None:
+        return False
+    if op == 'gt':
+        return actual > value
+    if op == 'gte':
+        return actual >= value
+    if op == 'lt':
+        return actual < value
+    if op == 'lte':
+        return actual <= value
+    raise NotImplementedError(op)
+
+def _row_matches(row, condition):
+    column, op, value = condition
+    if op == 'or':
+        return any(_term_matches(row, term) for term in _split_terms(value))
+    return _matches(row, column, op, value)
+
+def _split_terms(text):
+    """or_/and() 안의 조건을 최상위 쉼표 기준으로 나눔 (괄호·따옴표 안의 쉼표는 무시)"""
+    terms, depth, quoted, start = [], 0, False, 0
+    for i, char in enumerate(text):
+        if char == '"' and (i == 0 or text[i - 1] != '\\'):
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        elif not quoted and char == ',' and depth == 0:
+            terms.append(text[start:i])
+            start = i + 1
+    terms.append(text[start:])
+    return terms
+
+def _term_matches(row, term):
+    if term.startswith('and(') and term.endswith(')'):
+        return all(_term_matches(row, part) for part in _split_terms(term[4:-1]))
+    column, op, raw = term.split('.', 2)
+    if op == 'is':
+        return _matches(row, column, 'is', None if raw == 'null' else raw)
+    value = json.loads(raw)  # list_page()는 문자열을 JSON 따옴표로, 숫자는 그대로 표기
+    return _matches(row, column, op, value)
+
+def _sort_key(column, desc, nullsfirst):
+    # PostgreSQL 기본값: 오름차순은 NULL 맨 뒤, 내림차순은 NULL 맨 앞
+    if nullsfirst is None:
+        nullsfirst = desc
+    def key(row):
+        value = row.get(column)
+        return (value is None) != (nullsfirst != desc), value if value is not None else 0
+    return key
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.action = 'select'
+        self.payload = None
+        self.filters = []
+        self.orders = []
+        self.limit_count = None
+        self.row_range = None
+        self.count_mode = None
+        self.head = False
+
+    # --- 동작 ---
+
+    def select(self, columns='*', count=None, head=False):
+        self.count_mode = count
+        self.head = head
+        return self
+
+    def insert(self, data):
+        self.action, self.payload = 'insert', data
+        return self
+
+    def upsert(self, data):
+        self.action, self.payload = 'upsert', data
+        return self
+
+    def update(self, data):
+        self.action, self.payload = 'update', data
+        return self
+
+    def delete(self):
+        self.action = 'delete'
+        return self
+
+    # --- 필터 / 정렬 ---
+
+    def _filter(self, column, op, value):
+        self.filters.append((column, op, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, 'eq', value)
+
+    def neq(self, column, value):
+        return self._filter(column, 'neq', value)
+
+    def gt(self, column, value):
+        return self._filter(column, 'gt', value)
+
+    def gte(self, column, value):
+        return self._filter(column, 'gte', value)
+
+    def lt(self, column, value):
+        return self._filter(column, 'lt', value)
+
+    def lte(self, column, value):
+        return self._filter(column, 'lte', value)
+
+    def in_(self, column, values):
+        return self._filter(column, 'in', list(values))
+
+    def is_(self, column, value):
+        return self._filter(column, 'is', value)
+
+    def filter(self, column, op, value):
+        return self._filter(column, op, value)
+
+    def or_(self, filters):
+        return self._filter(None, 'or', filters)
+
+    def order(self, column, desc=False, nullsfirst=None):
+        self.orders.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, count):
+        self.limit_count = count
+        return self
+
+    def range(self, start, end):
+        self.row_range = (start, end)
+        return self
+
+    # --- 실행 ---
+
+    def _selected(self, rows):
+        # id 오름차순 keyset(gt id)은 정렬된 id 목록에서 바로 시작 위치를 찾음 (대용량 테스트용)
+        start = 0
+        filters = self.filters
+        for column, op, value in filters:
+            if column == 'id' and op == 'gt':
+                start = self.client.first_index_after(self.table, value)
+                filters = [f for f in filters if f != (column, op, value)]
+                break
+
+        if self.orders == [('id', False, None)] and self.limit_count is not None and self.row_range is None and not filters:
+            return rows[start:start + self.limit_count]
+
+        selected = [row for row in rows[start:] if all(_row_matches(row, f) for f in filters)]
+        for column, desc, nullsfirst in reversed(self.orders):
+            selected.sort(key=_sort_key(column, desc, nullsfirst), reverse=desc)
+        if self.row_range:
+            selected = selected[self.row_range[0]:self.row_range[1] + 1]
+        if self.limit_count is not None:
+            selected = selected[:self.limit_count]
+        return selected
+
+    def execute(self):
+        self.client.requests += 1
+        with self.client.lock:
+            rows = self.client.tables.setdefault(self.table, [])
+            if self.action == 'select':
+                selected = self._selected(rows)
+                count = len(selected) if self.count_mode == 'exact' else None
+                return FakeResult([] if self.head else copy.deepcopy(selected), count)
+            if self.action in ('insert', 'upsert'):
+                payload = self.payload if isinstance(self.payload, list) else [self.payload]
+                return FakeResult([copy.deepcopy(self.client.insert_row(self.table, row)) for row in payload])
+            if self.action == 'update':
+                selected = [row for row in rows if all(_row_matches(row, f) for f in self.filters)]
+                for row in selected:
+                    row.update(self.payload)
+                return FakeResult(copy.deepcopy(selected))
+            if self.action == 'delete':
+                selected = [row for row in rows if all(_row_matches(row, f) for f in self.filters)]
+                for row in selected:
+                    self.client.delete_row(self.table, row)
+                return FakeResult(copy.deepcopy(selected))
+        raise NotImplementedError(self.action)
+
+class FakeRpc:
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        self.client.requests += 1
+        with self.client.lock:
+            return FakeResult(self.client.functions[self.name](self.client, self.params))
+
+class FakeSupabase:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.tables = {}
+        self.functions = {}
+        self._ids = {}
+        self._next_id = {}
+        self.requests = 0
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return FakeRpc(self, name, params)
+
+    def register_function(self, name, function):
+        """rpc(name) 호출 시 실행할 함수 등록: function(client, params) -> data"""
+        self.functions[name] = function
+
+    # --- 행 저장 (id 오름차순 유지) ---
+
+    def insert_row(self, table, row):
+        row = dict(row)
+        if row.get('id') is None:
+            row['id'] = self._next_id.get(table, 1)
+        self._next_id[table] = max(self._next_id.get(table, 1), row['id'] + 1)
+        self.tables.setdefault(table, []).append(row)
+        self._ids.setdefault(table, []).append(row['id'])
+        return row
+
+    def delete_row(self, table, row):
+        index = self.tables[table].index(row)
+        del self.tables[table][index]
+        del self._ids[table][index]
+
+    def first_index_after(self, table, row_id):
+        return bisect.bisect_right(self._ids.get(table, []), row_id)
+
+    def rows(self, table):
+        return self.tables.setdefault(table, [])
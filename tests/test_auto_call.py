@@ -0,0 +1,70 @@
+"""
+자동 호출 테스트: 시간 초과된 호출의 자리를 다시 쓰면 'no_show'로 처리되어 '호출됨' 항목이 쌓이지 않음
+"""
+
+from datetime import datetime, timedelta
+
+import app.auto_call as auto_call
+from app.queue_engine import QueueEngine
+
+def _called_at(minutes_ago):
+    return (datetime.now() - timedelta(minutes=minutes_ago)).isoformat()
+
+def _engine(fake_supabase, monkeypatch, entries):
+    fake_supabase.insert_row('booths', {'name': '부스1', 'location': '1층', 'description': '', 'is_active': True,
+                                        'auto_call_enabled': True, 'auto_call_concurrency': 2, 'no_show_timeout_minutes': 5})
+    for position, (status, called_at) in enumerate(entries, 1):
+        student = fake_supabase.insert_row('students', {'name': f'학생{position}', 'school': '대구중', 'grade': 1, 'class': 1, 'number': position, 'phone': ''})
+        fake_supabase.insert_row('queue_entries', {
+            'booth_id': 1, 'student_id': student['id'], 'status': status, 'queue_position': position,
+            'applied_at': '2025-10-18T10:00:00', 'called_at': called_at, 'completed_at': None
+        })
+    engine = QueueEngine()
+    assert engine.hydrate()
+    monkeypatch.setattr(auto_call, 'queue_engine', engine)
+    return engine
+
+def _statuses(engine):
+    return [entry['status'] for entry in engine.booth_entries(1)]
+
+def test_reused_timed_out_slot_is_marked_no_show(fake_supabase, monkeypatch):
+    engine = _engine(fake_supabase, monkeypatch, [
+        ('called', _called_at(10)), ('called', _called_at(1)), ('waiting', None), ('waiting', None)
+    ])
+
+    assert auto_call.auto_call_scheduler.run_once() == 1
+    assert _statuses(engine) == ['no_show', 'called', 'called', 'waiting']
+
+    # 남은 두 호출은 시간 안이므로 더 부르지 않음
+    assert auto_call.auto_call_scheduler.run_once() == 0
+    assert len(engine.called_entries(1)) == 2
+    # 미방문 처리도 엔진 쓰기 스레드를 거쳐 DB에 반영됨
+    assert 1 in engine.pending_entry_ids()
+
+def test_timed_out_calls_do_not_pile_up(fake_supabase, monkeypatch):
+    engine = _engine(fake_supabase, monkeypatch, [('waiting', None)] * 10)
+
+    for _ in range(4):
+        auto_call.auto_call_scheduler.run_once()
+        # 호출된 학생이 모두 오지 않은 채 제한 시간이 지남
+        for entry in engine.called_entries(1):
+            engine.update_entry(entry['id'], {'called_at': _called_at(10)})
+
+    assert len(engine.called_entries(1)) == 2
+    assert _statuses(engine).count('no_show') == 6
+
+def test_timed_out_call_stays_when_nobody_is_waiting(fake_supabase, monkeypatch):
+    engine = _engine(fake_supabase, monkeypatch, [('called', _called_at(10)), ('called', _called_at(10))])
+
+    assert auto_call.auto_call_scheduler.run_once() == 0
+    assert _statuses(engine) == ['called', 'called']
+
+def test_called_entries_come_from_engine_memory(fake_supabase, monkeypatch):
+    engine = _engine(fake_supabase, monkeypatch, [('called', _called_at(3)), ('waiting', None)])
+    engine._students.clear()
+    requests = fake_supabase.requests
+
+    called = engine.called_entries(1)
+
+    assert [entry['queue_position'] for entry in called] == [1]
+    assert fake_supabase.requests == requests  # 학생/부스 정보 조회 없음
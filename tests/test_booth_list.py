@@ -0,0 +1,61 @@
+"""
+학생용 부스 목록 테스트: 부스 수와 무관하게 고정된 횟수의 쿼리로 응답
+"""
+
+from flask import Flask
+
+import app.queue_stats as queue_stats
+import app.student.routes as student_routes
+from app.queue_engine import QueueEngine
+
+def _seed(fake_supabase, booth_count):
+    for _ in range(booth_count):
+        booth = fake_supabase.insert_row('booths', {
+            'name': '부스', 'location': '1층', 'description': '', 'pdf_file_path': None,
+            'is_active': True, 'created_at': '2025-10-18T09:00:00'
+        })
+        booth_id = booth['id']
+        fake_supabase.insert_row('queue_entries', {
+            'booth_id': booth_id, 'student_id': 1, 'status': 'waiting' if booth_id % 2 else 'called', 'queue_position': 1,
+            'applied_at': '2025-10-18T10:00:00', 'called_at': None, 'completed_at': None
+        })
+        # queue_status_counts 뷰 (booth_id, status 별 GROUP BY)
+        fake_supabase.insert_row('queue_status_counts', {'booth_id': booth_id, 'status': 'waiting', 'entry_count': booth_id})
+
+def _booth_list(student_id):
+    app = Flask(__name__)
+    app.register_blueprint(student_routes.student_bp)
+    return app.test_client().post('/student/api/booth-list', json={'student_id': student_id}).get_json()
+
+def _requests_for(fake_supabase, student_id):
+    before = fake_supabase.requests
+    result = _booth_list(student_id)
+    assert result['ok'] is True
+    return result, fake_supabase.requests - before
+
+def test_booth_list_query_count_does_not_grow_with_booths(fake_supabase):
+    _seed(fake_supabase, 5)
+    _, small = _requests_for(fake_supabase, 1)
+
+    _seed(fake_supabase, 60)
+    result, large = _requests_for(fake_supabase, 1)
+
+    # 부스 조회 1회 + 대기 인원 집계 1회 + 학생 신청 상태 1회
+    assert small == large == 3
+    booths = {booth['id']: booth for booth in result['booths']}
+    assert booths[3]['queue_count'] == 3
+    assert (booths[3]['application_status'], booths[4]['application_status']) == ('waiting', 'called')
+
+def test_booth_list_uses_queue_engine_counts(fake_supabase, monkeypatch):
+    _seed(fake_supabase, 20)
+    engine = QueueEngine()
+    assert engine.hydrate()
+    monkeypatch.setattr(queue_stats, 'queue_engine', engine)
+
+    result, requests = _requests_for(fake_supabase, 1)
+
+    # 대기열 집계는 엔진 메모리에서, DB는 부스 조회 1회
+    assert requests == 1
+    booths = {booth['id']: booth for booth in result['booths']}
+    assert (booths[3]['queue_count'], booths[4]['queue_count']) == (1, 0)
+    assert (booths[3]['application_status'], booths[4]['application_status']) == ('waiting', 'called')
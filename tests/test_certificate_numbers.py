@@ -0,0 +1,129 @@
+"""
+확인증 번호 발급 동시성 테스트
+
+issue_certificates DB 함수는 가짜 클라이언트에서 같은 의미(카운터 행 잠금 → 미발급 학생만 번호 부여
+→ insert → 카운터 갱신, 실패 시 전체 롤백)로 흉내 내고, 여러 스레드가 겹치는 학생들에게
+동시에 발급해도 학생당 1건, 번호는 빈틈없이 이어지는지 확인합니다.
+일괄 발급 대상의 부스 소감이 개별 발급과 같은 순서(최신 체험 순)인지도 확인합니다.
+"""
+
+import random
+import threading
+import pytest
+
+from app.certificates import CERTIFICATE_PREFIX, get_or_issue_certificate, issue_certificate, student_cache_key
+from app.certificate_jobs import collect_eligible_students, issue_eligible_certificates
+
+STUDENT_COUNT = 60
+THREAD_COUNT = 16
+
+def _key(row):
+    return (row['school'], int(row['grade']), int(row['class']), int(row['number']), row['name'])
+
+def fake_issue_certificates(client, params):
+    """issue_certificates() DB 함수와 같은 동작 (client.lock 안에서 실행 = 한 트랜잭션)"""
+    if client.fail_next_issue:
+        client.fail_next_issue = False
+        raise RuntimeError('insert 실패 (롤백)')
+
+    prefix = params['p_prefix']
+    counters = client.rows('certificate_counters')
+    counter = next((row for row in counters if row['prefix'] == prefix), None)
+    if counter is None:
+        counter = client.insert_row('certificate_counters', {'prefix': prefix, 'last_value': 0})
+
+    issued_keys = {_key(cert) for cert in client.rows('certificates')}
+    pending = []
+    for row in params['p_rows']:
+        if _key(row) not in issued_keys:
+            issued_keys.add(_key(row))
+            pending.append(row)
+
+    for seq, row in enumerate(pending, start=1):
+        client.insert_row('certificates', dict(row, certificate_number=f"{prefix}-{counter['last_value'] + seq:04d}"))
+    counter['last_value'] += len(pending)
+
+    wanted = {_key(row) for row in params['p_rows']}
+    return {
+        'issued': len(pending),
+        'certificates': [dict(cert) for cert in client.rows('certificates') if _key(cert) in wanted]
+    }
+
+@pytest.fixture
+def certificate_db(fake_supabase):
+    fake_supabase.fail_next_issue = False
+    fake_supabase.register_function('issue_certificates', fake_issue_certificates)
+    return fake_supabase
+
+def _student(i):
+    return {'school': '대구중', 'grade': 1 + i % 3, 'class': 1 + i % 7, 'number': i, 'name': f'학생{i}'}
+
+def _booths(i):
+    return {f'부스{b}': {'comment': '재밌어요', 'created_at': f'2025-10-0{1 + b}T10:00:00'} for b in range(3 + i % 4)}
+
+def test_concurrent_issuance_is_unique_and_gap_free(certificate_db):
+    students = [_student(i) for i in range(STUDENT_COUNT)]
+    results = []
+    errors = []
+    start = threading.Barrier(THREAD_COUNT)
+
+    def worker(seed):
+        order = list(range(STUDENT_COUNT))
+        random.Random(seed).shuffle(order)
+        start.wait()
+        try:
+            if seed % 4 == 0:
+                # 일괄 발급 작업이 개별 발급과 동시에 실행되는 경우
+                items, _ = issue_eligible_certificates([{'student': students[i], 'booth_records': _booths(i)} for i in order])
+                results.extend((student_cache_key(item['student']), item['cert_id']) for item in items)
+            else:
+                for i in order:
+                    results.append((student_cache_key(students[i]), get_or_issue_certificate(students[i], _booths(i))))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(THREAD_COUNT)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    certificates = certificate_db.rows('certificates')
+    assert len(certificates) == STUDENT_COUNT
+    assert sorted(cert['certificate_number'] for cert in certificates) == [
+        f"{CERTIFICATE_PREFIX}-{n:04d}" for n in range(1, STUDENT_COUNT + 1)
+    ]
+
+    # 모든 스레드가 학생마다 같은 번호를 받음
+    by_student = {}
+    for key, number in results:
+        by_student.setdefault(key, set()).add(number)
+    assert all(len(numbers) == 1 for numbers in by_student.values())
+    assert len(by_student) == STUDENT_COUNT
+
+def test_failed_issue_does_not_burn_a_number(certificate_db):
+    certificate_db.fail_next_issue = True
+    with pytest.raises(RuntimeError):
+        issue_certificate(_student(1), _booths(1))
+
+    assert issue_certificate(_student(1), _booths(1)) == f"{CERTIFICATE_PREFIX}-0001"
+    assert issue_certificate(_student(2), _booths(2)) == f"{CERTIFICATE_PREFIX}-0002"
+
+def test_reissue_returns_existing_number(certificate_db):
+    first = issue_certificate(_student(5), _booths(5))
+    assert issue_certificate(_student(5), _booths(5)) == first
+    assert len(certificate_db.rows('certificates')) == 1
+
+def test_bulk_collection_orders_booths_by_recency(fake_supabase, monkeypatch):
+    monkeypatch.setattr('app.certificate_jobs.get_min_booth_count', lambda: 0)
+    # JSONB는 키 순으로 돌아옴 (가나다순) → 확인증에는 최신 체험 순으로 표시해야 함
+    fake_supabase.insert_row('student_activity', dict(_student(1), booth_count=3, booth_records={
+        '가부스': {'comment': '', 'created_at': '2025-10-18T09:00:00'},
+        '나부스': {'comment': '', 'created_at': '2025-10-18T11:00:00'},
+        '다부스': {'comment': '', 'created_at': '2025-10-18T10:00:00'}
+    }))
+
+    eligible = collect_eligible_students()
+
+    assert list(eligible[0]['booth_records']) == ['나부스', '다부스', '가부스']
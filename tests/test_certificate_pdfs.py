@@ -0,0 +1,54 @@
+"""
+확인증 PDF 렌더링 테스트: 캐시된 PDF와 새로 렌더링한 PDF의 소요 시간 비교, 발급일이 바뀌면 캐시 키도 바뀜
+"""
+
+import time
+from datetime import datetime
+
+import app.certificates as certificates
+from app.certificates import CertificatePdfCache, certificate_cache_key, get_certificate_pdf, get_certificate_renderer
+
+STUDENT = {'school': '대구중학교', 'grade': 2, 'class': 3, 'number': 14, 'name': '홍길동'}
+BOOTH_RECORDS = {f'수학 체험 부스 {i}': {'comment': '재미있었어요', 'created_at': '2025-10-18T10:00:00'} for i in range(8)}
+
+def _fixed_date(monkeypatch, year, month, day):
+    class FixedDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(year, month, day, 10, 0, 0)
+
+    monkeypatch.setattr(certificates, 'datetime', FixedDateTime)
+
+def test_cached_pdf_is_served_without_rendering(tmp_path, monkeypatch):
+    monkeypatch.setattr(certificates, 'certificate_pdf_cache', CertificatePdfCache(str(tmp_path)))
+    renderer = get_certificate_renderer()
+    renders = []
+    render = renderer.render
+    monkeypatch.setattr(renderer, 'render', lambda *args: renders.append(args) or render(*args))
+
+    started = time.perf_counter()
+    cold_key, cold_pdf = get_certificate_pdf(STUDENT, BOOTH_RECORDS, '대수페-25-0001', '대구수학축제')
+    cold = time.perf_counter() - started
+
+    started = time.perf_counter()
+    cached_key, cached_pdf = get_certificate_pdf(STUDENT, BOOTH_RECORDS, '대수페-25-0001', '대구수학축제')
+    cached = time.perf_counter() - started
+    print(f"확인증 PDF: 렌더링 {cold * 1000:.1f}ms, 캐시 {cached * 1000:.2f}ms")
+
+    assert len(renders) == 1
+    assert (cached_key, cached_pdf) == (cold_key, cold_pdf)
+    assert cold_pdf.startswith(b'%PDF')
+    assert cached < cold / 5
+
+    # 폰트·스타일·관인을 다시 읽지 않고 같은 렌더러를 재사용
+    assert get_certificate_renderer() is renderer
+
+def test_cache_key_changes_with_issue_date(monkeypatch):
+    seal_hash = get_certificate_renderer().seal_hash
+    _fixed_date(monkeypatch, 2025, 10, 18)
+    first_day = certificate_cache_key(STUDENT, BOOTH_RECORDS, '대수페-25-0001', '대구수학축제', seal_hash)
+    assert certificate_cache_key(STUDENT, BOOTH_RECORDS, '대수페-25-0001', '대구수학축제', seal_hash) == first_day
+
+    # 발급일이 PDF에 찍히므로 다음 날에는 다른 키 (전날 PDF를 다시 내주지 않음)
+    _fixed_date(monkeypatch, 2025, 10, 19)
+    assert certificate_cache_key(STUDENT, BOOTH_RECORDS, '대수페-25-0001', '대구수학축제', seal_hash) != first_day
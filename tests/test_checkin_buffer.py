@@ -0,0 +1,118 @@
+"""
+체크인 버퍼 테스트
+
+upsert_checkins DB 함수는 가짜 클라이언트에서 같은 의미(배치 안 중복 병합 → 두 유니크 키 모두
+충돌 시 건너뛰고 삽입 → 나머지는 기존 행의 소감 갱신)로 흉내 내고, 같은 체크인을 여러 번
+보내도(연타, 재시작 후 재전송, 직접 저장과 전송 스레드의 경합) DB에는 한 건만 남는지 확인합니다.
+"""
+
+import threading
+import pytest
+
+import app.checkin_buffer as buffer_module
+from app.checkin_buffer import CheckinBuffer, prepare_checkin, record_checkin
+from app.config import Config
+
+IDEMPOTENCY_KEY = '7b0c8f0e-6f47-4f8e-9a51-1b2f8f0d9c11'
+
+def fake_upsert_checkins(client, params):
+    """upsert_checkins() DB 함수와 같은 동작 (client.lock 안에서 실행 = 한 트랜잭션)"""
+    if client.reject_booth and any(row['booth'] == client.reject_booth for row in params['p_rows']):
+        raise RuntimeError('잘못된 부스')
+
+    latest = {}
+    for row in sorted(params['p_rows'], key=lambda row: row['created_at']):
+        latest[row['dedupe_key'] or row['ingest_id']] = row
+
+    inserted, updated = [], []
+    for row in latest.values():
+        existing = [c for c in client.rows('checkins')
+                    if c['ingest_id'] == row['ingest_id'] or (row['dedupe_key'] and c['dedupe_key'] == row['dedupe_key'])]
+        if existing:
+            for checkin in existing:
+                checkin['comment'] = row['comment']
+                updated.append(dict(checkin))
+        else:
+            inserted.append(dict(client.insert_row('checkins', row)))
+    return {'inserted': inserted, 'updated': updated}
+
+@pytest.fixture
+def checkin_db(fake_supabase, monkeypatch):
+    fake_supabase.reject_booth = None
+    fake_supabase.register_function('upsert_checkins', fake_upsert_checkins)
+    monkeypatch.setattr(Config, 'CHECKIN_BUFFER_ENABLED', True)
+    return fake_supabase
+
+@pytest.fixture
+def buffer(tmp_path, monkeypatch):
+    checkin_buffer = CheckinBuffer(str(tmp_path / 'checkin_buffer.sqlite3'))
+    monkeypatch.setattr(buffer_module, 'checkin_buffer', checkin_buffer)
+    return checkin_buffer
+
+def _checkin(comment='재밌어요', booth='부스1'):
+    return {'school': '대구중', 'grade': 1, 'class': 2, 'number': 3, 'name': '홍길동', 'booth': booth, 'comment': comment}
+
+def test_repeated_submissions_leave_one_row(checkin_db, buffer):
+    # 체크인 화면 연타 (같은 idempotency key)
+    record_checkin(_checkin('첫 소감'), IDEMPOTENCY_KEY)
+    record_checkin(_checkin('고친 소감'), IDEMPOTENCY_KEY)
+    assert buffer.flush() == (1, True)
+
+    # 재시작 후 같은 행을 다시 전송해도 새 행이 생기지 않음
+    buffer.append(prepare_checkin(_checkin('고친 소감'), IDEMPOTENCY_KEY))
+    assert buffer.flush() == (1, True)
+
+    rows = checkin_db.rows('checkins')
+    assert len(rows) == 1
+    assert rows[0]['comment'] == '고친 소감'
+    assert buffer.counts() == {'pending': 0, 'failed': 0}
+
+def test_direct_save_racing_the_flusher_keeps_one_row(checkin_db, buffer, monkeypatch):
+    monkeypatch.setattr(Config, 'CHECKIN_DEDUPE_WINDOW_MINUTES', 0)  # dedupe_key 없이 ingest_id만으로 구분
+    row = prepare_checkin(_checkin(), IDEMPOTENCY_KEY)
+    buffer.append(row)
+
+    errors = []
+    start = threading.Barrier(2)
+
+    def run(target):
+        start.wait()
+        try:
+            target()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=run, args=(buffer.flush,)),
+        threading.Thread(target=run, args=(lambda: buffer_module.checkins_repo.upsert_checkins([row]),))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(checkin_db.rows('checkins')) == 1
+
+def test_failed_rows_can_be_requeued(checkin_db, buffer, monkeypatch):
+    monkeypatch.setattr(buffer_module, 'ISOLATE_AFTER_ATTEMPTS', 1)
+    checkin_db.reject_booth = '없는부스'
+    record_checkin(_checkin(booth='부스1'))
+    record_checkin(_checkin(booth='없는부스'))
+
+    buffer.flush()
+    assert buffer.counts() == {'pending': 0, 'failed': 1}
+    assert buffer.failed_rows()[0]['checkin']['booth'] == '없는부스'
+
+    # 원인을 고친 뒤 다시 전송
+    checkin_db.reject_booth = None
+    assert buffer.requeue_failed() == 1
+    assert buffer.flush() == (1, True)
+    assert sorted(row['booth'] for row in checkin_db.rows('checkins')) == ['부스1', '없는부스']
+
+def test_without_a_volume_path_checkins_are_saved_directly(checkin_db, monkeypatch):
+    monkeypatch.setattr(buffer_module, 'checkin_buffer', CheckinBuffer(None))
+
+    assert record_checkin(_checkin())
+    assert len(checkin_db.rows('checkins')) == 1
+    assert buffer_module.checkin_buffer.counts() == {'pending': 0, 'failed': 0}
@@ -0,0 +1,91 @@
+"""
+행 수 집계 테스트: count()는 행 데이터 없이 개수만 받고, 관리자 현황/엑셀 요약이 count()를 사용
+"""
+
+import os
+import tempfile
+
+from flask import Flask
+
+import app.admin.routes as admin_routes
+import app.exports as exports
+from app.db import count
+
+def _record_queries(fake_supabase, monkeypatch):
+    queries = []
+    table = fake_supabase.table
+
+    def recording_table(name):
+        query = table(name)
+        execute = query.execute
+
+        def recording_execute():
+            query.result = execute()
+            return query.result
+
+        query.execute = recording_execute
+        queries.append(query)
+        return query
+
+    monkeypatch.setattr(fake_supabase, 'table', recording_table)
+    return queries
+
+def _count_spy(monkeypatch, module):
+    calls = []
+
+    def spy(table, **filters):
+        calls.append(table)
+        return count(table, **filters)
+
+    monkeypatch.setattr(module, 'count', spy)
+    return calls
+
+def test_count_requests_no_row_payload(fake_supabase, monkeypatch):
+    for i in range(30):
+        fake_supabase.insert_row('queue_entries', {'booth_id': 1 + i % 3, 'status': ('waiting', 'called', 'completed')[i % 3]})
+    queries = _record_queries(fake_supabase, monkeypatch)
+
+    assert count('queue_entries') == 30
+    assert count('queue_entries', booth_id=1) == 10
+    assert count('queue_entries', status=['waiting', 'called']) == 20
+
+    assert [(query.count_mode, query.head) for query in queries] == [('exact', True)] * 3
+    assert queries[2].filters == [('status', 'in', ['waiting', 'called'])]
+    # 개수는 count로만 받고 행은 전송하지 않음
+    assert [query.result.data for query in queries] == [[], [], []]
+
+def test_queue_status_api_counts_operators_without_fetching_them(fake_supabase, monkeypatch):
+    for i in range(25):
+        fake_supabase.insert_row('booth_operators', {'club_name': f'동아리{i}'})
+    fake_supabase.insert_row('booths', {'name': '부스1', 'location': '1층', 'booth_operators': None, 'created_at': '2025-10-18'})
+    calls = _count_spy(monkeypatch, admin_routes)
+    queries = _record_queries(fake_supabase, monkeypatch)
+    monkeypatch.setattr(admin_routes, 'SUPABASE_AVAILABLE', True)
+    monkeypatch.setattr(admin_routes, 'supabase', fake_supabase)
+
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.register_blueprint(admin_routes.admin_bp, url_prefix='/admin')
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['admin'] = True
+    result = client.get('/admin/api/queue-status').get_json()
+
+    assert result['stats']['total_operators'] == 25
+    assert calls == ['booth_operators']
+    operator_queries = [query for query in queries if query.table == 'booth_operators']
+    assert [(query.count_mode, query.head) for query in operator_queries] == [('exact', True)]
+
+def test_export_summary_uses_count(fake_supabase, monkeypatch):
+    for i in range(3):
+        fake_supabase.insert_row('booths', {'name': f'부스{i}', 'description': None, 'is_active': True, 'created_at': '2025-10-01', 'updated_at': '2025-10-01'})
+    calls = _count_spy(monkeypatch, exports)
+
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        exports.write_festival_workbook(path)
+    finally:
+        os.remove(path)
+
+    assert sorted(calls) == ['booths', 'certificates', 'students']
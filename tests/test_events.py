@@ -0,0 +1,24 @@
+"""
+대기열 실시간 알림(SSE) 테스트: 동시 스트림 한도와 구독 권한 확인
+"""
+
+from flask import Flask
+
+from app.config import Config
+from app.events import queue_event_broker, sse_response, booth_channel
+
+def test_streams_over_the_limit_are_refused(monkeypatch):
+    monkeypatch.setattr(Config, 'SSE_MAX_STREAMS', 2)
+    app = Flask(__name__)
+    responses = []
+    with app.test_request_context():
+        for _ in range(3):
+            responses.append(sse_response(booth_channel(1)))
+
+    assert [response.status_code for response in responses] == [200, 200, 503]
+    assert responses[2].get_json()['poll'] is True
+
+    # 연결이 닫히면 자리를 반환
+    for response in responses[:2]:
+        response.close()
+    assert queue_event_broker.subscriber_count() == 0
@@ -0,0 +1,61 @@
+"""
+엑셀 내보내기 테스트
+
+- 체크인 10만 건을 가짜 Supabase에 넣고 내보낸 파일에 모든 행이 정확히 한 번씩 있는지 확인
+- 페이지를 읽는 도중 행이 추가/삭제되어도 keyset 순회가 행을 반복하거나 건너뛰지 않는지 확인
+"""
+
+import os
+import tempfile
+from openpyxl import load_workbook
+
+from app.db import iter_rows
+from app.exports import write_festival_workbook
+
+CHECKIN_COUNT = 100_000
+
+def _checkin(i):
+    return {
+        'school': f'학교{i % 40}', 'grade': 1 + i % 3, 'class': 1 + i % 10, 'number': i % 30,
+        'name': f'학생{i % 5000}', 'booth': f'부스{i % 60}', 'comment': '재밌어요',
+        'created_at': f'2025-10-18T{9 + i % 8:02d}:{i % 60:02d}:00'
+    }
+
+def test_export_contains_every_checkin_once(fake_supabase):
+    for i in range(CHECKIN_COUNT):
+        fake_supabase.insert_row('checkins', _checkin(i))
+    fake_supabase.insert_row('booths', {
+        'name': '부스0', 'description': None, 'is_active': True, 'created_at': '2025-10-01', 'updated_at': '2025-10-01'
+    })
+
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        write_festival_workbook(path)
+        workbook = load_workbook(path, read_only=True)
+        ids = [row[0] for row in workbook['체크인기록'].iter_rows(min_row=2, values_only=True)]
+        summary = dict(workbook['요약통계'].iter_rows(min_row=2, values_only=True))
+        workbook.close()
+    finally:
+        os.remove(path)
+
+    assert len(ids) == CHECKIN_COUNT
+    assert sorted(ids) == list(range(1, CHECKIN_COUNT + 1))
+    assert summary['전체 체크인 횟수'] == CHECKIN_COUNT
+    assert summary['등록된 부스 수'] == 1
+
+def test_iter_rows_is_stable_while_rows_change(fake_supabase):
+    for i in range(250):
+        fake_supabase.insert_row('checkins', _checkin(i))
+
+    seen = []
+    for row in iter_rows(lambda: fake_supabase.table('checkins').select('*'), page_size=100):
+        seen.append(row['id'])
+        if len(seen) == 150:
+            # 이미 읽은 행 삭제 + 새 체크인 추가 (OFFSET 페이지였다면 다음 페이지가 한 칸 밀림)
+            fake_supabase.table('checkins').delete().eq('id', 10).execute()
+            fake_supabase.table('checkins').delete().eq('id', 20).execute()
+            fake_supabase.table('checkins').insert(_checkin(999)).execute()
+
+    assert len(seen) == len(set(seen))
+    assert seen == list(range(1, 252))
@@ -0,0 +1,42 @@
+"""
+관리자 목록 keyset 페이지 테스트: 정렬값이 비어 있는(NULL) 행도 빠짐없이 한 번씩 조회
+"""
+
+import pytest
+
+from app.repositories import student_activity_repo
+
+def _activity(fake_supabase, i, last_checkin_at):
+    return fake_supabase.insert_row('student_activity', {
+        'school': '대구중', 'grade': 1, 'class': 1, 'number': i, 'name': f'학생{i % 4}',
+        'booth_count': i % 3, 'last_checkin_at': last_checkin_at
+    })
+
+def _all_pages(**kwargs):
+    ids, cursor = [], None
+    while True:
+        rows, cursor = student_activity_repo.list_page(cursor=cursor, limit=3, **kwargs)
+        ids.extend(row['id'] for row in rows)
+        if not cursor:
+            return ids
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_null_sort_values_are_paged_last(fake_supabase, descending):
+    for i in range(10):
+        # 3명 중 1명은 체크인 기록 없음 (last_checkin_at NULL), 같은 시각도 섞음
+        _activity(fake_supabase, i, None if i % 3 == 0 else f'2025-10-18T10:0{i % 4}:00')
+
+    ids = _all_pages(sort='last_checkin_at', descending=descending)
+
+    assert sorted(ids) == list(range(1, 11))
+    null_ids = [row['id'] for row in fake_supabase.rows('student_activity') if row['last_checkin_at'] is None]
+    assert ids[-len(null_ids):] == (sorted(null_ids, reverse=descending))
+
+def test_string_sort_values_with_ties(fake_supabase):
+    for i in range(10):
+        _activity(fake_supabase, i, None)
+
+    ids = _all_pages(sort='name')
+
+    names = {row['id']: row['name'] for row in fake_supabase.rows('student_activity')}
+    assert ids == sorted(names, key=lambda row_id: (names[row_id], row_id))
@@ -0,0 +1,118 @@
+"""
+미방문 처리 테스트: 앱 시계 기준으로 만료, 다시 신청한 학생의 미방문 항목은 되돌리지 않음,
+대기열 엔진이 아직 DB에 반영하지 않은 항목은 미방문 처리/재대기하지 않음
+"""
+
+from datetime import datetime
+
+from flask import Flask
+
+import app.booth.routes as booth_routes
+import app.no_show as no_show
+from app.config import Config
+from app.no_show import no_show_sweeper
+from app.queue_engine import QueueEngine
+
+def test_sweeper_passes_the_app_clock(fake_supabase):
+    calls = []
+
+    def fake_expire(client, params):
+        calls.append(params)
+        return {'expired': [], 'requeued': []}
+
+    fake_supabase.register_function('expire_no_show_entries', fake_expire)
+    before = datetime.now()
+    no_show_sweeper.run_once()
+
+    assert len(calls) == 1
+    # called_at과 같은 naive 로컬 시각 (DB의 UTC NOW()와 비교하지 않음)
+    now = datetime.fromisoformat(calls[0]['p_now'])
+    assert now.tzinfo is None and before <= now <= datetime.now()
+
+def _revert(fake_supabase, monkeypatch, entry_id):
+    monkeypatch.setattr(booth_routes, 'SUPABASE_AVAILABLE', True)
+    app = Flask(__name__)
+    app.register_blueprint(booth_routes.booth_bp)
+    return app.test_client().post('/api/revert-student', json={'entry_id': entry_id}).get_json()
+
+def _entry(fake_supabase, status, position):
+    return fake_supabase.insert_row('queue_entries', {
+        'booth_id': 1, 'student_id': 7, 'status': status, 'queue_position': position,
+        'called_at': None, 'completed_at': None
+    })
+
+def test_revert_refuses_when_student_already_reapplied(fake_supabase, monkeypatch):
+    no_show = _entry(fake_supabase, 'no_show', 1)
+    _entry(fake_supabase, 'waiting', 2)
+
+    result = _revert(fake_supabase, monkeypatch, no_show['id'])
+
+    assert result['ok'] is False
+    assert [row['status'] for row in fake_supabase.rows('queue_entries')] == ['no_show', 'waiting']
+
+def test_revert_restores_no_show_without_active_entry(fake_supabase, monkeypatch):
+    no_show = _entry(fake_supabase, 'no_show', 1)
+
+    result = _revert(fake_supabase, monkeypatch, no_show['id'])
+
+    assert result['ok'] is True
+    assert fake_supabase.rows('queue_entries')[0]['status'] == 'waiting'
+
+def _expire_called(ignore_exclusions=False):
+    """expire_no_show_entries 흉내: 제외 목록에 없는 'called' 항목을 미방문 처리하고 맨 뒤에 재대기"""
+    def expire(client, params):
+        exclude = set() if ignore_exclusions else set(params['p_exclude_ids'])
+        rows = client.rows('queue_entries')
+        expired = [row for row in rows if row['status'] == 'called' and row['id'] not in exclude]
+        requeued = []
+        for row in expired:
+            row['status'] = 'no_show'
+            if params['p_requeue']:
+                position = max(other['queue_position'] for other in rows if other['booth_id'] == row['booth_id']) + 1
+                requeued.append(dict(client.insert_row('queue_entries', {
+                    'booth_id': row['booth_id'], 'student_id': row['student_id'], 'status': 'waiting',
+                    'queue_position': position, 'called_at': None, 'completed_at': None
+                })))
+        return {'expired': [dict(row) for row in expired], 'requeued': requeued}
+    return expire
+
+def _engine_with_called_entries(fake_supabase, monkeypatch):
+    monkeypatch.setattr(Config, 'NO_SHOW_REQUEUE', True)
+    for student_id in (7, 8):
+        fake_supabase.insert_row('queue_entries', {
+            'booth_id': 1, 'student_id': student_id, 'status': 'called', 'queue_position': student_id,
+            'applied_at': '2025-10-18T10:00:00', 'called_at': '2025-10-18T10:00:00', 'completed_at': None
+        })
+    engine = QueueEngine()
+    assert engine.hydrate()
+    monkeypatch.setattr(no_show, 'queue_engine', engine)
+    return engine
+
+def test_sweep_skips_entries_with_unflushed_engine_writes(fake_supabase, monkeypatch):
+    engine = _engine_with_called_entries(fake_supabase, monkeypatch)
+    fake_supabase.register_function('expire_no_show_entries', _expire_called())
+    # 메모리에서는 완료됐지만 쓰기 스레드가 아직 DB에 반영하지 않음
+    engine.update_entry(1, {'status': 'completed', 'completed_at': '2025-10-18T10:03:00'})
+
+    assert no_show_sweeper.run_once() == 1
+
+    db_rows = {row['id']: row for row in fake_supabase.rows('queue_entries')}
+    assert db_rows[1]['status'] == 'called'  # 쓰기 스레드가 'completed'로 반영할 항목은 건드리지 않음
+    assert [(row['student_id'], row['status']) for row in db_rows.values() if row['id'] > 2] == [(8, 'waiting')]
+    assert [entry['status'] for entry in engine.booth_entries(1)] == ['completed', 'no_show', 'waiting']
+
+def test_requeued_row_is_removed_when_entry_changed_after_the_snapshot(fake_supabase, monkeypatch):
+    engine = _engine_with_called_entries(fake_supabase, monkeypatch)
+    # 제외 목록을 만든 뒤 완료 처리된 경우: DB 함수는 두 항목 모두 미방문 처리하고 재대기 행을 추가
+    fake_supabase.register_function('expire_no_show_entries', _expire_called(ignore_exclusions=True))
+    engine.update_entry(1, {'status': 'completed', 'completed_at': '2025-10-18T10:03:00'})
+
+    assert no_show_sweeper.run_once() == 1
+
+    # 실제로 체험을 마친 학생 7의 재대기 행은 삭제되고, 학생 8만 다시 대기
+    waiting = [(row['student_id'], row['status']) for row in fake_supabase.rows('queue_entries') if row['status'] == 'waiting']
+    assert waiting == [(8, 'waiting')]
+    assert [entry['status'] for entry in engine.booth_entries(1)] == ['completed', 'no_show', 'waiting']
+    # 쓰기 스레드가 메모리 값('completed')으로 DB를 덮어씀
+    engine._write_next(0)
+    assert fake_supabase.rows('queue_entries')[0]['status'] == 'completed'
@@ -0,0 +1,84 @@
+"""
+QR 라벨 줄바꿈 테스트: 공백 우선 줄바꿈, 긴 이름의 글자 단위 줄바꿈, 글자 크기 축소와 말줄임표,
+캐시된 NanumGothic 폰트로 라벨 QR을 그리는 속도 (초당 렌더 수)
+"""
+
+import time
+import pytest
+import qrcode
+from PIL import ImageFont
+
+import app.utils as utils
+from app.utils import LABEL_FONT_SIZES, LABEL_MAX_LINES, layout_label, wrap_label
+
+class FixedWidthFont:
+    """글자마다 너비가 같은 테스트용 폰트 (size픽셀 크기 글자의 너비 = size)"""
+
+    def __init__(self, size):
+        self.size = size
+
+    def getlength(self, text):
+        return len(text) * self.size
+
+@pytest.fixture
+def fixed_fonts(monkeypatch):
+    monkeypatch.setattr(utils, 'get_label_font', FixedWidthFont)
+
+def test_wrap_prefers_spaces():
+    font = FixedWidthFont(10)
+    assert wrap_label('수학 탐구 동아리 부스', font, 60) == ['수학 탐구', '동아리 부스']
+
+def test_wrap_splits_long_words_by_character():
+    font = FixedWidthFont(10)
+    lines = wrap_label('가나다라마바사아자차카타', font, 50)
+    assert lines == ['가나다라마', '바사아자차', '카타']
+    assert all(font.getlength(line) <= 50 for line in lines)
+
+def test_short_label_keeps_the_largest_size(fixed_fonts):
+    font, lines = layout_label('수학 부스', 200)
+    assert font.size == LABEL_FONT_SIZES[0]
+    assert lines == ['수학 부스']
+
+def test_long_label_shrinks_before_wrapping_further(fixed_fonts):
+    text = '대구 수학 축제 체험 부스'  # 28px에서는 3줄, 24px에서는 2줄
+    font, lines = layout_label(text, 192)
+    assert font.size == 24
+    assert len(lines) <= LABEL_MAX_LINES
+    assert ''.join(lines).replace(' ', '') == text.replace(' ', '')
+
+def test_overflowing_label_is_truncated_with_ellipsis(fixed_fonts):
+    font, lines = layout_label('가' * 40, 100)
+    assert font.size == LABEL_FONT_SIZES[-1]
+    assert len(lines) == LABEL_MAX_LINES
+    assert lines[-1].endswith('…')
+    assert all(font.getlength(line) <= 100 for line in lines)
+
+def test_real_font_renders_long_booth_names_within_the_image():
+    qr_width = 290
+    font, lines = layout_label('대구광역시 수학문화관 창의융합 수학체험 부스 (3층 대강당 앞)', qr_width - 2 * utils.LABEL_PADDING)
+    assert len(lines) <= LABEL_MAX_LINES
+    assert all(font.getlength(line) <= qr_width - 2 * utils.LABEL_PADDING for line in lines)
+
+def test_labelled_qr_render_rate_with_cached_fonts(monkeypatch):
+    loads = []
+    truetype = ImageFont.truetype
+    monkeypatch.setattr(utils, '_label_fonts', {})
+    monkeypatch.setattr(ImageFont, 'truetype', lambda *args, **kwargs: loads.append(args) or truetype(*args, **kwargs))
+
+    qr_img = qrcode.make('https://example.com/checkin?booth=test', box_size=10, border=5)
+    names = ['수학 부스', '대구 수학 축제 체험 부스', '대구광역시 수학문화관 창의융합 수학체험 부스 (3층 대강당 앞)']
+    renders = 150
+
+    started = time.perf_counter()
+    for i in range(renders):
+        labelled = utils.create_qr_with_text(qr_img, names[i % len(names)])
+    elapsed = time.perf_counter() - started
+    rate = renders / elapsed
+    print(f"라벨 QR 렌더: 초당 {rate:.0f}개 ({renders}개, {elapsed:.2f}초)")
+
+    # 폰트는 크기별로 한 번만 로드 (렌더마다 다시 읽지 않음)
+    assert [args[0] for args in loads] == [utils.LABEL_FONT_PATH] * len(loads)
+    assert len(loads) <= len(LABEL_FONT_SIZES)
+    assert labelled.size[0] == qr_img.size[0] and labelled.size[1] > qr_img.size[1]
+    # 느린 CI에서도 넉넉한 하한 (로컬에서는 초당 수백 개)
+    assert rate > 20
@@ -0,0 +1,51 @@
+"""
+부스 QR 인쇄용 PDF 테스트: 부스당 한 페이지, 저장소에 없는 QR 이미지는 렌더링 후 저장소에 저장
+"""
+
+import re
+
+import pytest
+
+import app.qr_sheets as qr_sheets
+from app.config import Config
+from app.qr_assets import QrAssetStore, render_booth_qr
+
+def _page_count(pdf_bytes):
+    # reportlab은 페이지마다 "/Type /Page" 객체를 하나씩 씀 ("/Type /Pages"는 제외)
+    return len(re.findall(rb'/Type /Page(?![s\w])', pdf_bytes))
+
+@pytest.fixture
+def asset_store(tmp_path, monkeypatch):
+    store = QrAssetStore(str(tmp_path))
+    monkeypatch.setattr(qr_sheets, 'qr_assets', store)
+    return store
+
+def _booths(count):
+    return [{'name': f'수학 체험 부스 {i}', 'location': f'{1 + i % 3}층'} for i in range(count)]
+
+@pytest.mark.parametrize('booth_count', [5, qr_sheets.POOL_MIN_BOOTHS + 4])
+def test_sheet_has_one_page_per_booth_and_stores_missing_images(asset_store, monkeypatch, booth_count):
+    monkeypatch.setattr(Config, 'QR_SHEET_RENDER_WORKERS', 2)
+    booths = _booths(booth_count)
+    # 첫 부스는 이미 저장소에 있음 (다시 렌더링하지 않음)
+    stored = asset_store.put(booths[0]['name'], render_booth_qr(booths[0]['name'], Config.BASE_URL))
+    assert all(asset_store.lookup(booth['name']) is None for booth in booths[1:])
+
+    pdf_bytes = qr_sheets.build_qr_sheet(booths, '대구수학축제').getvalue()
+
+    assert pdf_bytes.startswith(b'%PDF')
+    assert _page_count(pdf_bytes) == booth_count
+    # 없던 이미지는 (풀 렌더링 여부와 관계없이) 디스크 저장소에 저장되어 다음 다운로드부터 재사용
+    assets = [asset_store.lookup(booth['name']) for booth in booths]
+    assert all(asset is not None and asset.path for asset in assets)
+    assert assets[0].png_bytes == stored.png_bytes
+    assert all(asset.png_bytes.startswith(b'\x89PNG') for asset in assets)
+
+def test_second_sheet_renders_nothing(asset_store, monkeypatch):
+    booths = _booths(3)
+    qr_sheets.build_qr_sheet(booths, '대구수학축제')
+
+    monkeypatch.setattr(asset_store, 'put', lambda *args: pytest.fail('이미 저장된 QR을 다시 렌더링함'))
+    pdf_bytes = qr_sheets.build_qr_sheet(booths, '대구수학축제').getvalue()
+
+    assert _page_count(pdf_bytes) == 3
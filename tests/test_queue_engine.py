@@ -0,0 +1,132 @@
+"""
+메모리 대기열 엔진 테스트: 학생별 색인, 부스 정보 캐시 무효화, 잠금 밖 조회, 쓰기 재시도
+"""
+
+import threading
+
+from app.config import Config
+from app.queue_engine import QueueEngine
+from app.repositories import booths_repo
+
+def _seed(fake_supabase):
+    for i in range(1, 4):
+        fake_supabase.insert_row('booths', {'name': f'부스{i}', 'location': f'{i}층', 'description': '', 'operator_id': 1})
+    for i in range(1, 6):
+        fake_supabase.insert_row('students', {'name': f'학생{i}', 'school': '대구중', 'grade': 1, 'class': 1, 'number': i, 'phone': ''})
+    entry_id = 0
+    for booth_id in range(1, 4):
+        for student_id in range(1, 6):
+            entry_id += 1
+            fake_supabase.insert_row('queue_entries', {
+                'booth_id': booth_id, 'student_id': student_id, 'status': 'waiting', 'queue_position': student_id,
+                'applied_at': f'2025-10-18T10:{entry_id:02d}:00', 'called_at': None, 'completed_at': None
+            })
+
+def _engine(fake_supabase):
+    _seed(fake_supabase)
+    engine = QueueEngine()
+    assert engine.hydrate()
+    return engine
+
+def test_student_entries_follow_the_student_index(fake_supabase):
+    engine = _engine(fake_supabase)
+
+    rows = engine.student_entries(2)
+    assert [row['booth_id'] for row in rows] == [3, 2, 1]  # 신청 최신순
+    assert rows[0]['booths']['name'] == '부스3'
+
+    engine.delete_entry(rows[0]['id'])
+    engine.update_entry(rows[1]['id'], {'status': 'called'})
+    assert [row['booth_id'] for row in engine.student_entries(2)] == [2, 1]
+    assert engine.student_statuses(2) == {2: 'called', 1: 'waiting'}
+
+    engine.add_entry({'id': 999, 'booth_id': 3, 'student_id': 2, 'status': 'waiting', 'queue_position': 6})
+    assert engine.student_statuses(2) == {3: 'waiting', 2: 'called', 1: 'waiting'}
+
+def test_booth_update_invalidates_cached_booth_info(fake_supabase):
+    engine = _engine(fake_supabase)
+    # 다른 테스트의 엔진 인스턴스가 아니라 이 엔진이 변경 hook을 받도록 등록
+    booths_repo.add_change_hook(engine.invalidate_booths)
+    try:
+        assert engine.student_entries(1)[-1]['booths']['location'] == '1층'
+        booths_repo.update(1, {'location': '체육관'})
+        assert engine.student_entries(1)[-1]['booths']['location'] == '체육관'
+    finally:
+        booths_repo._change_hooks.remove(engine.invalidate_booths)
+
+def test_detail_lookups_do_not_hold_the_engine_lock(fake_supabase, monkeypatch):
+    engine = _engine(fake_supabase)
+    engine._students.clear()
+    lock_free = []
+    fetch_details = engine._fetch_details
+
+    def checking_fetch(student_ids, booth_ids):
+        # 다른 스레드가 조회 도중 엔진 잠금을 얻을 수 있어야 함
+        probe = threading.Thread(target=lambda: lock_free.append(engine._lock.acquire(timeout=1) and engine._lock.release() is None))
+        probe.start()
+        probe.join()
+        return fetch_details(student_ids, booth_ids)
+
+    monkeypatch.setattr(engine, '_fetch_details', checking_fetch)
+    rows = engine.booth_entries(1)
+
+    assert lock_free == [True]
+    assert [row['students']['name'] for row in rows] == [f'학생{i}' for i in range(1, 6)]
+
+def _drain(engine, failures=0):
+    while not engine._writes.empty():
+        failures = engine._write_next(failures)
+    return failures
+
+def test_failed_write_is_retried_in_order_and_never_dropped(fake_supabase, monkeypatch):
+    engine = _engine(fake_supabase)
+    monkeypatch.setattr(Config, 'QUEUE_WRITE_RETRY_BASE_DELAY', 0)
+    monkeypatch.setattr(Config, 'QUEUE_WRITE_RETRY_MAX_DELAY', 0)
+    apply_write = engine._apply_write
+    outage = {'remaining': 5}
+    applied = []
+
+    def flaky_write(operation, entry_id, fields):
+        if entry_id == 1 and outage['remaining']:
+            outage['remaining'] -= 1
+            # 실패한 반영 도중 같은 항목이 완료 처리됨
+            if fields.get('status') == 'called':
+                engine.update_entry(1, {'status': 'completed', 'completed_at': '2025-10-18T11:05:00'})
+            raise RuntimeError('DB 연결 끊김')
+        applied.append((entry_id, fields.get('status')))
+        apply_write(operation, entry_id, fields)
+
+    monkeypatch.setattr(engine, '_apply_write', flaky_write)
+    engine.update_entry(1, {'status': 'called', 'called_at': '2025-10-18T11:00:00'})
+    engine.update_entry(2, {'status': 'called', 'called_at': '2025-10-18T11:01:00'})
+
+    assert engine.pending_entry_ids() == {1, 2}
+    assert _drain(engine) == 0
+    # 재시도 횟수와 상관없이 최종 상태 한 번만 반영, '호출됨'이 '완료'를 덮어쓰지 않음
+    assert applied == [(2, 'called'), (1, 'completed')]
+    assert engine.pending_entry_ids() == set()
+    row = next(row for row in fake_supabase.rows('queue_entries') if row['id'] == 1)
+    assert (row['status'], row['called_at'], row['completed_at']) == ('completed', '2025-10-18T11:00:00', '2025-10-18T11:05:00')
+
+    # 반영이 끝났으므로 동기화해도 메모리 값이 유지됨
+    assert engine.reconcile() == 0
+    assert engine.get_entry(1)['status'] == 'completed'
+
+def test_reconcile_keeps_entries_with_unflushed_writes(fake_supabase, monkeypatch):
+    engine = _engine(fake_supabase)
+    monkeypatch.setattr(Config, 'QUEUE_WRITE_RETRY_BASE_DELAY', 0)
+    monkeypatch.setattr(engine, '_apply_write', lambda operation, entry_id, fields: (_ for _ in ()).throw(RuntimeError('timeout')))
+
+    engine.update_entry(3, {'status': 'called', 'called_at': '2025-10-18T11:00:00'})
+    assert engine._write_next(0) == 1
+    assert engine._write_next(1) == 2
+
+    assert engine.pending_entry_ids() == {3}
+    assert engine.reconcile() == 0
+    assert engine.get_entry(3)['status'] == 'called'
+
+def test_retry_delay_grows_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(Config, 'QUEUE_WRITE_RETRY_BASE_DELAY', 1)
+    monkeypatch.setattr(Config, 'QUEUE_WRITE_RETRY_MAX_DELAY', 10)
+    engine = QueueEngine()
+    assert [engine._retry_delay(failures) for failures in range(1, 6)] == [1, 2, 4, 8, 10]
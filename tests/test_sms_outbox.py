@@ -0,0 +1,53 @@
+"""
+SMS outbox 테스트: 실패 건은 메시지별 키로 구분하고, 선점 기간 안의 'sending' 행은 다시 보내지 않음
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import app.sms_outbox as sms_outbox
+from app.config import Config
+
+def _notification(fake_supabase, phone, message, **extra):
+    row = {
+        'phone_number': phone, 'message': message, 'status': 'pending', 'attempts': 0,
+        'next_attempt_at': (datetime.now() - timedelta(seconds=1)).isoformat()
+    }
+    row.update(extra)
+    return fake_supabase.insert_row('notifications', row)
+
+def _status(fake_supabase, row_id):
+    return next(row for row in fake_supabase.rows('notifications') if row['id'] == row_id)['status']
+
+def test_failures_are_matched_per_message_not_per_phone(fake_supabase, monkeypatch):
+    first = _notification(fake_supabase, '010-1111-2222', '1번째 호출')
+    second = _notification(fake_supabase, '010-1111-2222', '2번째 호출')
+    sent_batches = []
+
+    def fake_deliver(messages):
+        sent_batches.append(messages)
+        # 같은 번호의 두 메시지 중 두 번째만 접수 실패
+        return SimpleNamespace(failed_message_list=[
+            SimpleNamespace(to='01011112222', custom_fields={'key': str(second['id'])})
+        ])
+
+    monkeypatch.setattr(sms_outbox, 'get_solapi', lambda: object())
+    monkeypatch.setattr(sms_outbox, 'deliver_sms_batch', fake_deliver)
+
+    assert sms_outbox.drain_outbox() == 2
+    assert len(sent_batches) == 1
+    assert _status(fake_supabase, first['id']) == 'sent'
+    assert _status(fake_supabase, second['id']) == 'pending'  # 재시도 대기
+
+def test_only_expired_claims_are_reclaimed(fake_supabase):
+    now = datetime.now()
+    in_flight = _notification(fake_supabase, '01000000001', '발송 중', status='sending',
+                              claimed_at=(now - timedelta(seconds=30)).isoformat(), claimed_by='other-worker')
+    abandoned = _notification(fake_supabase, '01000000002', '중단됨', status='sending',
+                              claimed_at=(now - timedelta(seconds=Config.SMS_CLAIM_LEASE_SECONDS + 60)).isoformat(),
+                              claimed_by='old-worker')
+
+    sms_outbox._reclaim_expired(fake_supabase)
+
+    assert _status(fake_supabase, in_flight['id']) == 'sending'
+    assert _status(fake_supabase, abandoned['id']) == 'pending'
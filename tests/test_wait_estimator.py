@@ -0,0 +1,60 @@
+"""
+예상 대기 시간 테스트: 자동 호출 부스는 동시 호출 인원만큼 나누어 계산 (부스 목록, 내 대기신청 모두)
+"""
+
+from flask import Flask
+
+import app.queue_stats as queue_stats
+import app.student.routes as student_routes
+from app.config import Config
+from app.queue_engine import QueueEngine
+from app.wait_estimator import booth_concurrency, wait_estimator
+
+def test_booth_concurrency_applies_only_to_auto_call_booths():
+    assert booth_concurrency({'auto_call_enabled': True, 'auto_call_concurrency': 3}) == 3
+    assert booth_concurrency({'auto_call_enabled': False, 'auto_call_concurrency': 3}) == 1
+    assert booth_concurrency({'auto_call_enabled': True, 'auto_call_concurrency': None}) == 1
+    assert booth_concurrency({}) == 1
+
+def _seed(fake_supabase, monkeypatch):
+    monkeypatch.setattr(Config, 'DEFAULT_SERVICE_MINUTES', 5)
+    fake_supabase.insert_row('booths', {'name': '수동 부스', 'location': '1층', 'description': '', 'pdf_file_path': None, 'is_active': True,
+                                        'created_at': '2025-10-18T09:00:00', 'auto_call_enabled': False, 'auto_call_concurrency': 3})
+    fake_supabase.insert_row('booths', {'name': '자동 부스', 'location': '2층', 'description': '', 'pdf_file_path': None, 'is_active': True,
+                                        'created_at': '2025-10-18T09:00:00', 'auto_call_enabled': True, 'auto_call_concurrency': 3})
+    for booth_id in (1, 2):
+        for position in range(1, 8):
+            student = fake_supabase.insert_row('students', {'name': f'학생{position}', 'school': '대구중', 'grade': 1, 'class': 1, 'number': position, 'phone': ''})
+            fake_supabase.insert_row('queue_entries', {
+                'booth_id': booth_id, 'student_id': student['id'], 'status': 'waiting', 'queue_position': position,
+                'applied_at': f'2025-10-18T10:0{position}:00', 'called_at': None, 'completed_at': None
+            })
+    engine = QueueEngine()
+    assert engine.hydrate()
+    monkeypatch.setattr(queue_stats, 'queue_engine', engine)
+    monkeypatch.setattr(student_routes, 'queue_engine', engine)
+    # 다른 테스트가 남긴 체험 기록 대신 기본 소요 시간(5분) 사용
+    monkeypatch.setattr(wait_estimator, '_booths', {})
+
+def _post(path, student_id):
+    app = Flask(__name__)
+    app.register_blueprint(student_routes.student_bp)
+    return app.test_client().post(path, json={'student_id': student_id}).get_json()
+
+def test_booth_list_eta_divides_by_auto_call_concurrency(fake_supabase, monkeypatch):
+    _seed(fake_supabase, monkeypatch)
+
+    booths = {booth['id']: booth for booth in _post('/student/api/booth-list', 1)['booths']}
+
+    # 대기 7명 × 5분: 수동 부스는 35분, 3명씩 부르는 자동 호출 부스는 12분
+    assert booths[1]['estimated_wait_minutes'] == 35
+    assert booths[2]['estimated_wait_minutes'] == 12
+
+def test_my_queue_eta_divides_by_auto_call_concurrency(fake_supabase, monkeypatch):
+    _seed(fake_supabase, monkeypatch)
+    last_student = fake_supabase.rows('queue_entries')[-1]['student_id']  # 자동 부스 7번째 대기자
+
+    queue = _post('/student/api/my-queue', last_student)['queue']
+
+    # 앞에 6명 × 5분 ÷ 3명
+    assert [(entry['booth_name'], entry['estimated_wait_minutes']) for entry in queue] == [('자동 부스', 10)]
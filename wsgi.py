@@ -42,6 +42,60 @@ try:
 except Exception as e:
     print(f"❌ Database initialization error: {e}")
 
+# Start background SMS dispatcher
+try:
+    from app.sms_outbox import start_sms_dispatcher
+    start_sms_dispatcher()
+    print("✅ SMS dispatcher started")
+except Exception as e:
+    print(f"❌ SMS dispatcher start error: {e}")
+
+# Start check-in flusher (also replays check-ins buffered before a restart)
+try:
+    from app.config import Config
+    from app.checkin_buffer import checkin_buffer
+    if checkin_buffer.enabled:
+        checkin_buffer.start()
+        print("✅ Check-in flusher started")
+    elif Config.CHECKIN_BUFFER_ENABLED:
+        print("⚠️ CHECKIN_BUFFER_PATH not set (needs a persistent volume), check-ins are saved directly")
+except Exception as e:
+    print(f"❌ Check-in flusher start error: {e}")
+
+# Load queue state into memory (reads are served from the in-process queue engine)
+try:
+    from app.config import Config
+    from app.queue_engine import queue_engine
+    from app.wait_estimator import wait_estimator
+    if Config.QUEUE_ENGINE_ENABLED:
+        queue_engine.start()
+        print("✅ Queue engine started")
+        
+        # Seed per-booth service times from completed entries already in memory
+        wait_estimator.seed(queue_engine.entries_with_status('completed'))
+except Exception as e:
+    print(f"❌ Queue engine start error: {e}")
+
+# Start auto-call scheduler (calls the next students from the in-memory queue)
+try:
+    from app.config import Config
+    from app.auto_call import auto_call_scheduler
+    if Config.QUEUE_ENGINE_ENABLED:
+        auto_call_scheduler.start()
+        print("✅ Auto-call scheduler started")
+except Exception as e:
+    print(f"❌ Auto-call scheduler start error: {e}")
+
+# Start no-show sweeper
+try:
+    from app.config import Config
+    from app.no_show import no_show_sweeper
+    if Config.NO_SHOW_SWEEP_ENABLED:
+        no_show_sweeper.start()
+        print("✅ No-show sweeper started")
+except Exception as e:
+    print(f"❌ No-show sweeper start error: {e}")
+
 # Register blueprints
 try:
     from app.main.routes import main_bp
@@ -71,6 +125,14 @@ try:
 except Exception as e:
     print(f"❌ Error registering student_bp: {e}")
 
+# Count database queries per request (X-Query-Count header)
+try:
+    from app.repositories import install_query_budget
+    install_query_budget(app)
+    print("✅ Query budget installed")
+except Exception as e:
+    print(f"❌ Query budget install error: {e}")
+
 # Add health check
 @app.route('/health')
 def health_check():